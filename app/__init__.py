@@ -1,19 +1,16 @@
 from flask import Flask, jsonify
-from app.routes.main_routes import main_bp
-from app.routes.auth_routes import auth_bp
-from app.routes.product_routes import product_bp
-from app.routes.order_routes import order_bp
-
-from app.database.sessions import init_session
-from .errors_handlers import register_error_handlers
+from app.database.sessions import init_session, init_instrumentation
 from flask.app import Flask as FlaskType
 
 import os
 from config import CONFIG_MAP
+from app.database.base import engine_settings
 from app.database.db_manager import DatabaseManager
-
-from .spec import spec
-from flask.app import Flask as FlaskType
+from app.core.cache import catalog_cache
+from app.core.auth_cache import configure_auth_cache
+from app.core.password_hashing import password_hasher
+from app.core.metrics import init_metrics
+from app.core.compression import init_compression
 
 
 def create_app() -> FlaskType:
@@ -23,25 +20,66 @@ def create_app() -> FlaskType:
         - la creation des tables si inexistantes -> migré vers init_db.py
         - l'intégration des exceptions handlers
     '''
+    # Routes (spectree, schémas) et commandes importées ici : `import app`
+    # ou un sous-module (app.models, app.database...) reste léger pour les
+    # migrations, CLI et scripts qui n'en ont pas besoin
+    from app.routes.main_routes import main_bp
+    from app.routes.auth_routes import auth_bp
+    from app.routes.product_routes import product_bp
+    from app.routes.order_routes import order_bp
+    from app.errors_handlers import register_error_handlers
+    from app.spec import spec, response_validation
+    from app.cli.seed import seed_command
+    from app.cli.openapi import openapi_command
+    from app.cli.import_products import import_products_command
+    from app.cli.startup_profile import startup_profile_command
+
     # Config selon export FLASK_ENV
     ENV = os.getenv("FLASK_ENV", "dev").lower()
     app_config = CONFIG_MAP.get(ENV, CONFIG_MAP["dev"])
 
     app = Flask(__name__)
     app.config.from_object(app_config)
+    app.logger.setLevel(app.config["LOG_LEVEL"])
 
     app.register_blueprint(main_bp)
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
     app.register_blueprint(product_bp, url_prefix="/api/produits")
     app.register_blueprint(order_bp, url_prefix="/api/commandes")
 
+    # Hors PROD : tables et migrations ; en PROD : migrations appliquées
+    # explicitement (python -m app.database.migrate upgrade)
     db_manager = DatabaseManager()
-    db_manager.init_db()
+    app.logger.info("Moteur base de données : %s", " ".join(
+        f"{k}={v}" for k, v in engine_settings(db_manager.engine).items()))
+    if ENV != "prod":
+        db_manager.init_db()
+    elif db_manager.pending():
+        app.logger.warning("Migrations de schéma en attente (version %s)",
+                           db_manager.current_version())
+
+    catalog_cache.configure(app.config)
+    configure_auth_cache(app.config)
+    password_hasher.configure(app.config)
+    response_validation.configure(app.config)
 
+    # Métriques et instrumentation enregistrées avant les sessions : son
+    # after_request s'exécute après le commit de la requête (inclus dans
+    # les mesures)
+    if app.config["METRICS_ENABLED"]:
+        init_metrics(app, db_manager.engine)
+    # Compression après le commit, durée incluse dans les métriques
+    init_compression(app)
+    if app.config["SQL_INSTRUMENTATION"]:
+        init_instrumentation(app)
     if ENV not in ("testing", "test"):
         init_session(app)
 
     register_error_handlers(app)
+    app.cli.add_command(seed_command)
+    app.cli.add_command(openapi_command)
+    app.cli.add_command(import_products_command)
+    app.cli.add_command(startup_profile_command)
 
     spec.register(app)
 
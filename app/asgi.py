@@ -0,0 +1,38 @@
+from app import create_app
+from asgiref.sync import ThreadSensitiveContext
+from asgiref.wsgi import WsgiToAsgi
+import asyncio
+
+
+'''
+Point d'entrée ASGI (même application Flask que app/run.py), adaptée par
+asgiref.wsgi.WsgiToAsgi :
+    uvicorn app.asgi:app --port 5000
+    python -m app.asgi [--host 127.0.0.1] [--port 5000]
+
+Chaque requête occupe un thread jusqu'à la fin de sa réponse (exports
+streamés compris) : au plus ASGI_THREADS requêtes simultanées, comme un
+serveur WSGI threadé ; seules les connexions inactives n'en occupent pas.
+'''
+flask_app = create_app()
+_wsgi_app = WsgiToAsgi(flask_app)
+_slots = asyncio.Semaphore(flask_app.config["ASGI_THREADS"])
+
+
+async def app(scope, receive, send):
+    # sans ThreadSensitiveContext, asgiref exécute toutes les requêtes
+    # dans un seul et même thread
+    async with _slots, ThreadSensitiveContext():
+        await _wsgi_app(scope, receive, send)
+
+
+if __name__ == "__main__":
+    import argparse
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serveur ASGI (uvicorn)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    args = parser.parse_args()
+    uvicorn.run(app, host=args.host, port=args.port, lifespan="off",
+                log_level="warning")
@@ -0,0 +1,63 @@
+from app.database.base import SessionLocal
+from app.services.product_import import (
+    IMPORT_FORMATS, ImportReport, detect_format, import_products, iter_rows
+)
+from config import Config
+from flask import has_app_context
+from typing import BinaryIO, Optional
+import click
+import json
+
+
+@click.command("import-products")
+@click.argument("fichier", type=click.File("rb"))
+@click.option("--format", "fmt", type=click.Choice(IMPORT_FORMATS),
+              default=None, help="défaut : d'après l'extension du fichier")
+@click.option("--chunk-size", type=int,
+              default=Config.PRODUCT_IMPORT_CHUNK_SIZE, show_default=True)
+@click.option("--max-errors", type=int,
+              default=Config.PRODUCT_IMPORT_MAX_ERRORS, show_default=True)
+@click.pass_context
+def import_products_command(ctx: click.Context, fichier: BinaryIO,
+                            fmt: Optional[str], chunk_size: int,
+                            max_errors: int) -> None:
+    """
+    Import du catalogue NDJSON/CSV (base de l'environnement FLASK_ENV),
+    chaque lot étant validé (commit) au fil de la lecture ; code de sortie
+    1 si des lignes sont rejetées :
+        flask --app app import-products catalogue.csv
+        cat produits.ndjson | flask --app app import-products - --format ndjson
+    """
+    fmt = fmt or detect_format(None, getattr(fichier, "name", None))
+    if fmt is None:
+        raise click.BadParameter(
+            "format indéterminé : préciser --format ndjson|csv",
+            param_hint="--format")
+
+    if has_app_context():
+        report = _import(fichier, fmt, chunk_size, max_errors)
+    else:
+        from app import create_app
+        with create_app().app_context():
+            report = _import(fichier, fmt, chunk_size, max_errors)
+
+    click.echo(json.dumps(report.to_dict(), ensure_ascii=False, indent=2))
+    if report.rejetees:
+        ctx.exit(1)
+
+
+def _import(stream: BinaryIO, fmt: str, chunk_size: int,
+            max_errors: int) -> ImportReport:
+    session = SessionLocal()
+    try:
+        report = import_products(session, iter_rows(stream, fmt),
+                                 chunk_size=chunk_size,
+                                 max_errors=max_errors, commit=True)
+        session.commit()
+        return report
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    import_products_command(prog_name="python -m app.cli.import_products")
@@ -0,0 +1,38 @@
+from flask import has_app_context
+from app.core.openapi import render_openapi
+from app.spec import spec
+import click
+import os
+
+
+@click.command("openapi")
+@click.option("--output", "-o", default="-", show_default=True,
+              help="fichier du document (- : sortie standard)")
+def openapi_command(output: str) -> None:
+    """
+    Génère le document OpenAPI au build, servi tel quel par /apidoc si
+    OPENAPI_DOCUMENT_PATH le désigne (document identique quel que soit
+    FLASK_ENV, base en mémoire avec FLASK_ENV=testing) :
+        flask --app app openapi -o build/openapi.json
+        FLASK_ENV=testing python -m app.cli.openapi -o build/openapi.json
+    """
+    if has_app_context():
+        body = render_openapi(spec)
+    else:
+        from app import create_app
+        with create_app().app_context():
+            body = render_openapi(spec)
+
+    if output == "-":
+        click.echo(body.decode())
+        return
+    # Écriture atomique : jamais de document partiel servi
+    tmp = f"{output}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(body)
+    os.replace(tmp, output)
+    click.echo(f"{output} : {len(body)} octets", err=True)
+
+
+if __name__ == "__main__":
+    openapi_command(prog_name="python -m app.cli.openapi")
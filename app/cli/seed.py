@@ -0,0 +1,75 @@
+from app.core.password_hashing import password_hasher
+from app.database.base import engine
+from app.services.seeding import (
+    DEFAULT_STATUS_MIX, SeedProfile, SeedReport, parse_status_mix,
+    seed_database
+)
+from flask import has_app_context
+from datetime import datetime, timezone
+import click
+import json
+
+
+@click.command("seed")
+@click.option("--users", type=int, default=SeedProfile.users,
+              show_default=True)
+@click.option("--products", type=int, default=SeedProfile.products,
+              show_default=True)
+@click.option("--orders", type=int, default=SeedProfile.orders,
+              show_default=True)
+@click.option("--categories", type=int, default=SeedProfile.categories,
+              show_default=True)
+@click.option("--popularity-skew", type=float,
+              default=SeedProfile.popularity_skew, show_default=True,
+              help="exposant Zipf de la popularité produit (0 = uniforme)")
+@click.option("--lines-max", type=int, default=SeedProfile.lines_max,
+              show_default=True, help="lignes maximum par commande")
+@click.option("--lines-skew", type=float, default=SeedProfile.lines_skew,
+              show_default=True, help="P(k lignes) proportionnelle à k^-skew")
+@click.option("--status-mix", default=",".join(
+              f"{s}={w}" for s, w in DEFAULT_STATUS_MIX.items()),
+              show_default=True, help="poids par statut de commande")
+@click.option("--days", type=int, default=SeedProfile.days, show_default=True,
+              help="période couverte par les commandes")
+@click.option("--base-date", type=click.DateTime(["%Y-%m-%d"]),
+              default=SeedProfile.base_date.strftime("%Y-%m-%d"),
+              show_default=True,
+              help="fin de la période (UTC) : dates stables entre runs")
+@click.option("--password", default=SeedProfile.password, show_default=True,
+              help="mot de passe commun des utilisateurs générés")
+@click.option("--seed", type=int, default=SeedProfile.seed, show_default=True)
+@click.option("--batch-size", type=int, default=SeedProfile.batch_size,
+              show_default=True)
+def seed_command(status_mix: str, base_date: datetime, **options) -> None:
+    """
+    Génère utilisateurs, produits et commandes synthétiques (une seule
+    transaction, base de l'environnement FLASK_ENV) :
+        flask --app app seed --products 1000000 --orders 2000000
+        python -m app.cli.seed --users 100 --products 1000
+    """
+    try:
+        profile = SeedProfile(status_mix=parse_status_mix(status_mix),
+                              base_date=base_date.replace(tzinfo=timezone.utc),
+                              **options)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--status-mix")
+
+    if has_app_context():
+        report = _seed(profile)
+    else:
+        # python -m : application créée (configuration, tables et
+        # migrations hors PROD) comme pour `flask seed`
+        from app import create_app
+        with create_app().app_context():
+            report = _seed(profile)
+    click.echo(json.dumps(report.to_dict(), ensure_ascii=False, indent=2))
+
+
+def _seed(profile: SeedProfile) -> SeedReport:
+    with engine.begin() as conn:
+        return seed_database(conn, profile,
+                             password_hasher.hash(profile.password))
+
+
+if __name__ == "__main__":
+    seed_command(prog_name="python -m app.cli.seed")
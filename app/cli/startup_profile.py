@@ -0,0 +1,142 @@
+from collections import defaultdict
+from typing import Any, Dict, List
+import click
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+
+'''
+Profil du démarrage à froid, mesuré dans un processus Python neuf :
+    - imports : durée propre et cumulée par module (python -X importtime)
+    - create_app : durée des appels directs de la factory, par module
+      (cProfile)
+'''
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+# Code du processus mesuré : `import app` en premier (imports non biaisés)
+_CHILD = ("import app; "
+          "from app.cli.startup_profile import profile_create_app; "
+          "print(json.dumps(profile_create_app(app.create_app)))")
+
+
+def parse_importtime(output: str) -> List[Dict[str, Any]]:
+    """ Lignes `-X importtime` -> modules (durées en ms, profondeur). """
+    modules = []
+    for line in output.splitlines():
+        match = _IMPORTTIME.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append({"module": name, "self_ms": int(self_us) / 1000,
+                            "cumulative_ms": int(cumulative_us) / 1000,
+                            "depth": len(indent) // 2})
+    return modules
+
+
+def package_of(module: str) -> str:
+    """ Regroupement : paquet de premier niveau (`app.<sous-paquet>`). """
+    parts = module.split(".")
+    return ".".join(parts[:2] if parts[0] == "app" else parts[:1])
+
+
+def profile_create_app(factory) -> Dict[str, Any]:
+    """
+    Exécute la factory sous cProfile : durée totale et durée cumulée de
+    chaque appel direct (module:fonction), triés par coût.
+    """
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.runcall(factory)
+    total_ms = (time.perf_counter() - start) * 1000
+
+    stats = pstats.Stats(profiler).stats
+    root = next(f for f in stats if f[2] == factory.__name__
+                and f[0] == factory.__code__.co_filename)
+    files = {getattr(m, "__file__", None): name
+             for name, m in list(sys.modules.items())}
+
+    calls: Dict[str, float] = defaultdict(float)
+    for (filename, _, function), (*_, callers) in stats.items():
+        if root in callers:
+            module = files.get(filename, "builtins")
+            calls[f"{module}:{function}"] += callers[root][3] * 1000
+    return {"create_app_ms": total_ms, "init": [
+        {"call": call, "ms": ms}
+        for call, ms in sorted(calls.items(), key=lambda c: -c[1])]}
+
+
+def run_profile(env: str, python: str = sys.executable) -> Dict[str, Any]:
+    """ Profil complet d'un démarrage dans un sous-processus. """
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import json; {_CHILD}"],
+        capture_output=True, text=True, env={**os.environ, "FLASK_ENV": env})
+    process_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"Démarrage en échec :\n{proc.stderr[-2000:]}")
+
+    imports = [m for m in parse_importtime(proc.stderr)
+               if not m["module"].startswith("app.cli.startup_profile")]
+    packages: Dict[str, float] = defaultdict(float)
+    for m in imports:
+        packages[package_of(m["module"])] += m["self_ms"]
+    app_import = next(m for m in imports if m["module"] == "app")
+
+    return {
+        "env": env,
+        "process_ms": process_ms,
+        "import_app_ms": app_import["cumulative_ms"],
+        "imports_ms": sum(m["self_ms"] for m in imports),
+        "packages": dict(sorted(packages.items(), key=lambda p: -p[1])),
+        "modules": sorted(imports, key=lambda m: -m["self_ms"]),
+        **json.loads(proc.stdout.strip().splitlines()[-1]),
+    }
+
+
+def format_report(profile: Dict[str, Any], top: int) -> str:
+    lines = [
+        f"Démarrage à froid (FLASK_ENV={profile['env']}) : processus "
+        f"{profile['process_ms']:.0f} ms, import app "
+        f"{profile['import_app_ms']:.0f} ms, create_app "
+        f"{profile['create_app_ms']:.0f} ms",
+        "", "Imports par paquet (durée propre)"]
+    lines += [f"  {name:<44} {ms:8.1f} ms"
+              for name, ms in list(profile["packages"].items())[:top]]
+    lines += ["", "Modules (durée propre / cumulée)"]
+    lines += [f"  {m['module']:<44} {m['self_ms']:8.1f} "
+              f"{m['cumulative_ms']:8.1f} ms"
+              for m in profile["modules"][:top]]
+    lines += ["", "Initialisation (appels directs de create_app)"]
+    lines += [f"  {c['call']:<44} {c['ms']:8.1f} ms"
+              for c in profile["init"][:top]]
+    return "\n".join(lines)
+
+
+@click.command("startup-profile")
+@click.option("--env", default=lambda: os.getenv("FLASK_ENV", "prod"),
+              show_default="FLASK_ENV ou prod",
+              help="configuration du processus mesuré")
+@click.option("--top", type=int, default=20, show_default=True,
+              help="lignes par section")
+@click.option("--json", "as_json", is_flag=True, help="rapport JSON complet")
+def startup_profile_command(env: str, top: int, as_json: bool) -> None:
+    """
+    Mesure le coût de démarrage (imports puis create_app) par module,
+    dans un processus neuf :
+        flask --app app startup-profile --env prod --top 15
+        python -m app.cli.startup_profile --env prod --json
+    """
+    profile = run_profile(env)
+    if as_json:
+        click.echo(json.dumps(profile, ensure_ascii=False, indent=2))
+    else:
+        click.echo(format_report(profile, top))
+
+
+if __name__ == "__main__":
+    startup_profile_command(prog_name="python -m app.cli.startup_profile")
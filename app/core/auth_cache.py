@@ -0,0 +1,148 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from sqlalchemy import event
+from sqlalchemy.orm import Session, ORMExecuteState
+from app.models import User
+from typing import Any, Dict, Hashable, NamedTuple, Optional, Tuple
+
+
+class Principal(NamedTuple):
+    """
+    Identité authentifiée de la requête (g.current_user) : sous-ensemble
+    de User suffisant pour les contrôles d'accès, sans instance ORM.
+    """
+    id: int
+    email: str
+    role: str
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(user.id, user.email, user.role)
+
+
+class _ExpiringLRU:
+    """ LRU borné (thread-safe) dont chaque entrée a sa propre échéance. """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = (
+            OrderedDict())
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now >= entry[1]:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, expires_at: float) -> None:
+        if self.max_entries <= 0 or expires_at <= time.time():
+            return
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class TokenCache(_ExpiringLRU):
+    """
+    Tokens JWT déjà vérifiés (signature) : clé = empreinte du token,
+    valeur = payload, échéance = `exp` du token.
+    """
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    def get_claims(self, token: str) -> Optional[Dict[str, Any]]:
+        return self.get(self.digest(token))
+
+    def put_claims(self, token: str, claims: Dict[str, Any]) -> None:
+        self.put(self.digest(token), claims, float(claims.get("exp", 0)))
+
+
+class PrincipalCache(_ExpiringLRU):
+    """ Identités (id, email, rôle) par ID utilisateur (`ttl` secondes). """
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        super().__init__(max_entries)
+        self.ttl = ttl
+
+    def put_principal(self, principal: Principal) -> None:
+        if self.ttl > 0:
+            self.put(principal.id, principal, time.time() + self.ttl)
+
+
+token_cache = TokenCache(max_entries=10000)
+principal_cache = PrincipalCache(max_entries=10000, ttl=60)
+
+
+def configure_auth_cache(config: Dict[str, Any]) -> None:
+    """ Applique les paramètres AUTH_* de la config Flask. """
+    token_cache.max_entries = config.get("AUTH_TOKEN_CACHE_SIZE",
+                                         token_cache.max_entries)
+    principal_cache.max_entries = config.get("AUTH_PRINCIPAL_CACHE_SIZE",
+                                             principal_cache.max_entries)
+    principal_cache.ttl = config.get("AUTH_PRINCIPAL_TTL", principal_cache.ttl)
+    token_cache.clear()
+    principal_cache.clear()
+
+
+'''
+Invalidation des identités à chaque modification d'utilisateur :
+    - au flush (instances User modifiées/supprimées), puis à nouveau au
+      commit pour écarter une lecture concurrente de l'état pré-commit
+    - UPDATE/DELETE en masse sur User : cache entièrement vidé
+'''
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_changed_users(session: Session, flush_context) -> None:
+    changed = {obj.id for obj in (*session.dirty, *session.deleted)
+               if isinstance(obj, User)}
+    for user_id in changed:
+        principal_cache.pop(user_id)
+    if changed:
+        session.info.setdefault("users_dirty", set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_users_after_commit(session: Session) -> None:
+    for user_id in session.info.pop("users_dirty", ()):
+        principal_cache.pop(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _reset_users_after_rollback(session: Session) -> None:
+    session.info.pop("users_dirty", None)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_bulk_users(orm_execute_state: ORMExecuteState) -> None:
+    if ((orm_execute_state.is_update or orm_execute_state.is_delete)
+            and orm_execute_state.bind_mapper is not None
+            and orm_execute_state.bind_mapper.class_ is User):
+        principal_cache.clear()
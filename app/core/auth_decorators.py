@@ -5,13 +5,43 @@ from app.core.exceptions.app_errors import UnauthorizedError, ForbiddenError
 from typing import Callable, Any
 
 from app.core.auth_utils import decode_token
+from app.core.auth_cache import Principal, token_cache, principal_cache
+
+
+def verify_token(token: str) -> dict:
+    """
+    Retourne le payload d'un token, vérifié une seule fois par process
+    (LRU des tokens vérifiés, jusqu'à leur expiration).
+    """
+    claims = token_cache.get_claims(token)
+    if claims is None:
+        claims = decode_token(token)
+        token_cache.put_claims(token, claims)
+    return claims
+
+
+def load_principal(user_id: int) -> Principal:
+    """
+    Retourne l'identité (id, email, rôle) de l'utilisateur, depuis le cache
+    des identités ou à défaut depuis la base (g.session).
+    """
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        user = g.session.get(User, user_id)
+        if not user:
+            raise UnauthorizedError("Payload Token invalide")
+        principal = Principal.from_user(user)
+        principal_cache.put_principal(principal)
+    return principal
+
 
 # Décorateur Authentification (token JWT)
 def auth_required(func: Callable) -> Callable:
     '''
     Vérifie la présence et la validité du token
     dans l'en-tête `Authorization: Bearer <token>`.
-    Utilise g.session pour les requêtes SQLAlchemy.
+    Token vérifié et identité (g.current_user) mis en cache : aucune
+    requête SQL pour un utilisateur déjà authentifié récemment.
 
     Retourne une fonction décorée appliquant la vérification JWT.
     Lève une erreur si token expiré, invalide ou manquant.
@@ -20,14 +50,12 @@ def auth_required(func: Callable) -> Callable:
     def wrapper(*args: Any, **kwargs: Any) -> Any:
         auth_header = request.headers.get("Authorization")
         if not auth_header or not auth_header.startswith("Bearer "):
-            raise UnauthorizedError("Token manquant")
+            raise UnauthorizedError("Token manquant", "missing_token")
 
         token = auth_header.split(" ")[1]
-        payload = decode_token(token)
+        payload = verify_token(token)
 
-        g.current_user = g.session.get(User, payload["id"])
-        if not g.current_user:
-            raise UnauthorizedError("Payload Token invalide")
+        g.current_user = load_principal(payload["id"])
         return func(current_user=g.current_user, *args, **kwargs)
 
     return wrapper
@@ -1,4 +1,4 @@
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.core.password_hashing import password_hasher
 from datetime import datetime, UTC, timedelta
 from app.models import User
 import jwt
@@ -42,7 +42,7 @@ def decode_token(token: str) -> dict:
         payload = jwt.decode(token, JWT_KEY, JWT_ALGO)
         return payload
     except jwt.ExpiredSignatureError:
-        raise UnauthorizedError("Token expiré")
+        raise UnauthorizedError("Token expiré", "expired")
     except jwt.InvalidTokenError:
         raise UnauthorizedError("Token invalide")
 
@@ -61,7 +61,7 @@ def register_user(session: Session, email: str,
     user = User(
         email=email,
         nom=nom,
-        password_hash=generate_password_hash(password),
+        password_hash=password_hasher.hash(password),
         role=role,
         date_creation=datetime.now(UTC),
     )
@@ -75,10 +75,17 @@ def register_user(session: Session, email: str,
 def login_user(session: Session, email: str,
                password: str) -> Tuple[str, User]:
     ''' Vérifie les identifiants utilisateur et génère un token JWT.
-    Retourne le token généré avec l'instance utilisateur associée. '''
+    Retourne le token généré avec l'instance utilisateur associée.
+    Hachages exécutés hors du thread de requête (503 si pool saturé). '''
     user = get_user_by_email(session, email)
-    if not user or not check_password_hash(user.password_hash, password):
-        raise UnauthorizedError("Identifiants invalides")
+    if not user or not password_hasher.verify(user.password_hash, password):
+        raise UnauthorizedError("Identifiants invalides",
+                                "invalid_credentials")
+
+    # Hachage d'un ancien coût/algorithme : remplacé (mot de passe connu)
+    if password_hasher.needs_rehash(user.password_hash):
+        user.password_hash = password_hasher.hash(password)
+        session.flush()
 
     token = generate_token(user)
     return token, user
@@ -0,0 +1,266 @@
+import hashlib
+import threading
+import time
+from app.database.catalog_version import (bump_catalog_version,
+                                          read_catalog_version)
+from app.database.sessions import get_session
+from collections import OrderedDict
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+
+class CachedBody(NamedTuple):
+    """
+    Réponse sérialisée mise en cache (corps JSON + en-têtes associés)
+    avec son ETag fort, calculé une seule fois à la construction, et ses
+    variantes compressées (encodage -> octets) ajoutées à la demande.
+    """
+    body: bytes
+    headers: Dict[str, str]
+    etag: str
+    encoded: Dict[str, bytes]
+
+    @classmethod
+    def build(cls, body: bytes,
+              headers: Optional[Dict[str, str]] = None) -> "CachedBody":
+        """ Construit l'entrée et dérive l'ETag du contenu (blake2b). """
+        etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+        return cls(body, headers or {}, etag, {})
+
+
+class _Entry:
+    """ Entrée du cache : valeur, taille et échéances de fraîcheur. """
+    __slots__ = ("value", "size", "expires_at", "stale_until", "refreshing")
+
+    def __init__(self, value: CachedBody, size: int,
+                 expires_at: float, stale_until: float) -> None:
+        self.value = value
+        self.size = size
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+        self.refreshing = False
+
+
+class CatalogCache:
+    """
+    Cache en mémoire (par process) des réponses catalogue sérialisées :
+        - lecture via `get_or_load` (read-through), clé = paramètres normalisés
+        - éviction LRU bornée en nombre d'entrées et en octets
+        - stale-while-revalidate : une entrée expirée est rafraîchie par un
+          seul appelant pendant que les autres reçoivent la valeur périmée
+        - invalidation globale à chaque écriture catalogue (génération)
+        - écritures des autres process : `version_reader` (version partagée)
+          relu au plus toutes les `version_check` secondes
+    """
+
+    def __init__(self, enabled: bool = True, ttl: float = 30.0,
+                 stale_ttl: float = 120.0, max_bytes: int = 32 * 1024 * 1024,
+                 max_entries: int = 2048,
+                 version_reader: Optional[Callable[[], Optional[int]]] = None,
+                 version_check: float = 1.0) -> None:
+        self.enabled = enabled
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.version_reader = version_reader
+        self.version_check = version_check
+
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._generation = 0
+        self._shared_version: Optional[int] = None
+        self._next_version_check = 0.0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def configure(self, config: Dict[str, Any]) -> None:
+        """ Applique les paramètres CATALOG_CACHE_* de la config Flask. """
+        self.enabled = config.get("CATALOG_CACHE_ENABLED", self.enabled)
+        self.ttl = config.get("CATALOG_CACHE_TTL", self.ttl)
+        self.stale_ttl = config.get("CATALOG_CACHE_STALE_TTL", self.stale_ttl)
+        self.max_bytes = config.get("CATALOG_CACHE_MAX_BYTES", self.max_bytes)
+        self.max_entries = config.get("CATALOG_CACHE_MAX_ENTRIES",
+                                      self.max_entries)
+        self.version_check = config.get("CATALOG_CACHE_VERSION_CHECK",
+                                        self.version_check)
+        self._next_version_check = 0.0
+        self.invalidate()
+
+    @property
+    def version(self) -> int:
+        """ Génération courante du catalogue (+1 à chaque écriture). """
+        return self._generation
+
+    @property
+    def size(self) -> int:
+        """ Taille totale (octets) des réponses en cache. """
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], CachedBody]
+                    ) -> Tuple[CachedBody, str]:
+        """
+        Retourne (valeur, statut) pour `key`, en appelant `loader` si besoin.
+        Statut : HIT, STALE (périmée, rafraîchie par un autre appelant),
+        MISS (chargée par cet appelant) ou BYPASS (cache désactivé).
+        """
+        if not self.enabled:
+            return loader(), "BYPASS"
+
+        now = time.monotonic()
+        self._check_shared_version(now)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry.stale_until:
+                self._entries.move_to_end(key)
+                if now < entry.expires_at:
+                    self.hits += 1
+                    return entry.value, "HIT"
+                if entry.refreshing:
+                    self.stale_hits += 1
+                    return entry.value, "STALE"
+                # Cet appelant se charge du rafraîchissement
+                entry.refreshing = True
+            else:
+                entry = None
+            self.misses += 1
+            generation = self._generation
+
+        try:
+            value = loader()
+        except Exception:
+            if entry is not None:
+                entry.refreshing = False
+            raise
+
+        self._store(key, value, generation)
+        return value, "MISS"
+
+    def _check_shared_version(self, now: float) -> None:
+        """ Vide le cache si un autre process a modifié le catalogue. """
+        if self.version_reader is None:
+            return
+        with self._lock:
+            if now < self._next_version_check:
+                return
+            # Un seul appelant relit la version par intervalle
+            self._next_version_check = now + self.version_check
+
+        version = self.version_reader()
+        with self._lock:
+            changed = version is not None and version != self._shared_version
+            if changed:
+                self._shared_version = version
+        if changed:
+            self.invalidate()
+
+    def _store(self, key: Hashable, value: CachedBody,
+               generation: int) -> None:
+        """ Enregistre `value` sauf si le catalogue a changé entre-temps. """
+        size = len(value.body) + sum(len(k) + len(v)
+                                     for k, v in value.headers.items())
+        if size > self.max_bytes:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            if generation != self._generation:
+                return
+
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+
+            self._entries[key] = _Entry(value, size, now + self.ttl,
+                                        now + self.ttl + self.stale_ttl)
+            self._bytes += size
+
+            while (self._bytes > self.max_bytes
+                   or len(self._entries) > self.max_entries):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+
+    def encoded(self, key: Hashable, value: CachedBody, encoding: str,
+                encode: Callable[[bytes], bytes]) -> bytes:
+        """
+        Variante `encoding` du corps de `value` (entrée `key`), calculée une
+        fois par `encode` puis conservée avec l'entrée (taille comptée).
+        """
+        data = value.encoded.get(encoding)
+        if data is not None:
+            return data
+        data = encode(value.body)
+        with self._lock:
+            if encoding in value.encoded:
+                return value.encoded[encoding]
+            entry = self._entries.get(key)
+            if entry is None or entry.value is not value:
+                return data                     # hors cache (BYPASS, évincée)
+            value.encoded[encoding] = data
+            entry.size += len(data)
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+        return data
+
+    def invalidate(self) -> None:
+        """ Vide le cache et invalide les chargements en cours. """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._generation += 1
+
+
+def catalog_key(endpoint: str, params: Dict[str, Any]) -> Tuple:
+    """
+    Construit une clé de cache à partir des paramètres de requête validés
+    (donc déjà normalisés par le schéma) : valeurs None/False/"" ignorées
+    (équivalentes à l'absence de filtre) et tri des clés.
+    """
+    return (endpoint, tuple(
+        (name, value) for name, value in sorted(params.items())
+        if value is not None and value is not False and value != ""
+    ))
+
+
+# Écritures des autres workers : version relue dans la session de la
+# requête (cf. app.database.catalog_version)
+catalog_cache = CatalogCache(
+    version_reader=lambda: read_catalog_version(get_session()))
+
+
+def invalidate_catalog(session: Optional[Session] = None) -> None:
+    """
+    Invalide le cache catalogue après une écriture produit/stock :
+    immédiatement, puis à nouveau au commit de `session` pour écarter
+    une lecture concurrente ayant remis en cache l'état pré-commit.
+    """
+    catalog_cache.invalidate()
+    if session is not None:
+        session.info["catalog_dirty"] = True
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_before_commit(session: Session) -> None:
+    # Dans la transaction de l'écriture : visible des autres process au
+    # même instant que les données
+    if session.info.get("catalog_dirty"):
+        bump_catalog_version(session)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    if session.info.pop("catalog_dirty", False):
+        catalog_cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _reset_after_rollback(session: Session) -> None:
+    session.info.pop("catalog_dirty", None)
@@ -0,0 +1,131 @@
+import zlib
+from flask import Flask, Response, current_app, g, request
+from typing import Callable, Iterable, Iterator, Optional
+
+
+'''
+Compression des réponses (gzip / deflate) négociée sur Accept-Encoding :
+    - types textuels uniquement (COMPRESSION_MIMETYPES), corps d'au moins
+      COMPRESSION_MIN_SIZE octets
+    - réponses en flux (exports) compressées morceau par morceau, sans
+      mise en mémoire du corps complet
+    - corps en cache (catalogue, documentation OpenAPI) : variante
+      compressée conservée avec le corps (cf. offer_cached)
+    - ETag : variante compressée suffixée (ETag fort) ou affaiblie
+'''
+# Paramètre wbits de zlib : conteneur gzip / zlib ("deflate" HTTP)
+_WBITS = {"gzip": 16 + zlib.MAX_WBITS, "deflate": zlib.MAX_WBITS}
+
+
+def choose_encoding(size: Optional[int] = None) -> Optional[str]:
+    """
+    Encodage accepté par le client pour un corps de `size` octets (None :
+    taille inconnue, flux), ou None si la réponse part non compressée.
+    """
+    config = current_app.config
+    if not config["COMPRESSION_ENABLED"]:
+        return None
+    if size is not None and size < config["COMPRESSION_MIN_SIZE"]:
+        return None
+    return request.accept_encodings.best_match(config["COMPRESSION_ENCODINGS"])
+
+
+def compressor(encoding: str, level: int) -> "zlib._Compress":
+    return zlib.compressobj(level, zlib.DEFLATED, _WBITS[encoding])
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    engine = compressor(encoding, level)
+    return engine.compress(data) + engine.flush()
+
+
+def compress_stream(chunks: Iterable, encoding: str,
+                    level: int) -> Iterator[bytes]:
+    """
+    Compresse un flux : chaque morceau est vidé (Z_SYNC_FLUSH) pour être
+    envoyé aussitôt, l'état du compresseur est conservé entre morceaux.
+    """
+    engine = compressor(encoding, level)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        data = engine.compress(chunk) + engine.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield engine.flush()
+
+
+def offer_encoded(body: bytes, encoding: str,
+                  provide: Callable[[], bytes]) -> None:
+    """
+    Signale une variante compressée déjà disponible (cache) du corps `body`
+    de la réponse en cours : utilisée si le corps final est inchangé,
+    l'ETag restant celui fixé par la vue.
+    """
+    g.encoded_body = (body, encoding, provide)
+
+
+def offer_cached(response: Response, body: bytes, etag: str,
+                 encoded: Callable[[str], bytes]) -> None:
+    """
+    Réponse d'un corps déjà sérialisé (cache) d'ETag fort `etag` : ETag
+    suffixé par l'encodage négocié, dont la variante est fournie par
+    `encoded(encoding)` (conservée par l'appelant).
+    """
+    encoding = choose_encoding(len(body))
+    if encoding is None:
+        response.set_etag(etag)
+        return
+    # Corps compressé au retour de la vue (après validation spectree)
+    offer_encoded(body, encoding, lambda: encoded(encoding))
+    response.set_etag(f"{etag}-{encoding}")
+
+
+def compressible(response: Response) -> bool:
+    return (response.mimetype in current_app.config["COMPRESSION_MIMETYPES"]
+            and 200 <= response.status_code < 300
+            and response.status_code != 204)
+
+
+def compress_response(response: Response) -> Response:
+    """ after_request : compresse la réponse si le client l'accepte. """
+    offered = g.pop("encoded_body", None)
+    if not compressible(response):
+        return response
+    response.vary.add("Accept-Encoding")
+    if "Content-Encoding" in response.headers:
+        return response
+
+    level = current_app.config["COMPRESSION_LEVEL"]
+    if response.is_streamed:
+        encoding = choose_encoding()
+        if encoding is None:
+            return response
+        stream = response.response
+        response.response = compress_stream(stream, encoding, level)
+        if hasattr(stream, "close"):
+            # Fin du flux d'origine (contexte de requête, curseur SQL)
+            response.call_on_close(stream.close)
+        response.headers.pop("Content-Length", None)
+    else:
+        body = response.get_data()
+        encoding = choose_encoding(len(body))
+        if encoding is None:
+            return response
+        if offered is not None and offered[:2] == (body, encoding):
+            # Variante en cache, ETag déjà propre à l'encodage
+            response.set_data(offered[2]())
+            response.headers["Content-Encoding"] = encoding
+            return response
+        response.set_data(compress(body, encoding, level))
+
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app: Flask) -> None:
+    """ Enregistre la compression des réponses (après le commit). """
+    app.after_request(compress_response)
@@ -18,16 +18,21 @@ class BadRequestError(ApplicationError):
 
 
 class UnauthorizedError(ApplicationError):
-    """ 401 Unauthorized """
+    """
+    401 Unauthorized ; `reason` : cause parmi un ensemble fixe (label de
+    métrique), missing_token, invalid_token, expired ou invalid_credentials
+    """
     status_code: int = 401
 
-    def __init__(self, message: str) -> None:
+    def __init__(self, message: str, reason: str = "invalid_token") -> None:
         super().__init__(message, status_code=self.status_code)
+        self.reason = reason
 
 
 class ForbiddenError(ApplicationError):
     """ 403 Forbidden """
     status_code: int = 403
+    reason: str = "forbidden"
 
     def __init__(self, message: str) -> None:
         super().__init__(message, status_code=self.status_code)
@@ -39,3 +44,12 @@ class NotFoundError(ApplicationError):
 
     def __init__(self, message: str) -> None:
         super().__init__(message, status_code=self.status_code)
+
+
+class ServiceUnavailableError(ApplicationError):
+    """ 503 Service Unavailable (réessayer après `retry_after` secondes) """
+    status_code: int = 503
+
+    def __init__(self, message: str, retry_after: int = 1) -> None:
+        super().__init__(message, status_code=self.status_code)
+        self.retry_after = retry_after
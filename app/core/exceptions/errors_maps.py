@@ -23,7 +23,8 @@ APP_ERROR_MAP = {
         400: {"error": "Adresse e-mail déjà utilisée"},
         401: {"error": "Accès refusé "},
         403: {"error": "Identifiants invalides"},
-        404: {"error": "Client introuvable "}
+        404: {"error": "Client introuvable "},
+        503: {"error": "Service d'authentification saturé, réessayer"}
     },
     "global": {
         500: {"error": "Erreur Interne"}
@@ -0,0 +1,92 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from flask import Response, current_app, g, stream_with_context
+from sqlalchemy import Select
+from sqlalchemy.orm import Session
+from typing import Any, Callable, Dict, Iterator, List
+
+
+'''
+Exports en flux (NDJSON / CSV) :
+    - requête en colonnes lue par lots (`yield_per`) pendant l'écriture
+      de la réponse
+    - un morceau de réponse (chunk) par lot : mémoire du worker constante
+      quelle que soit la taille de l'export
+    - routes sans @spec.validate : spectree relit tout le corps de la
+      réponse (get_data), ce qui annulerait le flux ; la query string est
+      validée directement par son schéma pydantic (422 via errors_handlers)
+'''
+EXPORT_MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _value(value: Any) -> Any:
+    """ Valeur sérialisable (dates ISO 8601). """
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _ndjson_chunk(rows: List[Dict[str, Any]]) -> str:
+    return "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+
+
+def _csv_writer() -> Callable[[List[Dict[str, Any]], bool], str]:
+    """ Écrit des lots de lignes en CSV (en-tête avec le premier lot). """
+    buffer = io.StringIO()
+
+    def write(rows: List[Dict[str, Any]], header: bool) -> str:
+        writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+        if header:
+            writer.writeheader()
+        writer.writerows(rows)
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    return write
+
+
+def stream_export(session: Session, query: Select, fmt: str,
+                  batch_size: int = 1000) -> Iterator[str]:
+    """
+    Exécute `query` par lots de `batch_size` lignes et produit un morceau
+    NDJSON/CSV par lot. La requête n'est émise qu'à la première itération
+    (après la fin du traitement de la requête HTTP).
+    """
+    result = session.execute(query.execution_options(yield_per=batch_size))
+    write_csv = _csv_writer()
+    header = True
+    try:
+        for partition in result.partitions():
+            rows = [{key: _value(value) for key, value in row._mapping.items()}
+                    for row in partition]
+            if fmt == "csv":
+                yield write_csv(rows, header)
+                header = False
+            else:
+                yield _ndjson_chunk(rows)
+        if fmt == "csv" and header:
+            # Export vide : en-tête seul
+            yield ",".join(query.selected_columns.keys()) + "\r\n"
+    finally:
+        result.close()
+
+
+def export_response(query: Select, fmt: str, batch_size: int,
+                    filename: str) -> Response:
+    """
+    Réponse HTTP en flux (chunked) d'un export NDJSON/CSV : la requête SQL
+    est lue par lots pendant l'envoi, dans le contexte de la requête
+    (session `g.session` conservée jusqu'à la fin du flux).
+    """
+    stream = stream_with_context(
+        stream_export(g.session, query, fmt, batch_size))
+    response = current_app.response_class(stream,
+                                          mimetype=EXPORT_MIMETYPES[fmt])
+    response.headers["Content-Disposition"] = (
+        f'attachment; filename="{filename}.{fmt}"')
+    response.headers["Cache-Control"] = "no-store"
+    return response
@@ -0,0 +1,98 @@
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from flask import g, has_app_context
+from flask.json.provider import DefaultJSONProvider
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+'''
+Mesures par requête (activées par SQL_INSTRUMENTATION, hooks dans
+app.database.sessions.init_instrumentation) :
+    - db : nombre de requêtes SQL et temps passé dans le driver
+    - serialize : encodage JSON des réponses (provider JSON Flask)
+    - validate : validation spectree des requêtes et réponses
+Restituées dans l'en-tête `Server-Timing` (et un log structuré optionnel).
+'''
+PHASES = ("db", "serialize", "validate")
+
+# Listes `IN (?, ?, ...)` ramenées à une seule forme
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """ Forme normalisée d'une requête SQL (détection des répétitions). """
+    return _SPACES.sub(" ", _IN_LIST.sub("(?)", statement)).strip()
+
+
+class RequestMetrics:
+    """ Compteurs et durées (secondes) de la requête en cours. """
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.statements = 0
+        self.timings: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.shapes: Counter = Counter()
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.timings[phase] += seconds
+
+    def add_statement(self, statement: str, seconds: float) -> None:
+        self.statements += 1
+        self.timings["db"] += seconds
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """ Formes exécutées plus de `threshold` fois (N+1 probable). """
+        return [(shape, count) for shape, count in self.shapes.most_common()
+                if count > threshold]
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+    def server_timing(self) -> str:
+        """ Valeur de l'en-tête Server-Timing (durées en ms, ASCII). """
+        ms = {phase: value * 1000 for phase, value in self.timings.items()}
+        return ", ".join((
+            f'db;dur={ms["db"]:.2f};desc="{self.statements} SQL queries"',
+            f"ser;dur={ms['serialize']:.2f}",
+            f"val;dur={ms['validate']:.2f}",
+            f"app;dur={self.elapsed() * 1000:.2f}",
+        ))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "statements": self.statements,
+            **{f"{phase}_ms": round(value * 1000, 2)
+               for phase, value in self.timings.items()},
+            "total_ms": round(self.elapsed() * 1000, 2),
+        }
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    """ Mesures de la requête en cours (None hors requête instrumentée). """
+    return g.get("request_metrics") if has_app_context() else None
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """ Ajoute la durée du bloc à la phase `phase` de la requête en cours. """
+    metrics = current_metrics()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add(phase, time.perf_counter() - start)
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """ Provider JSON Flask (jsonify, app.json) chronométré. """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        with timed("serialize"):
+            return super().dumps(obj, **kwargs)
@@ -0,0 +1,444 @@
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+from flask import Flask, Response, g, request
+from pathlib import Path
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.cache import catalog_cache
+from app.core.auth_cache import token_cache, principal_cache
+from typing import (
+    Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+)
+
+try:
+    import fcntl
+except ImportError:                 # Windows : instantanés non regroupés
+    fcntl = None  # type: ignore[assignment]
+
+
+'''
+Registre de métriques au format texte Prometheus (GET /metrics) :
+    - compteurs et histogrammes à buckets fixes, enregistrés sans verrou
+      (un dictionnaire par thread, fusionnés à la lecture)
+    - métriques calculées à la lecture (callbacks : caches, pool)
+    - multi-process (plusieurs workers) : chaque process écrit
+      périodiquement son instantané dans METRICS_MULTIPROC_DIR, la lecture
+      additionne les instantanés de tous les process ; ceux des process
+      terminés sont regroupés dans metrics_dead.json (répertoire borné)
+'''
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0)
+
+Key = Tuple[str, Tuple[str, ...]]           # (métrique, valeurs des labels)
+Snapshot = Dict[Key, Any]                   # float ou [buckets..., somme]
+
+
+class Metric:
+    """ Définition d'une métrique (nom, aide, type, labels). """
+    kind = "untyped"
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help: str,
+                 labelnames: Sequence[str] = ()) -> None:
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        data = self.registry.thread_data()
+        key = (self.name, labels)
+        data[key] = data.get(key, 0.0) + amount
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help: str,
+                 labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(registry, name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        data = self.registry.thread_data()
+        key = (self.name, labels)
+        counts = data.get(key)
+        if counts is None:
+            # Comptes par bucket (+Inf compris), puis somme des valeurs
+            counts = data[key] = [0.0] * (len(self.buckets) + 2)
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+
+class CallbackMetric(Metric):
+    """ Valeurs lues à la collecte : `callback()` -> [(labels, valeur)]. """
+
+    def __init__(self, registry: "MetricsRegistry", name: str, help: str,
+                 labelnames: Sequence[str], kind: str,
+                 callback: Callable[[], Iterable[Tuple[Tuple[str, ...],
+                                                       float]]]
+                 ) -> None:
+        super().__init__(registry, name, help, labelnames)
+        self.kind = kind
+        self.callback = callback
+
+
+def _add(target: Snapshot, key: Key, value: Any) -> None:
+    current = target.get(key)
+    if current is None:
+        target[key] = list(value) if isinstance(value, list) else value
+    elif isinstance(value, list):
+        for i, v in enumerate(value):
+            current[i] += v
+    else:
+        target[key] = current + value
+
+
+def _escape(value: str) -> str:
+    return (str(value).replace("\\", "\\\\").replace("\n", "\\n")
+            .replace('"', '\\"'))
+
+
+def _labels(names: Sequence[str], values: Sequence[str],
+            extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsRegistry:
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._threads: List[Tuple[threading.Thread, Snapshot]] = []
+        self._retired: Snapshot = {}
+        self.multiproc_dir: Optional[Path] = None
+        self.flush_interval = 5.0
+        self._flusher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        # PID dont ce process a écrit l'instantané (cf. _claim_pid)
+        self._flushed_pid: Optional[int] = None
+
+    # --- Définitions ---
+    def _register(self, metric: Metric) -> Any:
+        with self._lock:
+            self._metrics.setdefault(metric.name, metric)
+            return self._metrics[metric.name]
+
+    def counter(self, name: str, help: str,
+                labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(self, name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(self, name, help, labelnames, buckets))
+
+    def callback(self, name: str, help: str, labelnames: Sequence[str],
+                 kind: str, callback: Callable) -> CallbackMetric:
+        return self._register(
+            CallbackMetric(self, name, help, labelnames, kind, callback))
+
+    # --- Enregistrement ---
+    def thread_data(self) -> Snapshot:
+        """ Dictionnaire du thread courant (seul à y écrire : sans verrou). """
+        data = getattr(self._local, "data", None)
+        if data is None:
+            data = self._local.data = {}
+            with self._lock:
+                # Threads terminés fusionnés ici aussi : liste bornée aux
+                # threads vivants, même sans lecture des métriques
+                self._retire_finished()
+                self._threads.append((threading.current_thread(), data))
+        return data
+
+    def _retire_finished(self) -> None:
+        """ Fusionne les dictionnaires des threads terminés (sous verrou). """
+        alive = []
+        for thread, data in self._threads:
+            if thread.is_alive():
+                alive.append((thread, data))
+            else:
+                for key, value in data.items():
+                    _add(self._retired, key, value)
+        self._threads = alive
+
+    # --- Collecte ---
+    def snapshot(self) -> Snapshot:
+        """ Valeurs du process : threads (terminés compris) et callbacks. """
+        with self._lock:
+            self._retire_finished()
+            alive = self._threads
+            result: Snapshot = {}
+            for key, value in self._retired.items():
+                _add(result, key, value)
+            metrics = list(self._metrics.values())
+
+        for _, data in alive:
+            for key, value in data.copy().items():
+                _add(result, key, value)
+        for metric in metrics:
+            if isinstance(metric, CallbackMetric):
+                for labels, value in metric.callback():
+                    _add(result, (metric.name, tuple(labels)), value)
+        return result
+
+    def collect(self) -> Snapshot:
+        """ Valeurs agrégées de tous les process (ou du seul process). """
+        if self.multiproc_dir is None:
+            return self.snapshot()
+        self.flush()
+        paths = list(self.multiproc_dir.glob("metrics_*.json"))
+        for path in paths:
+            pid = path.stem.split("_", 1)[1]
+            if pid.isdigit() and not _pid_alive(int(pid)):
+                self._fold_dead(path)
+
+        result: Snapshot = {}
+        for path in self.multiproc_dir.glob("metrics_*.json"):
+            try:
+                samples = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue            # fichier en cours de remplacement
+            # Process terminé non regroupé : compteurs conservés, jauges
+            # ignorées
+            pid = path.stem.split("_", 1)[1]
+            alive = pid.isdigit() and _pid_alive(int(pid))
+            for name, labels, value in samples:
+                metric = self._metrics.get(name)
+                if alive or metric is None or metric.kind != "gauge":
+                    _add(result, (name, tuple(labels)), value)
+        return result
+
+    def _fold_dead(self, path: Path) -> None:
+        """
+        Ajoute l'instantané d'un process terminé (hors jauges) à
+        metrics_dead.json puis le supprime : un worker recyclé ne laisse
+        pas de fichier, un PID réutilisé n'écrase pas ses valeurs.
+        """
+        if fcntl is None or self.multiproc_dir is None:
+            return
+        dead = self.multiproc_dir / "metrics_dead.json"
+        with open(self.multiproc_dir / "metrics_dead.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                samples = json.loads(path.read_text())
+            except FileNotFoundError:
+                return              # déjà regroupé par un autre process
+            except (OSError, ValueError):
+                return
+            totals: Snapshot = {}
+            if dead.exists():
+                for name, labels, value in json.loads(dead.read_text()):
+                    _add(totals, (name, tuple(labels)), value)
+            for name, labels, value in samples:
+                metric = self._metrics.get(name)
+                if metric is None or metric.kind != "gauge":
+                    _add(totals, (name, tuple(labels)), value)
+            tmp = dead.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(
+                [[name, list(labels), value]
+                 for (name, labels), value in totals.items()]))
+            os.replace(tmp, dead)
+            path.unlink()
+
+    def render(self) -> str:
+        """ Exposition au format texte Prometheus (version 0.0.4). """
+        values = self.collect()
+        by_metric: Dict[str, List[Tuple[Tuple[str, ...], Any]]] = {}
+        for (name, labels), value in sorted(values.items()):
+            by_metric.setdefault(name, []).append((labels, value))
+
+        with self._lock:
+            metrics = list(self._metrics.items())
+        lines: List[str] = []
+        for name, metric in metrics:
+            lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            for labels, value in by_metric.get(name, ()):
+                label_text = _labels(metric.labelnames, labels)
+                if isinstance(metric, Histogram):
+                    cumulative = 0.0
+                    bounds = [*map(_number, metric.buckets), "+Inf"]
+                    for bound, count in zip(bounds, value[:-1]):
+                        cumulative += count
+                        bucket = _labels(metric.labelnames, labels,
+                                         ("le", bound))
+                        lines.append(f"{name}_bucket{bucket}"
+                                     f" {_number(cumulative)}")
+                    lines.append(f"{name}_sum{label_text}"
+                                 f" {_number(value[-1])}")
+                    lines.append(f"{name}_count{label_text}"
+                                 f" {_number(cumulative)}")
+                else:
+                    lines.append(f"{name}{label_text} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    # --- Multi-process ---
+    def configure(self, config: Dict[str, Any]) -> None:
+        """ Applique METRICS_MULTIPROC_DIR / METRICS_FLUSH_INTERVAL. """
+        directory = config.get("METRICS_MULTIPROC_DIR")
+        self.flush_interval = config.get("METRICS_FLUSH_INTERVAL",
+                                         self.flush_interval)
+        self.multiproc_dir = Path(directory) if directory else None
+        if self.multiproc_dir is not None:
+            self.multiproc_dir.mkdir(parents=True, exist_ok=True)
+            self._claim_pid()
+            self._start_flusher()
+
+    def flush(self) -> None:
+        """ Écrit l'instantané du process (remplacement atomique). """
+        if self.multiproc_dir is None:
+            return
+        samples = [[name, list(labels), value]
+                   for (name, labels), value in self.snapshot().items()]
+        path = self.multiproc_dir / f"metrics_{os.getpid()}.json"
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(samples))
+        os.replace(tmp, path)
+        self._flushed_pid = os.getpid()
+
+    def _claim_pid(self) -> None:
+        """ Fichier de ce PID laissé par un process terminé : regroupé. """
+        path = self.multiproc_dir / f"metrics_{os.getpid()}.json"
+        if self._flushed_pid != os.getpid() and path.exists():
+            self._fold_dead(path)
+
+    def _start_flusher(self) -> None:
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+
+        def run() -> None:
+            while not self._stop.wait(self.flush_interval):
+                self.flush()
+
+        self._flusher = threading.Thread(target=run, name="metrics-flush",
+                                         daemon=True)
+        self._flusher.start()
+
+    def _after_fork(self) -> None:
+        """ Process enfant (worker) : valeurs propres, flusher relancé. """
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._threads = []
+        self._retired = {}
+        self._flusher = None
+        if self.multiproc_dir is not None:
+            self._claim_pid()
+            self._start_flusher()
+
+
+registry = MetricsRegistry()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=registry._after_fork)
+atexit.register(registry.flush)
+
+
+'''
+Métriques de l'application : requêtes HTTP (par endpoint, méthode et
+statut), échecs d'authentification, validation des réponses, pool
+SQLAlchemy et caches
+'''
+http_requests = registry.counter(
+    "http_requests_total", "Requêtes HTTP traitées",
+    ("method", "endpoint", "status"))
+http_duration = registry.histogram(
+    "http_request_duration_seconds", "Durée de traitement des requêtes HTTP",
+    ("method", "endpoint", "status"))
+auth_failures = registry.counter(
+    "auth_failures_total", "Échecs d'authentification/autorisation",
+    ("status", "reason"))
+response_validations = registry.counter(
+    "response_validations_total",
+    "Réponses validées par spectree (échantillon) par résultat",
+    ("endpoint", "result"))
+db_checkouts = registry.counter(
+    "db_pool_checkouts_total", "Connexions empruntées au pool SQLAlchemy")
+db_connects = registry.counter(
+    "db_pool_connections_total", "Connexions DBAPI ouvertes par le pool")
+
+
+def _cache_requests() -> List[Tuple[Tuple[str, ...], float]]:
+    return [
+        (("catalog", "hit"), catalog_cache.hits),
+        (("catalog", "stale"), catalog_cache.stale_hits),
+        (("catalog", "miss"), catalog_cache.misses),
+        (("auth_token", "hit"), token_cache.hits),
+        (("auth_token", "miss"), token_cache.misses),
+        (("auth_principal", "hit"), principal_cache.hits),
+        (("auth_principal", "miss"), principal_cache.misses),
+    ]
+
+
+registry.callback(
+    "cache_requests_total",
+    "Lectures des caches par résultat (ratio : hit / total)",
+    ("cache", "result"), "counter", _cache_requests)
+
+
+def init_metrics(app: Flask, engine: Engine) -> None:
+    """
+    Enregistre les métriques de l'application (METRICS_ENABLED) :
+        - durée et statut de chaque requête (hooks Flask)
+        - emprunts/ouvertures de connexions (événements du pool)
+        - connexions en cours d'emprunt (lues à la collecte)
+    """
+    registry.configure(app.config)
+
+    if not event.contains(engine, "checkout", _on_checkout):
+        event.listen(engine, "checkout", _on_checkout)
+        event.listen(engine, "connect", _on_connect)
+
+    registry.callback(
+        "db_pool_checked_out", "Connexions actuellement empruntées au pool",
+        (), "gauge",
+        lambda: [((), engine.pool.checkedout())]
+        if hasattr(engine.pool, "checkedout") else [])
+
+    @app.before_request
+    def start_timer() -> None:
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def record_request(response: Response) -> Response:
+        start = g.pop("metrics_start", None)
+        if start is not None:
+            status = str(response.status_code)
+            endpoint = request.endpoint or "unmatched"
+            http_requests.inc(request.method, endpoint, status)
+            http_duration.observe(time.perf_counter() - start,
+                                  request.method, endpoint, status)
+        return response
+
+
+def _on_checkout(dbapi_connection, connection_record,
+                 connection_proxy) -> None:
+    db_checkouts.inc()
+
+
+def _on_connect(dbapi_connection, connection_record) -> None:
+    db_connects.inc()
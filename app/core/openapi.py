@@ -0,0 +1,99 @@
+import os
+import threading
+from flask import Flask, Response, current_app, request
+from app.core.cache import CachedBody
+from app.core.compression import compress, offer_cached
+from typing import Any, Callable, Dict
+
+
+'''
+Documentation OpenAPI servie depuis des octets pré-encodés :
+    - document rendu une seule fois par application : au premier
+      accès, ou lu depuis OPENAPI_DOCUMENT_PATH s'il a été généré au build
+      (python -m app.cli.openapi --output <fichier>)
+    - pages Swagger / Redoc / Scalar rendues une fois de même
+    - ETag fort (contenu) et 304, variantes compressées calculées une fois
+'''
+
+
+class DocumentStore:
+    """ Corps de documentation (clé -> CachedBody), rendus une seule fois. """
+
+    def __init__(self) -> None:
+        self._bodies: Dict[str, CachedBody] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, render: Callable[[], bytes]) -> CachedBody:
+        cached = self._bodies.get(key)
+        if cached is None:
+            with self._lock:
+                cached = self._bodies.get(key)
+                if cached is None:
+                    cached = self._bodies[key] = CachedBody.build(render())
+        return cached
+
+    def encoded(self, cached: CachedBody, encoding: str, level: int) -> bytes:
+        """ Variante compressée du corps, calculée au premier besoin. """
+        data = cached.encoded.get(encoding)
+        if data is None:
+            data = cached.encoded.setdefault(
+                encoding, compress(cached.body, encoding, level))
+        return data
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bodies.clear()
+
+
+def app_documents(app: Flask) -> DocumentStore:
+    """ Documents de l'application (app.extensions), créés à la demande. """
+    store = app.extensions.get("openapi_documents")
+    if store is None:
+        store = app.extensions.setdefault("openapi_documents", DocumentStore())
+    return store
+
+
+def render_openapi(spectree: Any) -> bytes:
+    """ Document OpenAPI généré par spectree, encodé en JSON. """
+    return current_app.json.dumps(spectree.spec).encode()
+
+
+def load_openapi(spectree: Any) -> bytes:
+    """ Document pré-généré au build si disponible, sinon rendu. """
+    path = current_app.config.get("OPENAPI_DOCUMENT_PATH")
+    if path:
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                return f.read()
+        current_app.logger.warning(
+            "Document OpenAPI %s introuvable, généré au premier accès", path)
+    return render_openapi(spectree)
+
+
+def document_response(key: str, mimetype: str,
+                      render: Callable[[], bytes]) -> Response:
+    """ Réponse d'un document en cache (ETag, 304, compression). """
+    config = current_app.config
+    documents = app_documents(current_app)
+    cached = documents.get(key, render)
+    response = current_app.response_class(cached.body, mimetype=mimetype)
+    offer_cached(response, cached.body, cached.etag,
+                 lambda encoding: documents.encoded(
+                     cached, encoding, config["COMPRESSION_LEVEL"]))
+    if config.get("OPENAPI_CACHE_CONTROL"):
+        response.headers["Cache-Control"] = config["OPENAPI_CACHE_CONTROL"]
+    return response.make_conditional(request)
+
+
+def openapi_response(spectree: Any) -> Response:
+    return document_response("openapi", "application/json",
+                             lambda: load_openapi(spectree))
+
+
+def page_response(spectree: Any, ui: str) -> Response:
+    """ Page de documentation `ui` (swagger, redoc, scalar...). """
+    config = spectree.config
+    return document_response(f"page:{ui}", "text/html", lambda: (
+        config.page_templates[ui].format(
+            spec_url=config.spec_url, spec_path=config.path,
+            **config.swagger_oauth2_config()).encode()))
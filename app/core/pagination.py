@@ -0,0 +1,100 @@
+import base64
+import binascii
+import json
+from flask import request
+from urllib.parse import urlencode
+from app.core.exceptions.app_errors import BadRequestError
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# Pagination par curseur (keyset) : tri stable sur (clé de tri, id)
+
+def encode_cursor(sort: str, key: Any, row_id: int) -> str:
+    """ Curseur opaque (base64 url-safe) construit sur le dernier élément. """
+    raw = json.dumps({"s": sort, "k": key, "id": row_id},
+                     separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    """
+    Décode un curseur opaque et retourne (clé de tri, id).
+    Lève BadRequestError si le curseur est invalide ou d'un autre tri.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        key, row_id = data["k"], int(data["id"])
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise BadRequestError("Curseur invalide")
+    # Clé liée telle quelle dans la requête SQL : scalaire uniquement
+    if isinstance(key, bool) or not isinstance(key, (int, float, str)):
+        raise BadRequestError("Curseur invalide")
+
+    if data.get("s") != sort:
+        raise BadRequestError("Curseur incompatible avec le tri demandé")
+    return key, row_id
+
+
+def paginate(query: Query, sort: str, sort_column: InstrumentedAttribute,
+             id_column: InstrumentedAttribute, limit: Optional[int],
+             after: Optional[str] = None,
+             row_key: Optional[Callable[[Any], Tuple[Any, int]]] = None
+             ) -> Tuple[List[Any], Optional[str]]:
+    """
+    Applique une pagination keyset sur `query` (tri croissant).
+
+    Retourne un tuple (page de `limit` éléments max, curseur suivant ou None) ;
+    `limit` None : tous les éléments, sans curseur.
+    Une ligne supplémentaire est lue pour savoir s'il reste des résultats,
+    sans jamais recourir à OFFSET ni COUNT.
+    `row_key` extrait (clé de tri, id) d'une ligne composite (ex. Row ORM) ;
+    par défaut, lecture des attributs des colonnes de tri sur la ligne.
+    """
+    if after:
+        key, row_id = decode_cursor(after, sort)
+        if sort_column is id_column:
+            query = query.filter(id_column > row_id)
+        else:
+            query = query.filter(or_(
+                sort_column > key,
+                and_(sort_column == key, id_column > row_id)
+            ))
+
+    order_by = ((id_column,) if sort_column is id_column
+                else (sort_column, id_column))
+    if limit is None:
+        return query.order_by(*order_by).all(), None
+    rows = query.order_by(*order_by).limit(limit + 1).all()
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    if row_key:
+        key, row_id = row_key(last)
+    else:
+        key = getattr(last, sort_column.key)
+        row_id = getattr(last, id_column.key)
+    return rows, encode_cursor(sort, key, row_id)
+
+
+def page_headers(next_cursor: Optional[str]) -> Dict[str, str]:
+    """
+    Retourne les en-têtes de pagination de la réponse courante :
+        - X-Next-Cursor : curseur opaque de la page suivante
+        - Link (rel="next") : URL de la page suivante
+    """
+    if not next_cursor:
+        return {}
+
+    args = request.args.to_dict()
+    args["after"] = next_cursor
+    return {
+        "X-Next-Cursor": next_cursor,
+        "Link": f'<{request.base_url}?{urlencode(args)}>; rel="next"',
+    }
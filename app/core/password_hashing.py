@@ -0,0 +1,277 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from werkzeug.security import (
+    DEFAULT_PBKDF2_ITERATIONS, generate_password_hash, check_password_hash
+)
+from app.core.exceptions.app_errors import ServiceUnavailableError
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+'''
+Hachage des mots de passe hors du thread de requête :
+    - calculs (scrypt/pbkdf2, volontairement coûteux) exécutés dans un pool
+      de processus borné : les autres requêtes du worker ne sont pas bloquées
+    - file d'attente limitée : au-delà, refus immédiat (503 + Retry-After)
+      plutôt qu'une accumulation de connexions en attente
+    - coût calibré au démarrage, en tâche de fond (méthode configurée
+      utilisée d'ici là), pour viser une latence cible sur la machine, sans
+      descendre sous les minimums recommandés
+    - hachages d'un autre algorithme ou d'un coût nettement inférieur
+      re-calculés à la connexion réussie
+'''
+SCRYPT_MIN_N = 2 ** 15          # défaut werkzeug
+SCRYPT_R = 8
+# Mémoire par hachage scrypt (128·n·r octets), multipliée par les hachages
+# simultanés du pool : plafonne la calibration quelle que soit la latence
+SCRYPT_MAX_MEMORY_MB = 64
+PBKDF2_MIN_ITERATIONS = 600_000
+# Re-hachage si le coût stocké est plus de REHASH_COST_RATIO fois inférieur
+# au coût courant : les calibrations (par process, mesurées) diffèrent
+# légèrement d'un worker ou redémarrage à l'autre, sans aller-retour
+REHASH_COST_RATIO = 2
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_method(method: str) -> str:
+    """
+    Méthode complète (paramètres par défaut werkzeug explicités) :
+    `scrypt` -> `scrypt:32768:8:1`, sans calcul de hachage.
+    """
+    family, *args = method.split(":")
+    if family == "scrypt" and not args:
+        return f"scrypt:{SCRYPT_MIN_N}:8:1"
+    if family == "pbkdf2" and len(args) < 2:
+        hash_name = args[0] if args else "sha256"
+        return f"pbkdf2:{hash_name}:{DEFAULT_PBKDF2_ITERATIONS}"
+    if family not in ("scrypt", "pbkdf2"):
+        raise ValueError(f"Méthode de hachage inconnue : {method}")
+    return method
+
+
+def method_cost(method: str) -> Tuple[str, int]:
+    """
+    (algorithme, coût) d'une méthode : `scrypt` (n·r·p) ou `pbkdf2:<hash>`
+    (itérations). ValueError si la méthode est invalide.
+    """
+    family, *args = canonical_method(method).split(":")
+    if family == "scrypt":
+        n, r, p = map(int, args)
+        return family, n * r * p
+    return f"{family}:{args[0]}", int(args[1])
+
+
+def _duration_ms(method: str) -> float:
+    start = time.perf_counter()
+    generate_password_hash("calibration", method)
+    return (time.perf_counter() - start) * 1000
+
+
+def scrypt_max_n(max_memory_mb: float, r: int = SCRYPT_R) -> int:
+    """ Plus grand n (puissance de 2, >= SCRYPT_MIN_N) tenant en mémoire. """
+    n = SCRYPT_MIN_N
+    while 128 * (n * 2) * r <= max_memory_mb * 2 ** 20:
+        n *= 2
+    return n
+
+
+def calibrate(method: str, target_ms: float,
+              max_memory_mb: float = SCRYPT_MAX_MEMORY_MB) -> str:
+    """
+    Retourne la méthode werkzeug (`scrypt` ou `pbkdf2:<hash>`) paramétrée
+    avec le coût le plus faible atteignant `target_ms` par hachage (scrypt :
+    sans dépasser `max_memory_mb` par hachage).
+    """
+    family = method.split(":")
+    if family[0] == "scrypt":
+        n, max_n = SCRYPT_MIN_N, scrypt_max_n(max_memory_mb)
+        while (n < max_n
+               and _duration_ms(f"scrypt:{n}:{SCRYPT_R}:1") < target_ms):
+            n *= 2
+        return f"scrypt:{n}:{SCRYPT_R}:1"
+
+    if family[0] == "pbkdf2":
+        hash_name = family[1] if len(family) > 1 else "sha256"
+        sample = 100_000
+        elapsed = _duration_ms(f"pbkdf2:{hash_name}:{sample}")
+        iterations = int(sample * target_ms / max(elapsed, 1e-3))
+        return f"pbkdf2:{hash_name}:{max(iterations, PBKDF2_MIN_ITERATIONS)}"
+
+    raise ValueError(f"Méthode de hachage non calibrable : {method}")
+
+
+class PasswordHasher:
+    """
+    Hachage/vérification des mots de passe dans un pool de `workers`
+    processus (0 = dans le thread appelant), avec au plus `queue_size`
+    demandes en attente.
+    """
+
+    def __init__(self, method: str = "scrypt:32768:8:1", workers: int = 0,
+                 queue_size: int = 32, timeout: float = 5.0) -> None:
+        self._method = method
+        # (méthode, latence cible, mémoire max) en attente de calibration
+        self._calibration: Optional[Tuple[str, float, float]] = None
+        self._calibration_lock = threading.Lock()
+        self._calibration_thread: Optional[threading.Thread] = None
+        # Calibration interrompue par un fork, relancée au 1er usage
+        self._resume_calibration = False
+        self.timeout = timeout
+        self._setup(workers, queue_size)
+
+    def _setup(self, workers: int, queue_size: int) -> None:
+        self.workers = workers
+        self.queue_size = queue_size
+        self._slots = threading.BoundedSemaphore(max(workers, 1) + queue_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def configure(self, config: Dict[str, Any]) -> None:
+        """
+        Applique les paramètres PASSWORD_HASH_* ; la calibration éventuelle
+        tourne dans un thread de fond (démarrage et requêtes non bloqués).
+        """
+        self.shutdown()
+        method = config.get("PASSWORD_HASH_METHOD", self._method)
+        with self._calibration_lock:
+            self._method = canonical_method(method)
+            self._calibration = None
+            self._resume_calibration = False
+            if config.get("PASSWORD_HASH_CALIBRATE"):
+                self._calibration = (
+                    method, config.get("PASSWORD_HASH_TARGET_MS", 250),
+                    config.get("PASSWORD_HASH_MAX_MEMORY_MB",
+                               SCRYPT_MAX_MEMORY_MB))
+        self._start_calibration()
+        self.timeout = config.get("PASSWORD_HASH_TIMEOUT", self.timeout)
+        self._setup(config.get("PASSWORD_HASH_WORKERS", self.workers),
+                    config.get("PASSWORD_HASH_QUEUE", self.queue_size))
+
+    @property
+    def method(self) -> str:
+        """ Méthode courante (configurée tant que la calibration tourne). """
+        if self._resume_calibration:
+            with self._calibration_lock:
+                resume, self._resume_calibration = \
+                    self._resume_calibration, False
+            if resume:
+                self._start_calibration()
+        return self._method
+
+    def _start_calibration(self) -> None:
+        calibration = self._calibration
+        if calibration is None:
+            return
+
+        def run() -> None:
+            method = canonical_method(calibrate(*calibration))
+            with self._calibration_lock:
+                # Ignorée si reconfiguré entre-temps
+                if self._calibration is calibration:
+                    self._method = method
+                    self._calibration = None
+
+        self._calibration_thread = threading.Thread(
+            target=run, name="password-calibration", daemon=True)
+        self._calibration_thread.start()
+
+    def wait_calibration(self, timeout: Optional[float] = None) -> bool:
+        """ Attend la fin de la calibration en cours ; True si terminée. """
+        if self._calibration_thread is not None:
+            self._calibration_thread.join(timeout)
+        return self._calibration is None
+
+    def _after_fork(self) -> None:
+        # Threads et pool non hérités par l'enfant. Calibration relancée au
+        # 1er usage de `method` seulement : les processus du pool (forkés
+        # eux aussi) n'en font pas usage et ne calibrent pas
+        self._calibration_lock = threading.Lock()
+        self._calibration_thread = None
+        self._resume_calibration = self._calibration is not None
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # fork si disponible : ni réimport du script principal (spawn,
+                # forkserver), ni garde `if __name__ == "__main__"` requise
+                methods = multiprocessing.get_all_start_methods()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(
+                        "fork" if "fork" in methods else None))
+            return self._executor
+
+    def _disable_pool(self, error: Exception) -> None:
+        """ Pool inutilisable : hachage dans le thread appelant. """
+        logger.warning("Pool de hachage indisponible (%s), hachage dans le "
+                       "thread de requête", error)
+        self.shutdown()
+        self.workers = 0
+
+    def _run(self, func: Callable, *args: Any) -> Any:
+        if self.workers <= 0:
+            return func(*args)
+
+        if not self._slots.acquire(blocking=False):
+            raise ServiceUnavailableError(
+                "Service d'authentification saturé, réessayer")
+        try:
+            future = self._get_executor().submit(func, *args)
+        except (RuntimeError, OSError) as e:
+            self._slots.release()
+            self._disable_pool(e)
+            return func(*args)
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            raise ServiceUnavailableError(
+                "Service d'authentification saturé, réessayer")
+        except BrokenProcessPool as e:
+            self._disable_pool(e)
+            return func(*args)
+
+    def hash(self, password: str) -> str:
+        """ Hache un mot de passe avec la méthode (calibrée) courante. """
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash: str, password: str) -> bool:
+        """ Vérifie un mot de passe contre son hachage (toute méthode). """
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash: str) -> bool:
+        """
+        Indique si le hachage utilise un autre algorithme que l'actuel, ou
+        un coût nettement inférieur (cf. REHASH_COST_RATIO).
+        """
+        try:
+            family, cost = method_cost(pwhash.split("$", 1)[0])
+        except ValueError:
+            return True
+        current_family, current_cost = method_cost(self.method)
+        return (family != current_family
+                or cost * REHASH_COST_RATIO < current_cost)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+# Pool arrêté à la sortie du process, abandonné par un enfant forké
+# (gunicorn --preload)
+password_hasher = PasswordHasher()
+atexit.register(password_hasher.shutdown)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=password_hasher._after_fork)
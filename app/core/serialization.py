@@ -0,0 +1,50 @@
+from functools import lru_cache
+from flask import Response, current_app
+from pydantic import BaseModel, TypeAdapter
+from app.core.instrumentation import timed
+from typing import Any, Generic, Iterable, List, Type, TypeVar
+
+
+'''
+Sérialisation des réponses de liste en un seul passage :
+    lignes ORM -> validation de la liste entière (TypeAdapter mis en cache,
+    from_attributes) -> octets JSON (pydantic-core), sans dict
+    intermédiaire par ligne ni `jsonify`.
+Même contenu que `Schema.model_validate(row).model_dump()` + jsonify
+(les dates suivent le format HTTP de jsonify, cf. OrderRespSchema).
+'''
+M = TypeVar("M", bound=BaseModel)
+
+
+class ListSerializer(Generic[M]):
+    """ Validation et encodage JSON d'une liste de `schema`. """
+
+    def __init__(self, schema: Type[M]) -> None:
+        self.schema = schema
+        self.adapter: TypeAdapter[List[M]] = TypeAdapter(List[schema])
+
+    def validate(self, rows: Iterable[Any]) -> List[M]:
+        """ Lignes ORM (ou dicts) -> instances du schéma, en un appel. """
+        with timed("serialize"):
+            return self.adapter.validate_python(list(rows),
+                                                from_attributes=True)
+
+    def dump_json(self, items: List[M]) -> bytes:
+        with timed("serialize"):
+            return self.adapter.dump_json(items)
+
+    def serialize(self, rows: Iterable[Any]) -> bytes:
+        return self.dump_json(self.validate(rows))
+
+
+@lru_cache(maxsize=None)
+def list_serializer(schema: Type[M]) -> ListSerializer[M]:
+    """ Sérialiseur (TypeAdapter compilé une fois) du schéma. """
+    return ListSerializer(schema)
+
+
+def json_list_response(schema: Type[BaseModel],
+                       rows: Iterable[Any]) -> Response:
+    """ Réponse JSON de la liste `rows` sérialisée selon `schema`. """
+    return current_app.response_class(
+        list_serializer(schema).serialize(rows), mimetype="application/json")
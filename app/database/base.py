@@ -1,8 +1,10 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from sqlalchemy.pool import QueuePool
 
 from config import CONFIG_MAP
+from typing import Any, Dict, Optional
 import os
 
 # Choix de la config active selon FLASK_ENV
@@ -10,18 +12,73 @@ ENV = os.getenv("FLASK_ENV", "dev").lower()
 app_config = CONFIG_MAP.get(ENV, CONFIG_MAP["dev"])
 DB_URL = app_config.DATABASE_URL
 
+# Pragmas autorisés, dans leur ordre d'application (busy_timeout d'abord :
+# le passage en WAL peut attendre un verrou)
+SQLITE_PRAGMA_NAMES = ("busy_timeout", "journal_mode", "synchronous",
+                       "cache_size", "mmap_size", "temp_store")
+
+
+def build_engine(url: str, pragmas: Optional[Dict[str, Any]] = None,
+                 pool: Optional[Dict[str, Any]] = None) -> Engine:
+    """
+    Crée l'engine SQLAlchemy avec le profil de la config :
+        - `pragmas` SQLite appliqués à chaque connexion ouverte par le pool
+        - `pool` (pool_size, max_overflow, pool_timeout...) pour une base
+          fichier uniquement (base en mémoire : une connexion par thread)
+    """
+    pragmas = pragmas or {}
+    unknown = set(pragmas) - set(SQLITE_PRAGMA_NAMES)
+    if unknown:
+        raise ValueError(f"Pragmas SQLite non gérés : {sorted(unknown)}")
+
+    in_memory = url.startswith("sqlite") and (
+        url.endswith(":memory:") or url.rstrip("/") == "sqlite:")
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        echo=False,
+        **({} if in_memory else (pool or {}))
+    )
+
+    if engine.dialect.name == "sqlite" and pragmas:
+        ordered = [(name, pragmas[name]) for name in SQLITE_PRAGMA_NAMES
+                   if name in pragmas]
+
+        @event.listens_for(engine, "connect")
+        def apply_pragmas(dbapi_connection, connection_record) -> None:
+            cursor = dbapi_connection.cursor()
+            for name, value in ordered:
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+    return engine
+
+
+def engine_settings(engine: Engine) -> Dict[str, Any]:
+    """ Valeurs effectives (lues sur une connexion du pool) et pool. """
+    settings: Dict[str, Any] = {}
+    if engine.dialect.name == "sqlite":
+        with engine.connect() as conn:
+            for name in SQLITE_PRAGMA_NAMES:
+                settings[name] = conn.exec_driver_sql(
+                    f"PRAGMA {name}").scalar()
+    pool = engine.pool
+    settings["pool"] = type(pool).__name__
+    if isinstance(pool, QueuePool):
+        settings.update(pool_size=pool.size(),
+                        max_overflow=pool._max_overflow,
+                        pool_timeout=pool._timeout)
+    return settings
+
 
 '''
 Point d'entrée pour la création de session SQLAlchemy:
-    - Engine pour database locale SQLite
+    - Engine pour database locale SQLite (profil SQLITE_PRAGMAS / DB_POOL)
     - Creation de session individuelle
     - Initialisation de la base
 '''
-engine: Engine = create_engine(
-    DB_URL,
-    connect_args={"check_same_thread": False},
-    echo=False
-    )
+engine: Engine = build_engine(DB_URL, app_config.SQLITE_PRAGMAS,
+                              app_config.DB_POOL)
 
 SessionLocal: sessionmaker[Session] = sessionmaker(
     bind=engine, autoflush=True, autocommit=False
@@ -0,0 +1,59 @@
+from sqlalchemy import (MetaData, Table, Column, Integer, select, text,
+                        update)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from typing import Optional
+
+
+'''
+Version du catalogue partagée entre processus (workers gunicorn) :
+    - ligne unique incrémentée dans la transaction de chaque écriture
+      produit/stock
+    - relue périodiquement par chaque process pour vider son cache
+      catalogue en mémoire quand un autre process a écrit
+'''
+catalog_version = Table(
+    "catalog_version", MetaData(),
+    Column("id", Integer, primary_key=True, autoincrement=False),
+    Column("version", Integer, nullable=False),
+)
+
+
+def ensure_catalog_version(conn: Connection) -> None:
+    """ Crée la table et sa ligne unique (idempotent). """
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS catalog_version ("
+        "id INTEGER NOT NULL, version INTEGER NOT NULL, PRIMARY KEY (id))"
+    ))
+    conn.execute(text(
+        "INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 0)"
+    ))
+
+
+def drop_catalog_version(engine: Engine) -> None:
+    """ Supprime la table de version du catalogue. """
+    catalog_version.drop(bind=engine, checkfirst=True)
+
+
+def bump_catalog_version(session: Session) -> None:
+    """
+    Incrémente la version dans la transaction courante de `session`
+    (sans effet tant que la migration n'est pas appliquée : l'échec d'une
+    requête n'annule pas la transaction SQLite).
+    """
+    try:
+        session.execute(
+            update(catalog_version).where(catalog_version.c.id == 1)
+            .values(version=catalog_version.c.version + 1)
+        )
+    except OperationalError:
+        pass
+
+
+def read_catalog_version(session: Session) -> Optional[int]:
+    """ Version courante (None si la migration n'est pas appliquée). """
+    try:
+        return session.execute(select(catalog_version.c.version)).scalar()
+    except OperationalError:
+        return None
@@ -1,25 +1,224 @@
 from app.database.base import Base, engine
+from app.database.catalog_version import (ensure_catalog_version,
+                                          drop_catalog_version)
+from app.database.fts import ensure_product_fts, drop_product_fts
+from datetime import datetime, timezone
+from sqlalchemy import (MetaData, Table, Column, Integer, String, DateTime,
+                        select, func, text)
+from sqlalchemy.engine import Connection, Engine
+from typing import Callable, List, NamedTuple, Optional
 import os
 
 
+'''
+Migrations versionnées du schéma (appliquées aussi en PROD) :
+    - chaque migration porte un numéro croissant et une fonction `upgrade`
+      exécutée dans sa propre transaction
+    - la version appliquée est enregistrée dans la table `schema_version`
+    - les migrations doivent rester idempotentes (IF NOT EXISTS) : SQLite
+      valide certains DDL hors transaction et une base existante peut déjà
+      contenir tout ou partie du schéma (créé par `create_all`)
+    - ajouter une migration = ajouter une entrée en fin de MIGRATIONS,
+      sans jamais modifier une migration déjà livrée
+'''
+schema_metadata = MetaData()
+schema_version = Table(
+    "schema_version", schema_metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("description", String(255), nullable=False),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+# Schéma initial figé (modèles à la version 1) : une migration ne dépend
+# jamais des modèles courants, base neuve et base migrée restent identiques
+INITIAL_SCHEMA_DDL: List[str] = [
+    """
+    CREATE TABLE IF NOT EXISTS product (
+        id INTEGER NOT NULL,
+        nom VARCHAR(120) NOT NULL,
+        description VARCHAR(255),
+        categorie VARCHAR(50),
+        prix FLOAT NOT NULL,
+        quantite_stock INTEGER NOT NULL,
+        PRIMARY KEY (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS user (
+        id INTEGER NOT NULL,
+        email VARCHAR(120) NOT NULL,
+        password_hash VARCHAR(255) NOT NULL,
+        nom VARCHAR(80) NOT NULL,
+        role VARCHAR(20) NOT NULL,
+        date_creation DATETIME NOT NULL,
+        PRIMARY KEY (id)
+    )
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_user_email ON user (email)",
+    """
+    CREATE TABLE IF NOT EXISTS "order" (
+        id INTEGER NOT NULL,
+        utilisateur_id INTEGER NOT NULL,
+        adresse_livraison VARCHAR(255) NOT NULL,
+        statut VARCHAR(10) NOT NULL,
+        date_commande DATETIME NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(utilisateur_id) REFERENCES user (id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS order_item (
+        id INTEGER NOT NULL,
+        commande_id INTEGER NOT NULL,
+        produit_id INTEGER NOT NULL,
+        quantite INTEGER NOT NULL,
+        prix_unitaire FLOAT NOT NULL,
+        PRIMARY KEY (id),
+        FOREIGN KEY(commande_id) REFERENCES "order" (id),
+        FOREIGN KEY(produit_id) REFERENCES product (id)
+    )
+    """,
+]
+
+
+def _initial_schema(conn: Connection) -> None:
+    """ Tables initiales (sans effet sur les tables existantes). """
+    for ddl in INITIAL_SCHEMA_DDL:
+        conn.execute(text(ddl))
+
+
+def _hot_path_indexes(conn: Connection) -> None:
+    """ Index des clés étrangères et filtres de recherche. """
+    for ddl in [
+        'CREATE INDEX IF NOT EXISTS ix_order_utilisateur_id '
+        'ON "order" (utilisateur_id)',
+        'CREATE INDEX IF NOT EXISTS ix_order_date_commande '
+        'ON "order" (date_commande)',
+        'CREATE INDEX IF NOT EXISTS ix_order_item_commande_id '
+        'ON order_item (commande_id)',
+        'CREATE INDEX IF NOT EXISTS ix_order_item_produit_id '
+        'ON order_item (produit_id)',
+        'CREATE INDEX IF NOT EXISTS ix_product_categorie '
+        'ON product (categorie)',
+    ]:
+        conn.execute(text(ddl))
+
+
+def _product_fulltext(conn: Connection) -> None:
+    """
+    Index plein texte FTS5 des produits (ignoré si FTS5 absent, recréé par
+    `has_product_fts` s'il manque ensuite).
+    """
+    ensure_product_fts(conn)
+
+
+def _product_name_index(conn: Connection) -> None:
+    """ Index du nom produit (clé naturelle de l'import catalogue). """
+    conn.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_product_nom ON product (nom)"
+    ))
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Schéma initial", _initial_schema),
+    Migration(2, "Index commandes, lignes et catégories", _hot_path_indexes),
+    Migration(3, "Index plein texte des produits", _product_fulltext),
+    Migration(4, "Index du nom produit", _product_name_index),
+    Migration(5, "Version du catalogue partagée entre processus",
+              ensure_catalog_version),
+]
+
+
 class DatabaseManager:
-    """ Gestion création/suppression des tables SQLAlchemy. """
+    """ Gestion création/suppression/migration des tables SQLAlchemy. """
 
-    def __init__(self, base=Base, engine=engine):
+    def __init__(self, base=Base, engine: Engine = engine,
+                 migrations: List[Migration] = MIGRATIONS):
         self.base = base
         self.engine = engine
+        self.migrations = sorted(migrations, key=lambda m: m.version)
         self.env = os.getenv("FLASK_ENV", "dev")
 
     def init_db(self) -> None:
         """Crée toutes les tables selon les modèles SQLAlchemy."""
         if self.env != "prod":
-            self.base.metadata.create_all(bind=self.engine)
+            self.migrate()
         else:
             raise RuntimeError("Création de tables interdite en PROD !")
 
     def close_db(self) -> None:
         """Supprime toutes les tables définies dans les modèles SQLAlchemy."""
         if self.env != "prod" and self.env != "dev":
+            drop_product_fts(self.engine)
+            drop_catalog_version(self.engine)
             self.base.metadata.drop_all(bind=self.engine)
+            schema_metadata.drop_all(bind=self.engine)
         else:
-            raise RuntimeError("Suppression de tables interdite en PROD !")
\ No newline at end of file
+            raise RuntimeError("Suppression de tables interdite en PROD !")
+
+    def current_version(self) -> int:
+        """ Version du schéma enregistrée (0 si aucune migration). """
+        with self.engine.connect() as conn:
+            return self._version(conn)
+
+    def pending(self) -> List[Migration]:
+        """ Migrations restant à appliquer. """
+        current = self.current_version()
+        return [m for m in self.migrations if m.version > current]
+
+    def migrate(self, target: Optional[int] = None) -> List[int]:
+        """
+        Applique les migrations en attente (jusqu'à `target` incluse),
+        chacune dans sa transaction avec enregistrement de sa version.
+        Retourne les versions appliquées.
+        """
+        # Schéma à jour (cas courant au démarrage) : ni DDL ni transactions
+        if not [m for m in self.pending()
+                if target is None or m.version <= target]:
+            return []
+        with self.engine.begin() as conn:
+            self._lock(conn)
+            schema_metadata.create_all(bind=conn)
+
+        applied = []
+        for migration in self.migrations:
+            if target is not None and migration.version > target:
+                break
+            with self.engine.begin() as conn:
+                # Relecture sous verrou (migrations concurrentes)
+                self._lock(conn)
+                if migration.version <= self._version(conn):
+                    continue
+                migration.upgrade(conn)
+                conn.execute(schema_version.insert().values(
+                    version=migration.version,
+                    description=migration.description,
+                    applied_at=datetime.now(timezone.utc)
+                ))
+            applied.append(migration.version)
+        return applied
+
+    @staticmethod
+    def _lock(conn: Connection) -> None:
+        """
+        Verrou d'écriture dès l'ouverture de la transaction : une
+        transaction SQLite ordinaire ne verrouille qu'à la première
+        écriture, deux processus liraient alors la même version.
+        """
+        if conn.dialect.name == "sqlite":
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    @staticmethod
+    def _version(conn: Connection) -> int:
+        if not conn.dialect.has_table(conn, schema_version.name):
+            return 0
+        return conn.execute(
+            select(func.coalesce(func.max(schema_version.c.version), 0))
+        ).scalar_one()
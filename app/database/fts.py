@@ -0,0 +1,157 @@
+import re
+from markupsafe import escape
+from sqlalchemy import text, table, column, literal_column, func
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+from typing import List, Optional
+
+
+'''
+Index plein texte SQLite FTS5 des produits (nom, description, catégorie) :
+    - table virtuelle `product_fts` à contenu externe (table `product`)
+    - synchronisation par triggers (création, modification, suppression),
+      y compris pour les écritures en masse hors ORM
+    - classement BM25 (poids nom > catégorie > description) et extraits
+      surlignés (<mark>), texte produit échappé (HTML)
+'''
+PRODUCT_FTS_DDL: List[str] = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS product_fts USING fts5(
+        nom, description, categorie,
+        content='product', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS product_fts_ai AFTER INSERT ON product BEGIN
+        INSERT INTO product_fts(rowid, nom, description, categorie)
+        VALUES (new.id, new.nom, new.description, new.categorie);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS product_fts_ad AFTER DELETE ON product BEGIN
+        INSERT INTO product_fts(product_fts, rowid, nom, description,
+                                categorie)
+        VALUES ('delete', old.id, old.nom, old.description, old.categorie);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS product_fts_au
+    AFTER UPDATE OF nom, description, categorie ON product BEGIN
+        INSERT INTO product_fts(product_fts, rowid, nom, description,
+                                categorie)
+        VALUES ('delete', old.id, old.nom, old.description, old.categorie);
+        INSERT INTO product_fts(rowid, nom, description, categorie)
+        VALUES (new.id, new.nom, new.description, new.categorie);
+    END
+    """,
+]
+
+PRODUCT_FTS_DROP: List[str] = [
+    "DROP TRIGGER IF EXISTS product_fts_ai",
+    "DROP TRIGGER IF EXISTS product_fts_ad",
+    "DROP TRIGGER IF EXISTS product_fts_au",
+    "DROP TABLE IF EXISTS product_fts",
+]
+
+# Poids BM25 par colonne (nom, description, categorie)
+FTS_WEIGHTS = (10.0, 1.0, 5.0)
+FTS_SNIPPET_TOKENS = 12
+
+product_fts = table("product_fts", column("rowid"))
+_fts_match = literal_column("product_fts")
+fts_rank = func.bm25(_fts_match, *FTS_WEIGHTS)
+# Marqueurs de contrôle (absents du texte) remplacés après échappement
+_MARK_OPEN, _MARK_CLOSE = "\x02", "\x03"
+fts_snippet = func.snippet(_fts_match, -1, _MARK_OPEN, _MARK_CLOSE, "…",
+                           FTS_SNIPPET_TOKENS)
+
+_fts_ready: dict = {}
+
+
+def ensure_product_fts(conn: Connection) -> bool:
+    """
+    Crée l'index FTS5 et ses triggers s'ils n'existent pas (idempotent),
+    puis l'alimente depuis `product` lors de sa création.
+    Retourne False si SQLite n'est pas compilé avec FTS5 (ou autre SGBD).
+    """
+    url = conn.engine.url
+    if conn.dialect.name != "sqlite":
+        _fts_ready[url] = False
+        return False
+
+    exists = conn.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE name = 'product_fts'"
+    )).first()
+    try:
+        for ddl in PRODUCT_FTS_DDL:
+            conn.execute(text(ddl))
+    except OperationalError:
+        _fts_ready[url] = False
+        return False
+
+    if not exists:
+        conn.execute(text(
+            "INSERT INTO product_fts(product_fts) VALUES ('rebuild')"
+        ))
+    _fts_ready[url] = True
+    return True
+
+
+def drop_product_fts(engine: Engine) -> None:
+    """ Supprime l'index FTS5 et ses triggers. """
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as conn:
+        for ddl in PRODUCT_FTS_DROP:
+            conn.execute(text(ddl))
+    _fts_ready.pop(engine.url, None)
+
+
+def has_product_fts(session: Session) -> bool:
+    """
+    Indique (avec mise en cache par base) si l'index FTS5 est disponible.
+    Index absent (migration appliquée sans FTS5, index supprimé) : recréé
+    et alimenté une fois, sur une connexion dédiée.
+    """
+    engine = session.get_bind()
+    if engine.url not in _fts_ready:
+        if engine.dialect.name != "sqlite":
+            _fts_ready[engine.url] = False
+        elif session.execute(text(
+                "SELECT 1 FROM sqlite_master WHERE name = 'product_fts'"
+        )).first():
+            _fts_ready[engine.url] = True
+        else:
+            with engine.begin() as conn:
+                ensure_product_fts(conn)
+    return _fts_ready[engine.url]
+
+
+def highlight(snippet: Optional[str]) -> Optional[str]:
+    """
+    Extrait FTS5 -> HTML : texte produit échappé, termes trouvés entourés
+    de <mark> (aucune balise issue des données n'est interprétée).
+    """
+    if snippet is None:
+        return None
+    parts = re.split(f"({_MARK_OPEN}|{_MARK_CLOSE})", snippet)
+    return "".join(
+        "<mark>" if part == _MARK_OPEN else "</mark>" if part == _MARK_CLOSE
+        else str(escape(part)) for part in parts)
+
+
+def fts_words(q: str) -> List[str]:
+    """ Découpe une saisie libre en mots (ponctuation et syntaxe ignorées). """
+    return re.findall(r"\w+", q)
+
+
+def fts_match(words: List[str]) -> ColumnElement:
+    """
+    Construit le filtre `product_fts MATCH` d'une liste de mots :
+    chaque mot est cité (aucune syntaxe FTS interprétée) et recherché
+    en préfixe, tous les mots étant requis.
+    """
+    return _fts_match.match(" ".join(f'"{word}"*' for word in words))
@@ -0,0 +1,28 @@
+from app.database.db_manager import DatabaseManager
+from typing import List, Optional
+import argparse
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Migrations en ligne de commande (base de l'environnement FLASK_ENV) :
+        python -m app.database.migrate upgrade [--target N]
+        python -m app.database.migrate status
+    """
+    parser = argparse.ArgumentParser(prog="python -m app.database.migrate")
+    parser.add_argument("command", choices=["upgrade", "status"])
+    parser.add_argument("--target", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    db_manager = DatabaseManager()
+    if args.command == "upgrade":
+        applied = db_manager.migrate(args.target)
+        print(f"Migrations appliquées : {applied or 'aucune'}")
+
+    print(f"Version du schéma : {db_manager.current_version()}")
+    for migration in db_manager.pending():
+        print(f"  en attente : {migration.version} - {migration.description}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,12 @@
-from flask import g, Flask
-from app.database.base import SessionLocal
+import json
+import time
+from flask import g, request, Flask, Response
+from app.database.base import SessionLocal, engine
+from app.core.instrumentation import (
+    RequestMetrics, TimedJSONProvider, current_metrics
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 from typing import Optional
 
@@ -23,6 +30,8 @@ def init_session(app: Flask) -> None:
     Initialise les hooks Flask pour la session
     avec rollback automatique si exception :
         - création de la session avant chaque requête
+        - commit si la réponse est un succès, rollback sinon (erreurs
+          métier gérées comprises : ex. commande refusée)
         - fermeture de la session après chaque requête
         - factorisation des erreurs/exceptions ORM
     """
@@ -32,6 +41,21 @@ def init_session(app: Flask) -> None:
         """ Création de la session. """
         get_session()
 
+    @app.after_request
+    def end_transaction(response: Response) -> Response:
+        """ Valide ou annule la transaction de la requête. """
+        session = g.get("session", None)
+        if session:
+            if response.status_code < 400:
+                try:
+                    session.commit()
+                except Exception:
+                    session.rollback()
+                    raise
+            else:
+                session.rollback()
+        return response
+
     @app.teardown_appcontext
     def teardown_session(exception: Optional[BaseException] = None) -> None:
         ''' Fermeture de la session '''
@@ -39,3 +63,64 @@ def init_session(app: Flask) -> None:
         if exception and session:
             session.rollback()
         close_session()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context,
+                           executemany) -> None:
+    if current_metrics() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context,
+                          executemany) -> None:
+    metrics = current_metrics()
+    starts = conn.info.get("query_start")
+    if metrics is not None and starts:
+        metrics.add_statement(statement, time.perf_counter() - starts.pop())
+
+
+def init_instrumentation(app: Flask, engine: Engine = engine) -> None:
+    """
+    Instrumentation par requête (SQL_INSTRUMENTATION) :
+        - requêtes SQL comptées et chronométrées (événements de l'engine)
+        - encodage JSON chronométré (provider JSON de l'application)
+        - en-tête `Server-Timing` sur chaque réponse, log structuré
+          si SQL_INSTRUMENTATION_LOG
+        - avertissement si une même forme de requête est exécutée plus de
+          SQL_N_PLUS_ONE_THRESHOLD fois (N+1 probable)
+    """
+    if not event.contains(engine, "before_cursor_execute",
+                          _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    app.json = TimedJSONProvider(app)
+
+    @app.before_request
+    def start_metrics() -> None:
+        g.request_metrics = RequestMetrics()
+
+    @app.after_request
+    def report_metrics(response: Response) -> Response:
+        metrics = g.pop("request_metrics", None)
+        if metrics is None:
+            return response
+
+        response.headers["Server-Timing"] = metrics.server_timing()
+
+        threshold = app.config["SQL_N_PLUS_ONE_THRESHOLD"]
+        repeated = metrics.repeated(threshold)
+        for shape, count in repeated:
+            app.logger.warning("N+1 probable sur %s %s : %d x %s",
+                               request.method, request.path, count, shape)
+
+        if app.config["SQL_INSTRUMENTATION_LOG"]:
+            app.logger.info("request_metrics %s", json.dumps({
+                "method": request.method, "path": request.path,
+                "status": response.status_code, **metrics.to_dict(),
+                "repeated": [count for _, count in repeated],
+            }))
+        return response
+
+    @app.teardown_request
+    def drop_metrics(exception: Optional[BaseException] = None) -> None:
+        g.pop("request_metrics", None)
@@ -1,7 +1,11 @@
 from flask import Flask, jsonify
 from sqlalchemy.exc import SQLAlchemyError
 from app.core.exceptions.errors_maps import ORM_ERROR_MAP
-from app.core.exceptions.app_errors import ApplicationError
+from app.core.exceptions.app_errors import (
+    ApplicationError, ServiceUnavailableError, UnauthorizedError,
+    ForbiddenError
+)
+from app.core.metrics import auth_failures
 from pydantic import ValidationError
 from app.schemas.errors.json_schemas import (
     ValidationErrorItem, ValidationErrorSchema
@@ -12,6 +16,11 @@ def register_error_handlers(app: Flask) -> None:
 
     @app.errorhandler(ApplicationError)
     def handle_app_exceptions(error: ApplicationError):
+        if isinstance(error, (UnauthorizedError, ForbiddenError)):
+            auth_failures.inc(str(error.status_code), error.reason)
+        if isinstance(error, ServiceUnavailableError):
+            return (jsonify({"error": str(error)}), error.status_code,
+                    {"Retry-After": str(error.retry_after)})
         if isinstance(error, ApplicationError):
             return jsonify({"error": str(error)}), error.status_code
 
@@ -9,9 +9,9 @@ class OrderItem(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True)
     commande_id: Mapped[int] = mapped_column(Integer, ForeignKey("order.id"),
-                                             nullable=False)
+                                             nullable=False, index=True)
     produit_id: Mapped[int] = mapped_column(Integer, ForeignKey("product.id"),
-                                            nullable=False)
+                                            nullable=False, index=True)
     quantite: Mapped[int] = mapped_column(Integer, nullable=False)
     prix_unitaire: Mapped[float] = mapped_column(Float, nullable=False)
 
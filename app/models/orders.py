@@ -13,7 +13,7 @@ class Order(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True)
     utilisateur_id: Mapped[int] = mapped_column(Integer, ForeignKey("user.id"),
-                                                nullable=False)
+                                                nullable=False, index=True)
     adresse_livraison: Mapped[str] = mapped_column(String(255), nullable=False)   
     statut: Mapped[str] = mapped_column(Enum(*STATUS, name="order_status"),
                                         default="En attente", nullable=False)
@@ -21,7 +21,7 @@ class Order(Base):
         DateTime(timezone=True),
         # default=lambda: datetime.now(timezone.utc).date(),
         default=datetime.now(timezone.utc),
-        nullable=False
+        nullable=False, index=True
     )
 
     user: Mapped["User"] = relationship("User", back_populates="orders")
@@ -9,11 +9,11 @@ class Product(Base):
     __tablename__ = 'product'
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    nom: Mapped[str] = mapped_column(String(120), nullable=False)
+    nom: Mapped[str] = mapped_column(String(120), nullable=False, index=True)
     description: Mapped[Optional[str]] = mapped_column(String(255),
                                                        nullable=True)
     categorie: Mapped[Optional[str]] = mapped_column(String(50),
-                                                     nullable=True)
+                                                     nullable=True, index=True)
     prix: Mapped[float] = mapped_column(Float, nullable=False)
     quantite_stock: Mapped[int] = mapped_column(Integer, default=0,
                                                 nullable=False)
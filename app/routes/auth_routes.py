@@ -7,7 +7,7 @@ from app.schemas.user_schemas import (
 )
 from app.schemas.errors.user_errors import (
     RegisterError, LoginError,
-    UserError400, UserError401, UserError403, UserError404
+    UserError400, UserError401, UserError403, UserError404, UserError503
 )
 from spectree import Response as SpecResp
 from app.spec import spec
@@ -21,7 +21,8 @@ auth_bp = Blueprint("auth", __name__)
     json=RegisterSchema,
     resp=SpecResp(HTTP_201=RegisterRespSchema, HTTP_422=RegisterError,
                   HTTP_400=UserError400, HTTP_401=UserError401,
-                  HTTP_403=UserError403,HTTP_404=UserError404),
+                  HTTP_403=UserError403, HTTP_404=UserError404,
+                  HTTP_503=UserError503),
     tags=["Users"]
 )
 def register() -> Tuple[Response, int]:
@@ -47,7 +48,8 @@ def register() -> Tuple[Response, int]:
     json=LoginSchema,
     resp=SpecResp(HTTP_200=TokenRespSchema, HTTP_422=LoginError,
                   HTTP_400=UserError400, HTTP_401=UserError401,
-                  HTTP_403=UserError403,HTTP_404=UserError404),
+                  HTTP_403=UserError403, HTTP_404=UserError404,
+                  HTTP_503=UserError503),
     tags=["Users"]
 )
 def login() -> Tuple[Response, int]:
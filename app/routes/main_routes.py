@@ -1,5 +1,7 @@
-from flask import Blueprint, jsonify, g, Response
+from flask import Blueprint, jsonify, g, Response, current_app
 from app.core.auth_decorators import auth_required
+from app.core.exceptions.app_errors import NotFoundError
+from app.core.metrics import registry
 from app.models import User
 from typing import Tuple
 
@@ -13,6 +15,16 @@ def home() -> str:
     return "API e-commerce opérationnelle !"
 
 
+@main_bp.route("/metrics")
+def metrics() -> Response:
+    ''' Métriques au format texte Prometheus (tous les workers). '''
+    if not current_app.config["METRICS_ENABLED"]:
+        raise NotFoundError("Métriques désactivées")
+    return Response(registry.render(),
+                    mimetype="text/plain; version=0.0.4",
+                    headers={"Cache-Control": "no-store"})
+
+
 # Routes pour test et checks manuels
 @main_bp.route("/admin-space/users", methods=["GET"])
 @auth_required
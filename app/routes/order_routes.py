@@ -1,15 +1,24 @@
 from flask import request, Blueprint, jsonify, g, Response
 from app.core.auth_decorators import access_granted
 from app.services.order_services import (
-    get_all_orders, get_order_by_id, create_new_order,
-    change_status_order, get_orderitems_all
+    get_orders_page, get_order_by_id, create_new_order,
+    change_status_order, get_orderitems_all, create_orders_batch
+    )
+from app.models import Order
+from app.core.pagination import page_headers
+from app.core.serialization import json_list_response
+from app.core.export import export_response
+from app.services.export_services import (
+    order_export_query, orderitem_export_query
     )
 from app.core.exceptions.app_errors import ForbiddenError
 from typing import Tuple, List
 
 from app.schemas.order_schemas import (
     OrderCreateSchema, OrderUpdateSchema, OrderRespSchema, OrderItemRespSchema,
-    OrderListSchema, OrderCreateRespSchema, OrderUpdateRespSchema
+    OrderListSchema, OrderCreateRespSchema, OrderUpdateRespSchema,
+    OrderPageQuerySchema, OrderBatchCreateSchema, OrderBatchRespSchema,
+    OrderExportQuerySchema
 )
 from pydantic import ValidationError
 from app.schemas.errors.order_errors import(
@@ -22,22 +31,83 @@ from app.spec import spec
 order_bp = Blueprint("order_bp", __name__)
 
 
+def created_order_response(order: Order) -> dict:
+    """ Sérialise une commande créée avec ses lignes. """
+    response_items = [
+        OrderItemRespSchema.model_validate(item).model_dump()
+        for item in order.items
+        ]
+    return {**order.to_dict(), "lignes": response_items}
+
+
 # GET /api/commandes
 @order_bp.route("", methods=["GET"])
 @access_granted('admin', 'client')
 @spec.validate(
+    query=OrderPageQuerySchema,
     resp=SpecResp(HTTP_200=OrderListSchema, HTTP_422=OrderListError,
                   HTTP_400=OrderError400, HTTP_401=OrderError401,
                   HTTP_403=OrderError403,HTTP_404=OrderError404),
     tags=["Commandes"]
 )
-def list_orders() -> Tuple[Response, int]:
+def list_orders() -> Tuple[Response, int, dict]:
     """
-    Récupère toutes les commandes (admin) ou celles du client.
+    Liste paginée des commandes (admin) ou de celles du client, filtrable par
+    `statut`, `date_from`/`date_to` et `utilisateur_id` (admin only).
     """
-    orders = get_all_orders(g.session, user=g.current_user)
-    response = [OrderRespSchema.model_validate(o).model_dump() for o in orders]
-    return jsonify(response), 200
+    query = request.context.query
+    orders, next_cursor = get_orders_page(
+        g.session,
+        limit=query.limit,
+        after=query.after,
+        user=g.current_user,
+        statut=query.statut,
+        date_from=query.date_from,
+        date_to=query.date_to,
+        utilisateur_id=query.utilisateur_id
+        )
+    response = json_list_response(OrderRespSchema, orders)
+    return response, 200, page_headers(next_cursor)
+
+
+# GET /api/commandes/export
+@order_bp.route("/export", methods=["GET"])
+@access_granted('admin')
+@spec.validate(
+    query=OrderExportQuerySchema,
+    resp=SpecResp("HTTP_200", HTTP_422=OrderListError,
+                  HTTP_401=OrderError401, HTTP_403=OrderError403),
+    tags=["Commandes"]
+)
+def export_orders() -> Response:
+    """
+    Export en flux (NDJSON ou CSV) des commandes filtrées par `statut` et
+    `date_from`/`date_to`, avec nombre de lignes et montant (admin only).
+    """
+    query = request.context.query
+    return export_response(
+        order_export_query(query.statut, query.date_from, query.date_to),
+        query.format, query.batch_size, "commandes")
+
+
+# GET /api/commandes/lignes/export
+@order_bp.route("/lignes/export", methods=["GET"])
+@access_granted('admin')
+@spec.validate(
+    query=OrderExportQuerySchema,
+    resp=SpecResp("HTTP_200", HTTP_422=OrderListError,
+                  HTTP_401=OrderError401, HTTP_403=OrderError403),
+    tags=["Commandes"]
+)
+def export_orderitems() -> Response:
+    """
+    Export en flux (NDJSON ou CSV) des lignes de commandes, filtrées par
+    statut et période de leur commande (admin only).
+    """
+    query = request.context.query
+    return export_response(
+        orderitem_export_query(query.statut, query.date_from, query.date_to),
+        query.format, query.batch_size, "lignes_commandes")
 
 
 # GET /api/commandes/<id>
@@ -59,7 +129,7 @@ def get_order_id(id: int) -> Tuple[Response, int]:
         raise ForbiddenError("Accès refusé")
 
     response = OrderRespSchema.model_validate(order)
-    return jsonify(response), 200
+    return jsonify(response.model_dump()), 200
 
 
 # POST /api/commandes
@@ -86,16 +156,50 @@ def create_order() -> Tuple[Response, int]:
         address=body["adresse_livraison"]
     )
 
-    response_items = [
-        OrderItemRespSchema.model_validate(item).model_dump()
-        for item in order.items
-        ]
-
-    commande_response = {**order.to_dict(), "lignes": response_items}
+    commande_response = created_order_response(order)
 
     return jsonify({"message": f"Commande id:{order.id} créée", "commande": commande_response}), 201
 
 
+# POST /api/commandes/batch
+@order_bp.route("/batch", methods=["POST"])
+@access_granted('client')
+@spec.validate(
+    json=OrderBatchCreateSchema,
+    resp=SpecResp(HTTP_201=OrderBatchRespSchema, HTTP_207=OrderBatchRespSchema,
+                  HTTP_422=OrderCreateError, HTTP_400=OrderError400,
+                  HTTP_401=OrderError401, HTTP_403=OrderError403),
+    security={"auth_apiKey": []},
+    tags=["Commandes"]
+)
+def create_orders() -> Tuple[Response, int]:
+    """
+    Création d'un lot de commandes en une transaction (client only) :
+    résultat par commande, 201 si toutes créées, 207 sinon
+    """
+    body = request.context.json.model_dump(exclude_none=True)
+    results = create_orders_batch(g.session, g.current_user.id,
+                                  body["commandes"])
+
+    resultats = []
+    for index, (order, error) in enumerate(results):
+        if order is not None:
+            resultats.append({"index": index,
+                              "commande": created_order_response(order)})
+        else:
+            resultats.append({"index": index, "erreur": str(error),
+                              "code": error.status_code})
+
+    refusees = sum(1 for order, _ in results if order is None)
+    creees = len(results) - refusees
+    return jsonify({
+        "message": f"{creees} commande(s) créée(s), {refusees} refusée(s)",
+        "creees": creees,
+        "refusees": refusees,
+        "resultats": resultats
+        }), 201 if not refusees else 207
+
+
 # PATCH /api/commandes/<id>
 @order_bp.route("/<int:id>", methods=["PATCH"])
 @access_granted('admin')
@@ -132,7 +236,7 @@ def list_orderitems(id: int) -> Tuple[Response, int]:
     """
     Liste les lignes d'une commande (accès public !).
     """
-    order = get_order_by_id(g.session, id)
+    order = get_order_by_id(g.session, id, profile="order")
     items = get_orderitems_all(g.session, order.id)
 
     result = [item.to_dict() for item in items]
@@ -1,10 +1,22 @@
-from flask import request, jsonify, Blueprint, g, Response
+from flask import request, jsonify, Blueprint, g, Response, current_app
 from app.services.product_services import (
-    get_all_products, get_product_id, add_product,
-    update_product, delete_product_id, search_product
+    get_product_id, add_product, update_product, delete_product_id,
+    get_products_page, search_products_fulltext
 )
+from app.services.product_import import (
+    import_products, iter_rows, detect_format
+)
+from app.services.export_services import product_export_query
+from app.core.export import export_response
+from app.schemas.export_schemas import ExportQuerySchema
+from app.core.exceptions.app_errors import BadRequestError
 from app.core.auth_decorators import access_granted
-from typing import Tuple
+from app.core.pagination import page_headers
+from app.core.cache import catalog_cache, catalog_key, CachedBody
+from app.core.compression import compress, offer_cached
+from app.core.serialization import list_serializer
+from pydantic import BaseModel
+from typing import Tuple, Optional
 
 from spectree import Response as SpecResp
 from app.spec import spec
@@ -13,7 +25,9 @@ from app.schemas.errors.json_schemas import ValidationErrorSchema
 from app.schemas.product_schemas import (
     ProductCreateSchema, ProductUpdateSchema, ProductRespSchema,
     ProductCreateRespSchema, ProductUpdateRespSchema,
-    ProductDeleteRespSchema, ProductListSchema)
+    ProductDeleteRespSchema, ProductListSchema,
+    ProductPageQuerySchema, ProductSearchQuerySchema, ProductSearchListSchema,
+    ProductSearchRespSchema, ProductImportQuerySchema, ProductImportRespSchema)
 from app.schemas.errors.product_errors import (
     ProductCreateError, ProductUpdateError, ProductDeleteError, ProductListError,
     ProductError400, ProductError401, ProductError403, ProductError404
@@ -22,69 +36,163 @@ from app.schemas.errors.product_errors import (
 product_bp = Blueprint("product_bp", __name__)
 
 
+def conditional_response(cached: CachedBody, cache_status: str,
+                         cache_control: Optional[str], surrogate_keys: str,
+                         headers: Optional[dict] = None,
+                         cache_key: Optional[tuple] = None) -> Response:
+    """
+    Construit la réponse HTTP d'un corps en cache :
+        - variante compressée négociée (Accept-Encoding), conservée avec
+          l'entrée `cache_key`
+        - ETag fort (contenu, suffixé par l'encodage) et 304 Not Modified
+          si If-None-Match correspond
+        - Cache-Control et clés de substitution CDN (Surrogate-Key/-Control)
+    """
+    config = current_app.config
+    response = current_app.response_class(cached.body,
+                                          mimetype="application/json")
+    response.headers.update(headers or {})
+    response.headers["X-Cache"] = cache_status
+
+    offer_cached(response, cached.body, cached.etag,
+                 lambda encoding: catalog_cache.encoded(
+                     cache_key, cached, encoding, lambda data: compress(
+                         data, encoding, config["COMPRESSION_LEVEL"])))
+
+    if cache_control:
+        response.headers["Cache-Control"] = cache_control
+    if config.get("SURROGATE_KEY_HEADER"):
+        response.headers[config["SURROGATE_KEY_HEADER"]] = surrogate_keys
+    if config.get("SURROGATE_CONTROL"):
+        response.headers["Surrogate-Control"] = config["SURROGATE_CONTROL"]
+
+    return response.make_conditional(request)
+
+
+def search_page(q: str, filters: dict) -> Tuple[bytes, Optional[str]]:
+    """
+    Recherche plein texte (?q=) : produits classés par pertinence BM25,
+    avec score et extrait surligné ; `nom` et `sort` sont sans effet.
+    """
+    rows, next_cursor = search_products_fulltext(
+        g.session, q, filters["limit"], after=filters.get("after"),
+        categorie=filters.get("categorie"),
+        disponible=filters.get("disponible", False)
+        )
+    serializer = list_serializer(ProductSearchRespSchema)
+    hits = serializer.validate(product for product, _, _ in rows)
+    for hit, (_, score, extrait) in zip(hits, rows):
+        # Repli ILIKE (sans FTS5) : ni score ni extrait
+        hit.pertinence = round(score, 4) if score is not None else None
+        hit.extrait = extrait
+    return serializer.dump_json(hits), next_cursor
+
+
+def catalog_page_response(query: BaseModel) -> Response:
+    """
+    Sert une page catalogue (liste/recherche) depuis le cache en mémoire,
+    en la chargeant/sérialisant depuis la base si absente ou expirée.
+    """
+    params = query.model_dump()
+
+    def load() -> CachedBody:
+        filters = dict(params)
+        q = filters.pop("q", None)
+        if q is not None:
+            body, next_cursor = search_page(q, filters)
+        else:
+            products, next_cursor = get_products_page(g.session, **filters)
+            body = list_serializer(ProductRespSchema).serialize(products)
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+        return CachedBody.build(body, headers)
+
+    key = catalog_key("products", params)
+    cached, status = catalog_cache.get_or_load(key, load)
+    return conditional_response(
+        cached, status, current_app.config.get("CATALOG_CACHE_CONTROL"),
+        "products", page_headers(cached.headers.get("X-Next-Cursor")), key
+        )
+
+
 # GET /api/produits
 @product_bp.route("", methods=["GET"])
 @spec.validate(
-    resp=SpecResp(HTTP_200=ProductListSchema, HTTP_422=ProductListError,
+    query=ProductPageQuerySchema,
+    resp=SpecResp("HTTP_304", HTTP_200=ProductListSchema,
+                  HTTP_422=ProductListError,
                   HTTP_400=ProductError400, HTTP_401=ProductError401,
                   HTTP_403=ProductError403,HTTP_404=ProductError404),
     tags=["Produits"]
 )
-def get_products() -> Tuple[Response, int]:
+def get_products() -> Response:
     """
-    Liste complète des produits du catalogue
+    Liste paginée des produits du catalogue
+    (`limit`, `after=<curseur>`, `sort`; curseur suivant dans X-Next-Cursor)
     """
-    products = get_all_products(g.session)
-
-    # result = [product.to_dict() for product in products]
-    result = [ProductRespSchema.model_validate(p).model_dump() for p in products]
-    return jsonify(result), 200
+    return catalog_page_response(request.context.query)
 
 
 # GET /api/produits/search
 @product_bp.route("/search", methods=["GET"])
 @spec.validate(
-    resp=SpecResp(HTTP_200=ProductListSchema, HTTP_422=ProductListError,
+    query=ProductSearchQuerySchema,
+    resp=SpecResp("HTTP_304", HTTP_200=ProductSearchListSchema,
+                  HTTP_422=ProductListError,
                   HTTP_400=ProductError400, HTTP_401=ProductError401,
                   HTTP_403=ProductError403,HTTP_404=ProductError404),
     tags=["Produits"]
 )
-def list_products() -> Tuple[Response, int]:
+def list_products() -> Response:
     """
-    Recherche de produits par nom, catégorie ou disponibilité
+    Recherche paginée de produits par nom, catégorie ou disponibilité,
+    ou plein texte (?q=) classée par pertinence
     """
-    nom = request.args.get("nom")
-    categorie = request.args.get("categorie")
-    disponible = request.args.get("disponible", "false").lower() == "true"
+    return catalog_page_response(request.context.query)
 
-    products = search_product(
-        g.session,
-        nom=nom,
-        categorie=categorie,
-        disponible=disponible
-        ) if (nom or categorie or disponible) else get_all_products(g.session)
 
-    # result = [product.to_dict() for product in products]
-    result = [ProductRespSchema.model_validate(p).model_dump() for p in products]
-    return jsonify(result), 200
+# GET /api/produits/export
+@product_bp.route("/export", methods=["GET"])
+@access_granted('admin')
+@spec.validate(
+    query=ExportQuerySchema,
+    resp=SpecResp("HTTP_200", HTTP_422=ProductListError,
+                  HTTP_401=ProductError401, HTTP_403=ProductError403),
+    tags=["Produits"]
+)
+def export_catalog() -> Response:
+    """
+    Export en flux (NDJSON ou CSV) du catalogue complet (admin only).
+    """
+    query = request.context.query
+    return export_response(product_export_query(), query.format,
+                           query.batch_size, "produits")
 
 
 # GET /api/produits/<id>
 @product_bp.route("/<int:id>", methods=["GET"])
 @access_granted('admin', 'client')
 @spec.validate(
-    resp=SpecResp(HTTP_200=ProductRespSchema, HTTP_422=ValidationErrorSchema,
+    resp=SpecResp("HTTP_304", HTTP_200=ProductRespSchema,
+                  HTTP_422=ValidationErrorSchema,
                   HTTP_400=ProductError400, HTTP_401=ProductError401,
                   HTTP_403=ProductError403,HTTP_404=ProductError404),
     tags=["Produits"]
 )
-def get_product(id: int) -> Tuple[Response, int]:
+def get_product(id: int) -> Response:
     """
-    Recherce de produit via son ID
+    Recherce de produit via son ID (ETag / 304 sur If-None-Match)
     """
-    product = get_product_id(g.session, id)
-    response = ProductRespSchema.model_validate(product)
-    return jsonify(response.model_dump()), 200
+    def load() -> CachedBody:
+        product = get_product_id(g.session, id)
+        response = ProductRespSchema.model_validate(product)
+        return CachedBody.build(
+            current_app.json.dumps(response.model_dump()).encode())
+
+    cached, status = catalog_cache.get_or_load(("product", id), load)
+    return conditional_response(
+        cached, status, current_app.config.get("PRODUCT_CACHE_CONTROL"),
+        f"products product-{id}", cache_key=("product", id)
+        )
 
 
 # POST /api/produits
@@ -122,6 +230,40 @@ def create_product() -> Tuple[Response, int]:
         }), 201
 
 
+# POST /api/produits/import
+@product_bp.route("/import", methods=["POST"])
+@access_granted('admin')
+@spec.validate(
+    query=ProductImportQuerySchema,
+    resp=SpecResp(HTTP_200=ProductImportRespSchema,
+                  HTTP_422=ValidationErrorSchema,
+                  HTTP_400=ProductError400, HTTP_401=ProductError401,
+                  HTTP_403=ProductError403),
+    tags=["Produits"]
+)
+def import_catalog() -> Tuple[Response, int]:
+    """
+    Import en masse du catalogue (admin only) : corps NDJSON
+    (application/x-ndjson) ou CSV avec en-tête (text/csv), lu en flux.
+    Upsert par nom de produit, erreurs rapportées par ligne.
+    """
+    fmt = request.context.query.format or detect_format(request.content_type)
+    if fmt is None:
+        raise BadRequestError("Format d'import non supporté (ndjson ou csv)")
+
+    config = current_app.config
+    try:
+        report = import_products(
+            g.session, iter_rows(request.stream, fmt),
+            chunk_size=config["PRODUCT_IMPORT_CHUNK_SIZE"],
+            max_errors=config["PRODUCT_IMPORT_MAX_ERRORS"]
+            )
+    except UnicodeDecodeError:
+        raise BadRequestError("Encodage invalide (UTF-8 attendu)")
+
+    return jsonify({"message": "Import terminé", **report.to_dict()}), 200
+
+
 # PUT /api/produits/<id>
 @product_bp.route("/<int:id>", methods=["PUT"])
 @access_granted('admin')
@@ -7,6 +7,8 @@ class ErrorRespSchema(BaseModel):
     error: str
 
     model_config = ConfigDict(
+        # Schémas de documentation : validateur construit au premier usage
+        defer_build=True,
         json_schema_extra={
             "example": {"error": "Message d'erreur générique"}
         }
@@ -14,12 +16,16 @@ class ErrorRespSchema(BaseModel):
 
 
 class ErrorClassFactory:
-    """Gestion centralisée des classes d'erreurs Swagger/Spectree."""
+    """
+    Gestion centralisée des classes d'erreurs Swagger/Spectree, créées à la
+    première demande (seules les classes référencées par les routes).
+    """
 
     def __init__(self):
+        self._examples = {}
         self._classes = {}
-        self._generate_errors(APP_ERROR_MAP, is_orm=False)
-        self._generate_errors(ORM_ERROR_MAP, is_orm=True)
+        self._register_errors(APP_ERROR_MAP, is_orm=False)
+        self._register_errors(ORM_ERROR_MAP, is_orm=True)
 
     def _create_class(self, name: str, code: int, example: dict, is_orm: bool):
         """
@@ -32,17 +38,23 @@ class ErrorClassFactory:
             {"model_config": ConfigDict(json_schema_extra={"example": example})},
         )
 
-    def _generate_errors(self, error_map: dict, is_orm: bool):
+    def _register_errors(self, error_map: dict, is_orm: bool):
         """
-        Génère et stocke les classes d'erreurs selon le type ('app', 'orm') 
+        Enregistre les exemples d'erreurs selon le type ('app', 'orm')
         """
         for key, codes in error_map.items():
             for code, example in codes.items():
-                self._classes[(key, code)] = self._create_class(key, code, example, is_orm)
+                self._examples[(key, code)] = (example, is_orm)
 
     def __call__(self, key: str, code: int):
         """Retourne la classe d'erreur Swagger/Spectree correspondante."""
-        return self._classes.get((key, code))
+        if (key, code) not in self._classes:
+            if (key, code) not in self._examples:
+                return None
+            example, is_orm = self._examples[(key, code)]
+            self._classes[(key, code)] = self._create_class(
+                key, code, example, is_orm)
+        return self._classes[(key, code)]
 
 
 ErrorClass = ErrorClassFactory()
@@ -2,6 +2,16 @@ from pydantic import BaseModel, ConfigDict
 from typing import Any, Tuple
 
 
+# Exemple de la documentation (sans génération de schéma JSON à l'import)
+VALIDATION_ERROR_ITEM_EXAMPLE = {
+    "loc": ("prix",),
+    "msg": "Input should be a valid number",
+    "type": "float_parsing",
+    # "input": "str",
+    # "url": "https://errors.pydantic.dev/2.11/v/float_parsing"
+}
+
+
 class ValidationErrorItem(BaseModel):
     loc: Tuple[Any, ...]           # Champ(s) en erreur
     msg: str                       # Message d'erreur
@@ -10,15 +20,7 @@ class ValidationErrorItem(BaseModel):
     # url: Optional[str] = None      # Lien vers la doc Pydantic
 
     model_config = ConfigDict(
-        json_schema_extra={
-            "example": {
-                "loc": ("prix",),
-                "msg": "Input should be a valid number",
-                "type": "float_parsing",
-                # "input": "str",
-                # "url": "https://errors.pydantic.dev/2.11/v/float_parsing"
-            }
-        }
+        json_schema_extra={"example": VALIDATION_ERROR_ITEM_EXAMPLE}
     )
 
 
@@ -26,7 +28,9 @@ class ValidationErrorSchema(BaseModel):
     errors: list[ValidationErrorItem]
 
     model_config = ConfigDict(
+        # Schémas de documentation : validateur construit au premier usage
+        defer_build=True,
         json_schema_extra={
-            "example": {"errors": [ValidationErrorItem.model_json_schema()["example"]]}
+            "example": {"errors": [VALIDATION_ERROR_ITEM_EXAMPLE]}
         }
     )
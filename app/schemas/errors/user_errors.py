@@ -58,4 +58,5 @@ class TokenError(ValidationErrorSchema):
 UserError400 = ErrorClass("user", 400)
 UserError401 = ErrorClass("user", 401)
 UserError403 = ErrorClass("user", 403)
-UserError404 = ErrorClass("user", 404)
\ No newline at end of file
+UserError404 = ErrorClass("user", 404)
+UserError503 = ErrorClass("user", 503)
@@ -0,0 +1,12 @@
+from typing import Literal
+from pydantic import BaseModel, Field
+
+EXPORT_BATCH_DEFAULT = 1000
+EXPORT_BATCH_MAX = 10000
+
+
+class ExportQuerySchema(BaseModel):
+    """Paramètres communs des exports en flux (query string)."""
+    format: Literal["ndjson", "csv"] = "ndjson"
+    batch_size: int = Field(default=EXPORT_BATCH_DEFAULT, ge=1,
+                            le=EXPORT_BATCH_MAX)
@@ -1,9 +1,36 @@
-from pydantic import BaseModel, Field, ConfigDict, field_validator, RootModel
-from typing import List, Literal
-from datetime import datetime
+from pydantic import (
+    BaseModel, Field, ConfigDict, field_validator, field_serializer,
+    model_validator, RootModel, AliasChoices
+)
+from werkzeug.http import http_date
+from typing import List, Literal, Optional
+from datetime import datetime, date
 from email.utils import parsedate_to_datetime
+from app.schemas.pagination_schemas import PageQuerySchema
+from app.schemas.export_schemas import ExportQuerySchema
 
 OrderStatusLiteral = Literal["En attente", "Validée", "Expédiée", "Annulée"]
+ORDER_BATCH_MAX = 100
+
+# Exemples OpenAPI : mêmes lignes dans la création, le lot et la commande
+# retournée
+ORDER_LINES_EXAMPLE = [
+    {"produit_id": 1, "quantite": 2},
+    {"produit_id": 2, "quantite": 1}
+]
+ORDER_CREATE_EXAMPLE = {
+    "adresse_livraison": "10 rue de Paris, 75000 Paris",
+    "produits": ORDER_LINES_EXAMPLE
+}
+ORDER_EXAMPLE = {
+    "id": 1,
+    "utilisateur_id": 1,
+    "adresse_livraison": "10 rue de Paris, 75000 Paris",
+    "statut": "En attente",
+    "date_commande": "2025-09-14T14:00:00",
+    "lignes": ORDER_LINES_EXAMPLE
+}
+ORDER_UPDATE_EXAMPLE = {"id": 1, "statut": "Validée"}
 
 
 class OrderItemSchema(BaseModel):
@@ -27,12 +54,22 @@ class OrderCreateSchema(BaseModel):
 
     model_config = ConfigDict(
         from_attributes=True,
+        json_schema_extra={
+            "example": ORDER_CREATE_EXAMPLE
+        }
+    )
+
+
+class OrderBatchCreateSchema(BaseModel):
+    commandes: List[OrderCreateSchema] = Field(..., min_length=1,
+                                               max_length=ORDER_BATCH_MAX)
+
+    model_config = ConfigDict(
         json_schema_extra={
             "example": {
-                "adresse_livraison": "10 rue de Paris, 75000 Paris",
-                "produits": [
-                    {"produit_id": 1, "quantite": 2},
-                    {"produit_id": 2, "quantite": 1}
+                "commandes": [
+                    ORDER_CREATE_EXAMPLE,
+                    ORDER_CREATE_EXAMPLE
                 ]
             }
         }
@@ -45,10 +82,7 @@ class OrderUpdateSchema(BaseModel):
     model_config = ConfigDict(
         from_attributes=True,
         json_schema_extra={
-            "example": {
-                "id": 1,
-                "statut": "Validée"
-            }
+            "example": ORDER_UPDATE_EXAMPLE
         }
     )
 
@@ -59,7 +93,9 @@ class OrderRespSchema(BaseModel):
     adresse_livraison: str
     statut: str
     date_commande: datetime
-    lignes: List[OrderItemSchema] = []
+    # `lignes` côté JSON, relation `Order.items` côté ORM
+    lignes: List[OrderItemSchema] = Field(
+        default=[], validation_alias=AliasChoices("lignes", "items"))
 
     @field_validator("date_commande", mode="before")
     def parse_date_commande(cls, v):
@@ -72,20 +108,15 @@ class OrderRespSchema(BaseModel):
                 return datetime.fromisoformat(v)
         return v
 
+    @field_serializer("date_commande", when_used="json")
+    def serialize_date_commande(self, v: datetime) -> str:
+        # Même format que jsonify (sérialisation JSON directe des listes)
+        return http_date(v)
+
     model_config = ConfigDict(
         from_attributes=True,
         json_schema_extra={
-            "example": {
-                "id": 1,
-                "utilisateur_id": 1,
-                "adresse_livraison": "10 rue de Paris, 75000 Paris",
-                "statut": "En attente",
-                "date_commande": "2025-09-14T14:00:00",
-                "lignes": [
-                    {"produit_id": 1, "quantite": 2},
-                    {"produit_id": 2, "quantite": 1}
-                ]
-            }
+            "example": ORDER_EXAMPLE
         }
     )
 
@@ -99,7 +130,38 @@ class OrderCreateRespSchema(BaseModel):
         json_schema_extra={
             "example": {
                 "message": "Commande créée",
-                "commande": OrderRespSchema.model_json_schema()["example"]
+                "commande": ORDER_EXAMPLE
+            }
+        }
+    )
+
+
+# Résultat par commande d'un lot (index = position dans la requête)
+class OrderBatchResultSchema(BaseModel):
+    index: int
+    commande: Optional[OrderRespSchema] = None
+    erreur: Optional[str] = None
+    code: Optional[int] = None
+
+
+class OrderBatchRespSchema(BaseModel):
+    message: str
+    creees: int
+    refusees: int
+    resultats: List[OrderBatchResultSchema]
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "message": "1 commande(s) créée(s), 1 refusée(s)",
+                "creees": 1,
+                "refusees": 1,
+                "resultats": [
+                    {"index": 0,
+                     "commande": ORDER_EXAMPLE},
+                    {"index": 1, "code": 400,
+                     "erreur": "Stock insuffisant pour le produit Produit A"}
+                ]
             }
         }
     )
@@ -114,7 +176,7 @@ class OrderUpdateRespSchema(BaseModel):
         json_schema_extra={
             "example": {
                 "message": "Commande mise à jour",
-                "commande": OrderUpdateSchema.model_json_schema()["example"]
+                "commande": ORDER_UPDATE_EXAMPLE
             }
         }
     )
@@ -125,7 +187,29 @@ class OrderListSchema(RootModel[list[OrderRespSchema]]):
         from_attributes=True,
         json_schema_extra={
             "example": {
-                "commandes": [OrderRespSchema.model_json_schema()["example"]]
+                "commandes": [ORDER_EXAMPLE]
             }
         }
     )
+
+
+# Query string : filtres des commandes (liste, exports)
+class OrderFilterSchema(BaseModel):
+    statut: Optional[OrderStatusLiteral] = None
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+
+    @model_validator(mode="after")
+    def check_date_range(self):
+        if self.date_from and self.date_to and self.date_from > self.date_to:
+            raise ValueError("date_from doit être antérieure à date_to")
+        return self
+
+
+# Query string : filtres et pagination de la liste des commandes
+class OrderPageQuerySchema(PageQuerySchema, OrderFilterSchema):
+    utilisateur_id: Optional[int] = Field(default=None, ge=1)
+
+
+class OrderExportQuerySchema(ExportQuerySchema, OrderFilterSchema):
+    pass
@@ -0,0 +1,30 @@
+from typing import Optional
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+
+PAGE_SIZE_DEFAULT = 100
+PAGE_SIZE_MAX = 1000
+
+
+class PageQuerySchema(BaseModel):
+    """
+    Paramètres communs de pagination par curseur (query string). Sans
+    `limit` ni `after`, liste complète comme avant la pagination (clients
+    existants) ; `after` seul : pages de PAGE_SIZE_DEFAULT.
+    """
+    limit: Optional[int] = Field(default=None, ge=1, le=PAGE_SIZE_MAX)
+    after: Optional[str] = Field(default=None, min_length=1)
+
+    @model_validator(mode="after")
+    def default_page_size(self) -> "PageQuerySchema":
+        if self.limit is None and self.after is not None:
+            self.limit = PAGE_SIZE_DEFAULT
+        return self
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "limit": 50,
+                "after": "eyJzIjoiaWQiLCJrIjo1MCwiaWQiOjUwfQ"
+            }
+        }
+    )
@@ -1,5 +1,25 @@
-from typing import Optional
+from typing import List, Optional, Literal
 from pydantic import BaseModel, Field, ConfigDict, model_validator, RootModel
+from app.schemas.pagination_schemas import PageQuerySchema
+from app.schemas.errors.json_schemas import ValidationErrorItem
+
+ProductSortLiteral = Literal["id", "nom", "prix"]
+
+# Produit type des exemples OpenAPI (création, réponses, listes) ; la
+# recherche y ajoute score BM25 et extrait surligné
+PRODUCT_EXAMPLE = {
+    "id": 1,
+    "nom": "Laptop",
+    "description": "PC portable",
+    "categorie": "Informatique",
+    "prix": 1299.99,
+    "quantite_stock": 10
+}
+PRODUCT_SEARCH_EXAMPLE = {
+    **PRODUCT_EXAMPLE,
+    "pertinence": 4.27,
+    "extrait": "<mark>Laptop</mark> Pro"
+}
 
 
 class ProductCreateSchema(BaseModel):
@@ -66,14 +86,7 @@ class ProductRespSchema(BaseModel):
     model_config = ConfigDict(
         from_attributes=True,
         json_schema_extra={
-            "example": {
-                "id": 1,
-                "nom": "Laptop",
-                "description": "PC portable",
-                "categorie": "Informatique",
-                "prix": 1299.99,
-                "quantite_stock": 10
-            }
+            "example": PRODUCT_EXAMPLE
         }
     )
 
@@ -87,7 +100,7 @@ class ProductCreateRespSchema(BaseModel):
         json_schema_extra={
             "example": {
                 "message": "Produit ajouté",
-                "produit": ProductRespSchema.model_json_schema()["example"]
+                "produit": PRODUCT_EXAMPLE
             }
         }
     )
@@ -104,7 +117,7 @@ class ProductUpdateRespSchema(BaseModel):
             "example": {
                 "message": "Produit mis à jour",
                 "produit_id": 1,
-                "produit": ProductRespSchema.model_json_schema()["example"]
+                "produit": PRODUCT_EXAMPLE
             }
         }
     )
@@ -131,8 +144,83 @@ class ProductListSchema(RootModel[list[ProductRespSchema]]):
         from_attributes=True,
         json_schema_extra={
             "example": [
-                ProductRespSchema.model_json_schema()["example"],
-                ProductRespSchema.model_json_schema()["example"]
+                PRODUCT_EXAMPLE,
+                PRODUCT_EXAMPLE
             ]
         }
     )
+
+
+# Résultat de recherche plein texte (?q=) : pertinence BM25 + extrait
+class ProductSearchRespSchema(ProductRespSchema):
+    pertinence: Optional[float] = None
+    extrait: Optional[str] = None
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
+            "example": PRODUCT_SEARCH_EXAMPLE
+        }
+    )
+
+
+class ProductSearchListSchema(RootModel[list[ProductSearchRespSchema]]):
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
+            "example": [PRODUCT_SEARCH_EXAMPLE]
+        }
+    )
+
+
+# Query string : pagination du catalogue et recherche
+class ProductPageQuerySchema(PageQuerySchema):
+    sort: ProductSortLiteral = "id"
+
+
+class ProductSearchQuerySchema(ProductPageQuerySchema):
+    q: Optional[str] = Field(default=None, min_length=1, max_length=200)
+    nom: Optional[str] = None
+    categorie: Optional[str] = None
+    disponible: bool = False
+
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+
+# Import catalogue en masse (NDJSON / CSV)
+class ProductImportQuerySchema(BaseModel):
+    # Déduit du Content-Type si absent
+    format: Optional[Literal["ndjson", "csv"]] = None
+
+
+class ProductImportErrorSchema(BaseModel):
+    ligne: int
+    erreurs: List[ValidationErrorItem]
+
+
+class ProductImportRespSchema(BaseModel):
+    message: str
+    lignes: int
+    crees: int
+    mis_a_jour: int
+    rejetees: int
+    erreurs: List[ProductImportErrorSchema]
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "message": "Import terminé",
+                "lignes": 3,
+                "crees": 1,
+                "mis_a_jour": 1,
+                "rejetees": 1,
+                "erreurs": [
+                    {"ligne": 3, "erreurs": [
+                        {"loc": ["prix"],
+                         "msg": "Input should be greater than 0",
+                         "type": "greater_than"}
+                    ]}
+                ]
+            }
+        }
+    )
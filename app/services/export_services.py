@@ -0,0 +1,52 @@
+from datetime import date
+from app.models import Order, OrderItem, Product
+from app.services.order_services import order_filters
+from sqlalchemy import Select, func, select
+from typing import Optional
+
+
+'''
+Requêtes des exports (catalogue, commandes, lignes) : sélection de colonnes
+uniquement, aucun objet ORM chargé (cf. app.core.export pour le flux).
+'''
+
+
+def product_export_query() -> Select:
+    """ Catalogue complet, par ID. """
+    return select(Product.id, Product.nom, Product.description,
+                  Product.categorie, Product.prix,
+                  Product.quantite_stock).order_by(Product.id)
+
+
+def order_export_query(statut: Optional[str] = None,
+                       date_from: Optional[date] = None,
+                       date_to: Optional[date] = None) -> Select:
+    """ Commandes filtrées avec nombre de lignes et montant total. """
+    return (
+        select(Order.id, Order.utilisateur_id, Order.adresse_livraison,
+               Order.statut, Order.date_commande,
+               func.count(OrderItem.id).label("nb_lignes"),
+               func.coalesce(
+                   func.sum(OrderItem.quantite * OrderItem.prix_unitaire), 0
+               ).label("montant_total"))
+        .outerjoin(OrderItem, OrderItem.commande_id == Order.id)
+        .where(*order_filters(statut, date_from, date_to))
+        .group_by(Order.id)
+        .order_by(Order.id)
+    )
+
+
+def orderitem_export_query(statut: Optional[str] = None,
+                           date_from: Optional[date] = None,
+                           date_to: Optional[date] = None) -> Select:
+    """ Lignes des commandes filtrées (statut/période de la commande). """
+    return (
+        select(OrderItem.id, OrderItem.commande_id,
+               Order.utilisateur_id, Order.statut, Order.date_commande,
+               OrderItem.produit_id, Product.nom.label("produit_nom"),
+               OrderItem.quantite, OrderItem.prix_unitaire)
+        .join(Order, OrderItem.commande_id == Order.id)
+        .outerjoin(Product, OrderItem.produit_id == Product.id)
+        .where(*order_filters(statut, date_from, date_to))
+        .order_by(OrderItem.commande_id, OrderItem.id)
+    )
@@ -0,0 +1,43 @@
+from app.models import Order, OrderItem, Product
+from sqlalchemy.orm import Query, selectinload, joinedload
+from sqlalchemy.orm.interfaces import LoaderOption
+from typing import Dict, Optional, Tuple
+
+
+'''
+Profils de chargement des relations SQLAlchemy (anti N+1) :
+chaque fonction de service déclare le profil adapté à la sérialisation
+attendue par la route, pour un nombre de requêtes fixe quel que soit
+le nombre de commandes/lignes.
+'''
+LOADING_PROFILES: Dict[str, Tuple[LoaderOption, ...]] = {
+    # Commande seule (statut, contrôle d'accès)
+    "order": (),
+
+    # Commande + lignes : 1 requête IN groupée pour toutes les lignes
+    "order_with_lines": (
+        selectinload(Order.items),
+    ),
+
+    # Commande + lignes + nom produit (Order.to_dict / OrderItem.to_dict)
+    "order_with_lines_and_product_names": (
+        selectinload(Order.items)
+        .joinedload(OrderItem.product)
+        .load_only(Product.nom),
+    ),
+
+    # Lignes + nom produit (OrderItem.to_dict) : jointure unique
+    "orderitem_with_product_name": (
+        joinedload(OrderItem.product).load_only(Product.nom),
+    ),
+}
+
+
+def with_profile(query: Query, profile: Optional[str]) -> Query:
+    """
+    Applique à `query` les options de chargement du profil nommé.
+    Lève KeyError si le profil n'est pas déclaré.
+    """
+    if not profile:
+        return query
+    return query.options(*LOADING_PROFILES[profile])
@@ -1,9 +1,16 @@
-from datetime import datetime, UTC
-from app.models import Order, OrderItem, User
-from app.services.product_services import get_product_id
-from app.core.exceptions.app_errors import NotFoundError, BadRequestError
-from sqlalchemy.orm import Session  #, selectinload, joinedload
-from typing import List, Optional
+from datetime import datetime, date, time, timedelta, UTC
+from app.models import Order, OrderItem, Product
+from app.core.auth_cache import Principal
+from app.core.exceptions.app_errors import (
+    ApplicationError, NotFoundError, BadRequestError, ForbiddenError
+)
+from app.core.pagination import paginate
+from app.core.cache import invalidate_catalog
+from app.services.loading_profiles import with_profile
+from sqlalchemy import bindparam, case, select, update
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Tuple
 
 
 def get_order_by_user(session: Session,
@@ -12,65 +19,192 @@ def get_order_by_user(session: Session,
     return session.query(Order).filter_by(utilisateur_id=user_id).all()
 
 
-def get_all_orders(session: Session,
-                   user: Optional[User] = None) -> List[Order]:
+def get_all_orders(session: Session, user: Optional[Principal] = None,
+                   profile: Optional[str] = "order_with_lines") -> List[Order]:
     """ Retourne toutes les commandes si admin ou celles d'un client. """
-    # query = session.query(Order).options(selectinload(Order.items))
+    query = with_profile(session.query(Order), profile)
     if user and user.role != "admin":
-        return session.query(Order).filter_by(utilisateur_id=user.id).all()
-    return session.query(Order).all()
+        return query.filter_by(utilisateur_id=user.id).all()
+    return query.all()
+
+
+def order_filters(statut: Optional[str] = None,
+                  date_from: Optional[date] = None,
+                  date_to: Optional[date] = None,
+                  utilisateur_id: Optional[int] = None) -> List[ColumnElement]:
+    """ Conditions de filtrage des commandes (statut, période, client). """
+    conditions = []
+    if utilisateur_id is not None:
+        conditions.append(Order.utilisateur_id == utilisateur_id)
+
+    if statut:
+        conditions.append(Order.statut == statut)
+
+    if date_from:
+        conditions.append(
+            Order.date_commande >= datetime.combine(date_from, time.min))
+
+    if date_to:
+        # Borne incluse : toute la journée `date_to`
+        conditions.append(
+            Order.date_commande < datetime.combine(date_to + timedelta(days=1),
+                                                   time.min))
+    return conditions
+
+
+def get_orders_page(session: Session, limit: Optional[int],
+                    after: Optional[str] = None,
+                    user: Optional[Principal] = None,
+                    statut: Optional[str] = None,
+                    date_from: Optional[date] = None,
+                    date_to: Optional[date] = None,
+                    utilisateur_id: Optional[int] = None,
+                    profile: Optional[str] = "order_with_lines"
+                    ) -> Tuple[List[Order], Optional[str]]:
+    """
+    Retourne une page de commandes filtrées (statut, période, client)
+    avec le curseur de la page suivante (None si dernière page).
+
+    Un client ne voit que ses commandes (filtre `utilisateur_id` admin only).
+    Les lignes de la page sont chargées en une requête groupée (selectin).
+    """
+    query = with_profile(session.query(Order), profile)
 
+    if user and user.role != "admin":
+        if utilisateur_id is not None and utilisateur_id != user.id:
+            raise ForbiddenError("Accès refusé")
+        utilisateur_id = user.id
+
+    query = query.filter(*order_filters(statut, date_from, date_to,
+                                        utilisateur_id))
+    return paginate(query, "id", Order.id, Order.id, limit, after)
 
-def get_order_by_id(session: Session, order_id: int) -> Order:
-    """ Récupère une commande par son ID. """
-    # order = session.query(Order).options(joinedload(Order.items)).filter_by(id=order_id).first()
-    order = session.query(Order).filter_by(id=order_id).first()
+
+def get_order_by_id(session: Session, order_id: int,
+                    profile: Optional[str] = "order_with_lines") -> Order:
+    """ Récupère une commande par son ID (relations selon `profile`). """
+    order = with_profile(session.query(Order), profile) \
+        .filter_by(id=order_id).first()
     if not order:
         raise NotFoundError("Commande introuvable")
     return order
 
 
+def reserve_stock(session: Session, items: List[dict]) -> Dict[int, Product]:
+    """
+    Réserve le stock des lignes d'une commande de façon ensembliste :
+        - quantités agrégées par produit (lignes en doublon)
+        - produits lus en une requête (IN)
+        - décrément gardé `quantite_stock >= quantite` en un seul UPDATE
+          exécuté par lot : aucune survente entre commandes concurrentes
+    Tout ou rien : si un produit manque de stock, aucun n'est décrémenté.
+    Retourne les produits réservés par ID.
+    """
+    quantities: Dict[int, int] = {}
+    for item in items:
+        quantities[item["produit_id"]] = (quantities.get(item["produit_id"], 0)
+                                          + item["quantite"])
+
+    products = {
+        product.id: product for product in
+        session.query(Product).filter(Product.id.in_(quantities)).all()
+    }
+    if len(products) != len(quantities):
+        raise NotFoundError("Produit introuvable")
+
+    reserve = (
+        update(Product.__table__)
+        .where(Product.id == bindparam("pid"),
+               Product.quantite_stock >= bindparam("qty"))
+        .values(quantite_stock=Product.quantite_stock - bindparam("qty"))
+    )
+    params = [{"pid": pid, "qty": qty} for pid, qty in quantities.items()]
+
+    savepoint = session.begin_nested()
+    reserved = session.execute(reserve, params).rowcount
+    if reserved != len(quantities):
+        savepoint.rollback()
+        short = session.execute(
+            select(Product.id).where(
+                Product.id.in_(quantities),
+                Product.quantite_stock < case(quantities, value=Product.id)
+            ).order_by(Product.id).limit(1)
+        ).scalar_one()
+        raise BadRequestError(
+            f"Stock insuffisant pour le produit {products[short].nom}"
+            )
+    savepoint.commit()
+
+    # Stock décrémenté en base : valeur en mémoire périmée
+    for product in products.values():
+        session.expire(product, ["quantite_stock"])
+    return products
+
+
 def create_new_order(session: Session, user_id: int,
                      address: str, items: List[dict]) -> Order:
-    """ Crée une nouvelle commande avec ses lignes, et met à jour le stock. """
+    """
+    Crée une nouvelle commande avec ses lignes, et met à jour le stock
+    (réservation atomique, cf. `reserve_stock`).
+    Lignes et produits sont rattachés en mémoire : la sérialisation
+    (Order.to_dict) n'émet aucune requête supplémentaire.
+    """
+    products = reserve_stock(session, items)
+
     order = Order(
         utilisateur_id=user_id,
         adresse_livraison=address,
         statut="En attente",
-        date_commande=datetime.now(UTC).date()
+        date_commande=datetime.now(UTC).date(),
+        items=[
+            OrderItem(
+                produit_id=item["produit_id"],
+                quantite=item["quantite"],
+                prix_unitaire=products[item["produit_id"]].prix,
+                product=products[item["produit_id"]]
+            )
+            for item in items
+        ]
     )
     session.add(order)
     session.flush()
     # session.commit()
-
-    for item in items:
-        product = get_product_id(session, item["produit_id"])
-
-        if product.quantite_stock < item["quantite"]:
-            raise BadRequestError(
-                f"Stock insuffisant pour le produit {product.nom}"
-                )
-
-        order_item = OrderItem(
-            commande_id=order.id,
-            produit_id=product.id,
-            quantite=item["quantite"],
-            prix_unitaire=product.prix
-        )
-        session.add(order_item)
-
-        product.quantite_stock -= order_item.quantite
-
-    session.flush()
-    # session.commit()
+    # Stock modifié : réponses catalogue en cache périmées
+    invalidate_catalog(session)
     return order
 
 
-def get_orderitems_all(session: Session,
-                       order_id: int) -> List[OrderItem]:
+def create_orders_batch(session: Session, user_id: int, orders: List[dict]
+                        ) -> List[Tuple[Optional[Order],
+                                        Optional[ApplicationError]]]:
+    """
+    Crée un lot de commandes dans la transaction courante, chacune isolée
+    dans un savepoint : une commande refusée (stock, produit inconnu)
+    n'annule pas les autres.
+    Retourne, dans l'ordre du lot, (commande, None) ou (None, erreur).
+    """
+    results: List[Tuple[Optional[Order], Optional[ApplicationError]]] = []
+    for body in orders:
+        savepoint = session.begin_nested()
+        try:
+            order = create_new_order(session, user_id,
+                                     body["adresse_livraison"],
+                                     body["produits"])
+        except ApplicationError as error:
+            savepoint.rollback()
+            results.append((None, error))
+        else:
+            savepoint.commit()
+            results.append((order, None))
+    return results
+
+
+def get_orderitems_all(session: Session, order_id: int,
+                       profile: Optional[str] = "orderitem_with_product_name"
+                       ) -> List[OrderItem]:
     """ Retourne toutes les lignes d'une commande. """
-    # items = session.query(OrderItem).options(joinedload(OrderItem.product)).filter_by(commande_id=order_id).all()
-    items = session.query(OrderItem).filter_by(commande_id=order_id).all()
+    items = with_profile(session.query(OrderItem), profile) \
+        .filter_by(commande_id=order_id).all()
     if not items:
         raise NotFoundError(("Ligne de commande introuvable"))
 
@@ -80,7 +214,7 @@ def get_orderitems_all(session: Session,
 def change_status_order(session: Session,
                         order_id: int, new_status: str) -> Order:
     """ Modifie le statut d'une commande. """
-    order = get_order_by_id(session, order_id)
+    order = get_order_by_id(session, order_id, profile="order")
     order.statut = new_status
 
     session.flush()
@@ -0,0 +1,179 @@
+import codecs
+import csv
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+from app.models import Product
+from app.schemas.product_schemas import ProductCreateSchema
+from app.core.cache import invalidate_catalog
+from pydantic import ValidationError
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+'''
+Import en masse du catalogue (NDJSON ou CSV) :
+    - lecture en flux, ligne à ligne : mémoire bornée par la taille de lot
+    - validation par lots contre ProductCreateSchema, erreurs par ligne
+      sans interrompre l'import
+    - upsert par clé naturelle (`nom`) : une lecture IN des produits
+      existants puis INSERT/UPDATE exécutés par lot (executemany)
+'''
+IMPORT_FORMATS = ("ndjson", "csv")
+IMPORT_FIELDS = ("nom", "description", "categorie", "prix", "quantite_stock")
+
+# (numéro de ligne, données) ou (numéro de ligne, erreurs de lecture)
+Row = Tuple[int, Any]
+
+
+@dataclass
+class ImportReport:
+    """ Bilan d'un import (erreurs détaillées limitées à `max_errors`). """
+    max_errors: int = 100
+    lignes: int = 0
+    crees: int = 0
+    mis_a_jour: int = 0
+    rejetees: int = 0
+    erreurs: List[Dict[str, Any]] = field(default_factory=list)
+
+    def reject(self, line: int, errors: List[Dict[str, Any]]) -> None:
+        self.rejetees += 1
+        if len(self.erreurs) < self.max_errors:
+            self.erreurs.append({"ligne": line, "erreurs": errors})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "lignes": self.lignes,
+            "crees": self.crees,
+            "mis_a_jour": self.mis_a_jour,
+            "rejetees": self.rejetees,
+            "erreurs": self.erreurs,
+        }
+
+
+def _error(msg: str, type_: str, loc: tuple = ()) -> Dict[str, Any]:
+    return {"loc": loc, "msg": msg, "type": type_}
+
+
+def iter_ndjson(lines: Iterable[str]) -> Iterator[Row]:
+    """ Lit un flux NDJSON (un objet JSON par ligne, sauf lignes vides). """
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield number, [_error(f"JSON invalide : {e.msg}", "json_invalid")]
+            continue
+        if not isinstance(data, dict):
+            yield number, [_error("Objet JSON attendu", "json_type")]
+            continue
+        yield number, data
+
+
+def iter_csv(lines: Iterable[str]) -> Iterator[Row]:
+    """ Lit un flux CSV avec en-tête (colonnes inconnues ignorées). """
+    reader = csv.DictReader(lines)
+    for data in reader:
+        if not any(data.values()):
+            continue
+        # Numéro de ligne physique (en-tête = ligne 1)
+        yield reader.line_num, {k: v for k, v in data.items() if k is not None}
+
+
+def iter_rows(stream: Iterable[bytes], fmt: str,
+              encoding: str = "utf-8") -> Iterator[Row]:
+    """ Décode un flux binaire (requête, fichier) et le lit selon `fmt`. """
+    lines = codecs.iterdecode(stream, encoding)
+    if fmt == "csv":
+        return iter_csv(lines)
+    return iter_ndjson(lines)
+
+
+def _upsert_chunk(session: Session, rows: List[Row],
+                  report: ImportReport) -> None:
+    """ Valide puis écrit un lot de lignes (INSERT/UPDATE par lot). """
+    valid: Dict[str, Dict[str, Any]] = {}
+    for line, data in rows:
+        report.lignes += 1
+        if isinstance(data, list):
+            report.reject(line, data)
+            continue
+        try:
+            product = ProductCreateSchema.model_validate(data)
+        except ValidationError as e:
+            report.reject(line, [_error(err["msg"], err["type"], err["loc"])
+                                 for err in e.errors()])
+            continue
+        if product.nom in valid:
+            # Doublon dans le lot : la dernière ligne l'emporte
+            report.mis_a_jour += 1
+        valid[product.nom] = product.model_dump(include=set(IMPORT_FIELDS))
+
+    if not valid:
+        return
+
+    existing: Dict[str, int] = {}
+    for product_id, nom in session.execute(
+        select(Product.id, Product.nom)
+        .where(Product.nom.in_(valid))
+        .order_by(Product.id.desc())
+    ):
+        # Homonymes existants : le plus ancien est mis à jour
+        existing[nom] = product_id
+
+    inserts = [data for nom, data in valid.items() if nom not in existing]
+    updates = [{**data, "pid": existing[nom]}
+               for nom, data in valid.items() if nom in existing]
+
+    table = Product.__table__
+    if inserts:
+        session.execute(insert(table), inserts)
+    if updates:
+        session.execute(
+            update(table)
+            .where(table.c.id == bindparam("pid"))
+            .values({name: bindparam(name) for name in IMPORT_FIELDS}),
+            updates
+        )
+    report.crees += len(inserts)
+    report.mis_a_jour += len(updates)
+
+
+def import_products(session: Session, rows: Iterable[Row],
+                    chunk_size: int = 500, max_errors: int = 100,
+                    commit: bool = False) -> ImportReport:
+    """
+    Importe (upsert par `nom`) un flux de lignes produits par lots de
+    `chunk_size`, et retourne le bilan de l'import.
+    Avec `commit`, chaque lot est validé (import hors requête HTTP, CLI).
+    """
+    report = ImportReport(max_errors=max_errors)
+    rows = iter(rows)
+    while chunk := list(islice(rows, chunk_size)):
+        _upsert_chunk(session, chunk, report)
+        if commit:
+            session.commit()
+
+    if report.crees or report.mis_a_jour:
+        invalidate_catalog(session)
+    return report
+
+
+def detect_format(content_type: Optional[str],
+                  filename: Optional[str] = None) -> Optional[str]:
+    """ Déduit le format (ndjson/csv) du Content-Type ou de l'extension. """
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type in ("text/csv", "application/csv"):
+        return "csv"
+    if content_type in ("application/x-ndjson", "application/ndjson",
+                        "application/jsonl", "application/json-lines"):
+        return "ndjson"
+    if filename:
+        extension = filename.rsplit(".", 1)[-1].lower()
+        if extension == "csv":
+            return "csv"
+        if extension in ("ndjson", "jsonl"):
+            return "ndjson"
+    return None
@@ -1,7 +1,21 @@
 from app.models import Product
-from app.core.exceptions.app_errors import NotFoundError
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from app.core.exceptions.app_errors import NotFoundError, BadRequestError
+from app.core.pagination import paginate
+from app.core.cache import invalidate_catalog
+from app.database.fts import (
+    product_fts, fts_rank, fts_snippet, fts_words, fts_match, has_product_fts,
+    highlight
+)
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, Query
+from typing import List, Optional, Tuple
+
+# Colonnes autorisées pour le tri paginé (clé de curseur)
+PRODUCT_SORT_COLUMNS = {
+    "id": Product.id,
+    "nom": Product.nom,
+    "prix": Product.prix,
+}
 
 
 def get_all_products(session: Session) -> List[Product]:
@@ -24,6 +38,7 @@ def add_product(session: Session, **kwargs) -> Product:
     session.add(product)
     session.flush()
     # session.commit()
+    invalidate_catalog(session)
     return product
 
 
@@ -37,6 +52,7 @@ def update_product(session: Session, produit_id: int, **kwargs) -> Product:
     session.flush()
     # session.commit()
     session.refresh(product)
+    invalidate_catalog(session)
     return product
 
 
@@ -47,13 +63,14 @@ def delete_product_id(session: Session, produit_id: int) -> bool:
     session.delete(product)
     session.flush()
     # session.commit()
+    invalidate_catalog(session)
     return True
 
 
-def search_product(session: Session, nom: Optional[str] = None,
-                   categorie: Optional[str] = None, disponible: bool = False
-                   ) -> List[Product]:
-    """ Retourne une liste de produits filtrés par nom, catégorie ou disponibilité. """
+def _search_query(session: Session, nom: Optional[str] = None,
+                  categorie: Optional[str] = None,
+                  disponible: bool = False) -> Query:
+    """ Requête produits filtrée par nom, catégorie ou disponibilité. """
     query = session.query(Product)
 
     if nom:
@@ -65,4 +82,71 @@ def search_product(session: Session, nom: Optional[str] = None,
     if disponible:
         query = query.filter(Product.quantite_stock > 0)
 
-    return query.all()
+    return query
+
+
+def search_product(session: Session, nom: Optional[str] = None,
+                   categorie: Optional[str] = None, disponible: bool = False
+                   ) -> List[Product]:
+    """ Retourne une liste de produits filtrés par nom, catégorie ou disponibilité. """
+    return _search_query(session, nom, categorie, disponible).all()
+
+
+def get_products_page(session: Session, limit: Optional[int],
+                      after: Optional[str] = None,
+                      sort: str = "id", nom: Optional[str] = None,
+                      categorie: Optional[str] = None, disponible: bool = False
+                      ) -> Tuple[List[Product], Optional[str]]:
+    """
+    Retourne une page de produits (filtrés ou non) triée par `sort`,
+    avec le curseur de la page suivante (None si dernière page).
+    """
+    query = _search_query(session, nom, categorie, disponible)
+    return paginate(query, sort, PRODUCT_SORT_COLUMNS[sort], Product.id,
+                    limit, after)
+
+
+def search_products_fulltext(session: Session, q: str,
+                             limit: Optional[int],
+                             after: Optional[str] = None,
+                             categorie: Optional[str] = None,
+                             disponible: bool = False
+                             ) -> Tuple[List[Tuple[Product, Optional[float],
+                                                   Optional[str]]],
+                                        Optional[str]]:
+    """
+    Recherche plein texte (FTS5) sur nom, description et catégorie :
+    mots en préfixe, classement BM25 et extrait surligné (<mark>).
+
+    Retourne une page de tuples (produit, pertinence, extrait) et le curseur
+    suivant. Sans index FTS5, repli sur un filtre ILIKE par mot (tri par id,
+    pertinence et extrait à None).
+    """
+    words = fts_words(q)
+    if not words:
+        raise BadRequestError("Recherche vide")
+
+    query = _search_query(session, None, categorie, disponible)
+
+    if not has_product_fts(session):
+        for word in words:
+            pattern = f"%{word}%"
+            query = query.filter(or_(Product.nom.ilike(pattern),
+                                     Product.description.ilike(pattern),
+                                     Product.categorie.ilike(pattern)))
+        products, next_cursor = paginate(query, "id", Product.id, Product.id,
+                                         limit, after)
+        return [(p, None, None) for p in products], next_cursor
+
+    query = query \
+        .add_columns(fts_rank.label("rank"), fts_snippet.label("extrait")) \
+        .join(product_fts, product_fts.c.rowid == Product.id) \
+        .filter(fts_match(words))
+
+    rows, next_cursor = paginate(
+        query, "rank", fts_rank, Product.id, limit, after,
+        row_key=lambda row: (row.rank, row.Product.id)
+        )
+    # Pertinence exposée croissante (BM25 SQLite : plus petit = meilleur)
+    return [(row.Product, -row.rank, highlight(row.extrait))
+            for row in rows], next_cursor
@@ -0,0 +1,180 @@
+import itertools
+import math
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from app.models import Order, OrderItem, Product, User
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Connection
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+
+'''
+Génération de données synthétiques volumineuses (flask seed) :
+    - utilisateurs, produits, commandes et lignes insérés par lots
+      `insert()` Core (executemany), sans objets ORM
+    - popularité des produits en loi de puissance (Zipf), nombre de lignes
+      par commande décroissant, répartition des statuts paramétrable
+    - déterministe pour une même graine (identifiants compris, à partir
+      des identifiants maximums existants) et une même date de base (dates
+      d'inscription et de commande)
+'''
+# Fin de la période couverte par défaut : dates reproductibles d'un run à
+# l'autre (pas de dépendance à l'heure courante)
+DEFAULT_BASE_DATE = datetime(2025, 1, 1, tzinfo=timezone.utc)
+DEFAULT_STATUS_MIX = {"En attente": 0.15, "Validée": 0.25,
+                      "Expédiée": 0.5, "Annulée": 0.1}
+
+
+@dataclass
+class SeedProfile:
+    users: int = 1_000
+    products: int = 10_000
+    orders: int = 10_000
+    categories: int = 50
+    popularity_skew: float = 1.1        # exposant Zipf (0 = uniforme)
+    lines_max: int = 5
+    lines_skew: float = 1.5             # P(k lignes) ∝ k^-skew
+    status_mix: Dict[str, float] = field(
+        default_factory=lambda: dict(DEFAULT_STATUS_MIX))
+    days: int = 365                     # période couverte par les commandes
+    base_date: datetime = DEFAULT_BASE_DATE     # fin de la période
+    password: str = "password123"
+    seed: int = 42
+    batch_size: int = 10_000
+
+
+@dataclass
+class SeedReport:
+    users: int = 0
+    products: int = 0
+    orders: int = 0
+    order_items: int = 0
+    first_user: int = 0
+    first_product: int = 0
+    first_order: int = 0
+    seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def parse_status_mix(value: str) -> Dict[str, float]:
+    """ "Validée=0.3,Expédiée=0.7" -> {statut: poids} (statuts connus). """
+    mix = {}
+    for part in filter(None, (p.strip() for p in value.split(","))):
+        status, _, weight = part.partition("=")
+        if status not in Order.STATUS:
+            raise ValueError(f"Statut inconnu : {status}")
+        mix[status] = float(weight)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Répartition des statuts vide")
+    return mix
+
+
+def power_law_weights(n: int, skew: float) -> List[float]:
+    """ Poids cumulés des rangs 1..n (loi de puissance d'exposant `skew`). """
+    return list(itertools.accumulate(1 / (rank ** skew)
+                                     for rank in range(1, n + 1)))
+
+
+def _next_id(conn: Connection, model: Any) -> int:
+    return (conn.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def _insert_batches(conn: Connection, table: Any,
+                    rows: Iterator[Dict[str, Any]], batch_size: int) -> int:
+    count = 0
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            return count
+        conn.execute(insert(table), batch)
+        count += len(batch)
+
+
+def seed_database(conn: Connection, profile: SeedProfile,
+                  password_hash: str) -> SeedReport:
+    """
+    Insère le jeu de données du profil sur `conn` (transaction de
+    l'appelant : tout ou rien). Les utilisateurs partagent `password_hash`.
+    """
+    started = time.perf_counter()
+    rng = random.Random(profile.seed)
+    report = SeedReport(first_user=_next_id(conn, User),
+                        first_product=_next_id(conn, Product),
+                        first_order=_next_id(conn, Order))
+    now = profile.base_date
+
+    users = ({"id": report.first_user + i,
+              "email": f"user{report.first_user + i}@example.com",
+              "nom": f"Utilisateur {report.first_user + i}",
+              "password_hash": password_hash, "role": "client",
+              "date_creation": now - timedelta(days=profile.days)}
+             for i in range(profile.users))
+    report.users = _insert_batches(conn, User.__table__, users,
+                                   profile.batch_size)
+
+    # Prix log-normaux (médiane ~30) conservés pour les lignes de commande
+    prices = [round(min(rng.lognormvariate(math.log(30), 1.0), 5000), 2)
+              for _ in range(profile.products)]
+    products = ({"id": report.first_product + i,
+                 "nom": f"Produit {report.first_product + i}",
+                 "description":
+                     f"Description du produit {report.first_product + i}",
+                 "categorie": f"Catégorie {rng.randrange(profile.categories)}",
+                 "prix": prices[i],
+                 "quantite_stock": rng.randint(0, 1000)}
+                for i in range(profile.products))
+    report.products = _insert_batches(conn, Product.__table__, products,
+                                      profile.batch_size)
+
+    if profile.orders and profile.users and profile.products:
+        report.orders, report.order_items = _seed_orders(
+            conn, profile, report, prices, rng, now)
+
+    report.seconds = round(time.perf_counter() - started, 2)
+    return report
+
+
+def _seed_orders(conn: Connection, profile: SeedProfile, report: SeedReport,
+                 prices: Sequence[float], rng: random.Random,
+                 now: datetime) -> Tuple[int, int]:
+    # Rang de popularité -> produit (permutation : populaires dispersés)
+    ranked = list(range(profile.products))
+    rng.shuffle(ranked)
+    popularity = power_law_weights(profile.products, profile.popularity_skew)
+    line_counts = list(range(1, profile.lines_max + 1))
+    line_weights = power_law_weights(profile.lines_max, profile.lines_skew)
+    statuses = list(profile.status_mix)
+    status_weights = list(itertools.accumulate(profile.status_mix.values()))
+    step = timedelta(days=profile.days) / profile.orders
+    start = now - timedelta(days=profile.days)
+
+    orders: List[Dict[str, Any]] = []
+    items: List[Dict[str, Any]] = []
+    n_orders = n_items = 0
+    for i in range(profile.orders):
+        order_id = report.first_order + i
+        orders.append({
+            "id": order_id,
+            "utilisateur_id": report.first_user + rng.randrange(profile.users),
+            "adresse_livraison": f"{rng.randint(1, 200)} rue des Données",
+            "statut": rng.choices(statuses, cum_weights=status_weights)[0],
+            "date_commande": start + step * i,
+        })
+        count = rng.choices(line_counts, cum_weights=line_weights)[0]
+        for rank in rng.choices(ranked, cum_weights=popularity, k=count):
+            items.append({"commande_id": order_id,
+                          "produit_id": report.first_product + rank,
+                          "quantite": rng.randint(1, 3),
+                          "prix_unitaire": prices[rank]})
+
+        if len(items) >= profile.batch_size or i == profile.orders - 1:
+            conn.execute(insert(Order.__table__), orders)
+            conn.execute(insert(OrderItem.__table__), items)
+            n_orders += len(orders)
+            n_items += len(items)
+            orders, items = [], []
+    return n_orders, n_items
@@ -1,10 +1,125 @@
+import random
+from flask import Response, current_app, request
 from spectree import SpecTree
 from spectree.models import SecurityScheme
+from spectree.plugins.flask_plugin import FlaskPlugin
+from app.core.instrumentation import timed
+from app.core.metrics import response_validations
+from app.core.openapi import openapi_response, page_response
+from typing import Any, Dict, Type
+
+
+class ResponseValidationPolicy:
+    """
+    Validation des réponses par spectree (les requêtes sont toujours
+    validées) :
+        - sample_rate : part des réponses validées (1.0 = toutes)
+        - strict : réponse non conforme -> erreur 500 (sinon journalisée,
+          comptée dans response_validations_total et envoyée telle quelle)
+    """
+
+    def __init__(self, sample_rate: float = 1.0, strict: bool = True) -> None:
+        self.sample_rate = sample_rate
+        self.strict = strict
+
+    def configure(self, config: Dict[str, Any]) -> None:
+        """ Applique RESPONSE_VALIDATION_* de la config Flask. """
+        self.sample_rate = config.get("RESPONSE_VALIDATION_SAMPLE_RATE",
+                                      self.sample_rate)
+        self.strict = config.get("RESPONSE_VALIDATION_STRICT", self.strict)
+
+    def sampled(self) -> bool:
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+
+# Taux d'échantillonnage et mode strict lus à chaque réponse validée
+response_validation = ResponseValidationPolicy()
+
+
+class InstrumentedFlaskPlugin(FlaskPlugin):
+    """
+    Plugin Flask spectree avec validations chronométrées (Server-Timing),
+    validation des réponses selon `response_validation` et documentation
+    pré-encodée.
+    """
+
+    def register_route(self, app):
+        """
+        Routes de documentation (mêmes URL et endpoints que spectree)
+        servies depuis des octets pré-encodés (cf. app.core.openapi).
+        """
+        config = self.config
+        app.add_url_rule(rule=config.spec_url,
+                         endpoint=f"openapi_{config.path}",
+                         view_func=lambda: openapi_response(self.spectree))
+        for ui in config.page_templates:
+            app.add_url_rule(
+                rule=f"/{config.path}/{ui}/",
+                endpoint=f"openapi_{config.path}_{ui}",
+                view_func=lambda ui=ui: page_response(self.spectree, ui))
+
+    def request_validation(self, *args, **kwargs):
+        with timed("validate"):
+            return super().request_validation(*args, **kwargs)
+
+    def validate_response(self, resp, resp_model, skip_validation):
+        # Réponse en flux (exports) : transmise sans lire le corps, que
+        # spectree chargerait en mémoire même sans modèle à valider
+        if isinstance(resp, Response) and resp.is_streamed:
+            return resp, None
+        policy = response_validation
+        if skip_validation or resp_model is None:
+            return super().validate_response(resp, resp_model, skip_validation)
+        endpoint = request.endpoint or "unmatched"
+        if not policy.sampled():
+            response_validations.inc(endpoint, "skipped")
+            return super().validate_response(resp, resp_model, True)
+
+        with timed("validate"):
+            response, error = super().validate_response(resp, resp_model,
+                                                        False)
+        if error is None:
+            response_validations.inc(endpoint, "valid")
+            return response, None
+
+        response_validations.inc(endpoint, "invalid")
+        if policy.strict:
+            return response, error
+        current_app.logger.warning(
+            "Réponse non conforme au schéma : %s %s : %s",
+            request.method, request.path, error.errors()[:5])
+        # Réponse de la vue envoyée telle quelle
+        return self.make_response_with_addition(resp), None
+
+
+class LazySpecTree(SpecTree):
+    """
+    SpecTree à schémas différés : les modèles déclarés par `@spec.validate`
+    sont seulement enregistrés à l'import des routes, leur schéma JSON est
+    généré au premier accès au document OpenAPI (`spec.spec`).
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._pending_models: Dict[str, Type[Any]] = {}
+        super().__init__(*args, **kwargs)
+
+    def _add_model(self, model: Type[Any]) -> str:
+        model_key = self.naming_strategy(model)
+        self._pending_models[model_key] = model
+        return model_key
+
+    def _generate_spec(self) -> Dict[str, Any]:
+        # Ordre de déclaration conservé (composants du document)
+        for model in self._pending_models.values():
+            super()._add_model(model)
+        self._pending_models.clear()
+        return super()._generate_spec()
 
 
 # Initialisation de l'instance Spectree
-spec = SpecTree(
+spec = LazySpecTree(
     "flask",
+    backend=InstrumentedFlaskPlugin,
     title="My E-commerce API",
     version="1.0.0",
     description="Documentation API Flask (via Spectree)",
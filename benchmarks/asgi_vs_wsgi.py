@@ -0,0 +1,196 @@
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+'''
+Comparaison des modes WSGI (serveur werkzeug threadé, cf. app/run.py) et
+ASGI (app/asgi.py sous uvicorn) sur une base SQLite temporaire :
+    1. `--idle` connexions ouvertes sans requête (clients inactifs)
+    2. charge GET `--path` avec `--concurrency` clients pendant ce temps
+    3. relevé threads/mémoire du serveur, débit et latences
+
+    python benchmarks/asgi_vs_wsgi.py [--idle 500] [--concurrency 16]
+'''
+ROOT = Path(__file__).resolve().parent.parent
+
+WSGI_SERVER = (
+    "import sys; from werkzeug.serving import run_simple; "
+    "from app import create_app; "
+    "run_simple('127.0.0.1', int(sys.argv[1]), create_app(), threaded=True)"
+)
+SERVERS = {
+    "wsgi": lambda port: [sys.executable, "-c", WSGI_SERVER, str(port)],
+    "asgi": lambda port: [sys.executable, "-m", "app.asgi", "--port", str(port)],
+}
+
+
+def seed_database(db_url: str, products: int) -> None:
+    """ Crée le schéma et `products` produits (processus séparé). """
+    code = (
+        "from app.database.db_manager import DatabaseManager\n"
+        "from app.database.base import SessionLocal\n"
+        "from app.models import Product\n"
+        "DatabaseManager().migrate()\n"
+        "with SessionLocal() as s:\n"
+        f"    s.add_all(Product(nom=f'Produit {{i}}', description='bench',"
+        f" categorie='cat{{i % 10}}', prix=10 + i, quantite_stock=100)"
+        f" for i in range({products}))\n"
+        "    s.commit()\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                   env=server_env(db_url))
+
+
+def server_env(db_url: str) -> Dict[str, str]:
+    return {**os.environ, "DATABASE_URL": db_url, "FLASK_ENV": "prod",
+            "PYTHONPATH": str(ROOT)}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(port: int, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Serveur non démarré sur le port {port}")
+
+
+def process_stats(pid: int) -> Dict[str, int]:
+    """ Threads et mémoire résidente (Ko) du serveur (Linux : /proc). """
+    stats = {}
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            key, _, value = line.partition(":")
+            if key in ("Threads", "VmRSS"):
+                stats[key] = int(value.split()[0])
+    except OSError:
+        pass
+    return stats
+
+
+async def fetch(port: int, path: str) -> Optional[float]:
+    """ Une requête (connexion dédiée) ; durée en secondes ou None. """
+    start = time.perf_counter()
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: bench\r\n"
+                     "Connection: close\r\n\r\n".encode())
+        await writer.drain()
+        data = await reader.read()
+        writer.close()
+    except OSError:
+        return None
+    if not data.startswith(b"HTTP/1.1 200"):
+        return None
+    return time.perf_counter() - start
+
+
+async def run_load(port: int, path: str, concurrency: int,
+                   requests: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def client() -> None:
+        nonlocal errors
+        for _ in remaining:
+            elapsed = await fetch(port, path)
+            if elapsed is None:
+                errors += 1
+            else:
+                latencies.append(elapsed)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    duration = time.perf_counter() - start
+
+    latencies.sort()
+    pick = lambda q: latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1000  # noqa: E731
+    return {
+        "req_s": len(latencies) / duration,
+        "p50_ms": pick(0.50) if latencies else 0,
+        "p95_ms": pick(0.95) if latencies else 0,
+        "p99_ms": pick(0.99) if latencies else 0,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0,
+        "errors": errors,
+    }
+
+
+async def bench_mode(mode: str, db_url: str, args) -> Dict[str, float]:
+    port = free_port()
+    server = subprocess.Popen(SERVERS[mode](port), cwd=ROOT,
+                              env=server_env(db_url),
+                              stdout=subprocess.DEVNULL,
+                              stderr=subprocess.DEVNULL)
+    idle = []
+    try:
+        wait_ready(port)
+        await run_load(port, args.path, args.concurrency, args.concurrency)
+
+        baseline = process_stats(server.pid)
+        for _ in range(args.idle):
+            idle.append(await asyncio.open_connection("127.0.0.1", port))
+        await asyncio.sleep(1)
+        held = process_stats(server.pid)
+
+        result = await run_load(port, args.path, args.concurrency,
+                                args.requests)
+        result.update({
+            "threads_base": baseline.get("Threads", 0),
+            "threads_idle": held.get("Threads", 0),
+            "rss_idle_mb": held.get("VmRSS", 0) / 1024,
+        })
+        return result
+    finally:
+        for _, writer in idle:
+            writer.close()
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark WSGI vs ASGI")
+    parser.add_argument("--idle", type=int, default=500,
+                        help="connexions inactives maintenues")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--products", type=int, default=200)
+    parser.add_argument("--path", default="/api/produits?page=1")
+    parser.add_argument("--modes", nargs="+", default=list(SERVERS),
+                        choices=list(SERVERS))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = f"sqlite:///{tmp}/bench.db"
+        seed_database(db_url, args.products)
+
+        columns = ("req_s", "mean_ms", "p50_ms", "p95_ms", "p99_ms",
+                   "errors", "threads_base", "threads_idle", "rss_idle_mb")
+        print(f"{args.idle} connexions inactives, {args.concurrency} clients,"
+              f" {args.requests} x GET {args.path}")
+        print(f"{'mode':<6}" + "".join(f"{c:>14}" for c in columns))
+        for mode in args.modes:
+            result = asyncio.run(bench_mode(mode, db_url, args))
+            print(f"{mode:<6}" + "".join(
+                f"{result[c]:>14.1f}" for c in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import json
+import os
+import pytest
+from pathlib import Path
+from typing import Any, Dict, Generator
+
+# Base de test en mémoire (TestConfig) : à définir avant tout import de app
+os.environ["FLASK_ENV"] = "testing"
+
+from app.core.password_hashing import password_hasher  # noqa: E402
+from app.database.base import engine  # noqa: E402
+from app.services.seeding import seed_database  # noqa: E402
+from benchmarks.harness import (  # noqa: E402
+    SIZES, BenchRecorder, bench_profile, compare, save_results
+)
+
+# Fixtures de la suite de tests (app, client, tokens) réutilisées
+pytest_plugins = ["tests.conftest"]
+
+
+'''
+Suite de benchmarks des routes (auth, produits, commandes) :
+    python -m pytest benchmarks --bench-size 100k
+        [--bench-output benchmarks/results/100k.json]
+        [--bench-baseline benchmarks/results/baseline.json --bench-threshold 0.2]
+'''
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def pytest_addoption(parser) -> None:
+    group = parser.getgroup("benchmarks")
+    group.addoption("--bench-size", choices=list(SIZES), default="1k",
+                    help="volume du jeu de données (produits et commandes)")
+    group.addoption("--bench-repeat", type=int, default=30,
+                    help="appels mesurés par route")
+    group.addoption("--bench-output", default=None,
+                    help="fichier JSON des résultats (défaut : results/<size>.json)")
+    group.addoption("--bench-baseline", default=None,
+                    help="baseline JSON à comparer")
+    group.addoption("--bench-threshold", type=float, default=0.2,
+                    help="écart relatif signalé comme régression (0.2 = 20 %%)")
+
+
+@pytest.fixture(scope="session")
+def bench_dataset(setup_db, pytestconfig) -> Dict[str, Any]:
+    """ Jeu de données de la taille demandée (une fois par session). """
+    profile = bench_profile(SIZES[pytestconfig.getoption("--bench-size")])
+    with engine.begin() as conn:
+        report = seed_database(conn, profile,
+                               password_hasher.hash(profile.password))
+    return report.to_dict()
+
+
+@pytest.fixture(scope="session")
+def bench(pytestconfig) -> BenchRecorder:
+    recorder = BenchRecorder(engine, pytestconfig.getoption("--bench-repeat"))
+    pytestconfig._bench_recorder = recorder
+    return recorder
+
+
+@pytest.fixture
+def auth_headers(admin_token: str, client_token: str
+                 ) -> Generator[Dict[str, Dict[str, str]], None, None]:
+    yield {"admin": {"Authorization": f"Bearer {admin_token}"},
+           "client": {"Authorization": f"Bearer {client_token}"}}
+
+
+def _report(config) -> Dict[str, Any]:
+    recorder = getattr(config, "_bench_recorder", None)
+    if recorder is None or not recorder.results:
+        return {}
+    size = config.getoption("--bench-size")
+    data = recorder.to_json(size)
+    output = config.getoption("--bench-output") or RESULTS_DIR / f"{size}.json"
+    save_results(Path(output), data)
+    data["output"] = str(output)
+
+    baseline = config.getoption("--bench-baseline")
+    if baseline:
+        data["regressions"] = compare(json.loads(Path(baseline).read_text()),
+                                      data, config.getoption("--bench-threshold"))
+    return data
+
+
+def pytest_sessionfinish(session, exitstatus) -> None:
+    session.config._bench_report = report = _report(session.config)
+    if report.get("regressions") and exitstatus == 0:
+        session.exitstatus = 1
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config) -> None:
+    report = getattr(config, "_bench_report", None)
+    if not report:
+        return
+    write = terminalreporter.write_line
+    terminalreporter.section(f"benchmarks ({report['meta']['size']})")
+    write(f"{'route':<42}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'req. SQL':>10}{'pic Kio':>10}")
+    for name, r in sorted(report["results"].items()):
+        write(f"{name:<42}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}"
+              f"{r['p99_ms']:>9.2f}{r['queries']:>10.1f}{r['peak_kib']:>10.0f}")
+    write(f"Résultats : {report['output']}")
+    if "regressions" in report:
+        if report["regressions"]:
+            write("Régressions :", red=True)
+            for line in report["regressions"]:
+                write(f"  {line}", red=True)
+        else:
+            write("Aucune régression par rapport à la baseline.", green=True)
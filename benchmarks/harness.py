@@ -0,0 +1,127 @@
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.services.seeding import SeedProfile
+from typing import Any, Callable, Dict, List, Optional
+
+
+'''
+Outils de la suite de benchmarks (benchmarks/test_*.py) :
+    - jeux de données 1k / 100k / 1m (produits, utilisateurs, commandes)
+      générés par app.services.seeding
+    - mesure d'une route : latences p50/p95/p99, requêtes SQL par appel,
+      pic mémoire (tracemalloc, appel isolé)
+    - baseline JSON et comparaison avec seuil de régression
+'''
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+# Marges absolues en deçà desquelles un écart n'est pas une régression
+METRIC_FLOORS = {"p50_ms": 0.1, "p95_ms": 0.1, "p99_ms": 0.2,
+                 "queries": 0.0, "peak_kib": 16.0}
+
+
+def bench_profile(size: int) -> SeedProfile:
+    """ `size` produits et commandes, size/10 utilisateurs. """
+    return SeedProfile(users=max(size // 10, 10), products=size, orders=size)
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+
+class BenchRecorder:
+    """ Mesures des routes d'une session de benchmarks. """
+
+    def __init__(self, engine: Engine, repeat: int) -> None:
+        self.engine = engine
+        self.repeat = repeat
+        self.results: Dict[str, Dict[str, float]] = {}
+        self._statements = 0
+
+    def _count(self, *args: Any) -> None:
+        self._statements += 1
+
+    def measure(self, name: str, call: Callable[[Any], Any],
+                setup: Optional[Callable[[], Any]] = None,
+                expect: int = 200, repeat: Optional[int] = None) -> None:
+        """
+        Exécute `call(setup())` `repeat` fois (préparation non mesurée) ;
+        chaque réponse doit avoir le statut `expect`.
+        """
+        repeat = repeat or self.repeat
+        latencies: List[float] = []
+
+        def run() -> float:
+            arg = setup() if setup else None
+            start = time.perf_counter()
+            resp = call(arg)
+            elapsed = time.perf_counter() - start
+            assert resp.status_code == expect, (name, resp.status_code,
+                                                resp.get_data(as_text=True)[:200])
+            return elapsed
+
+        run()                                   # échauffement
+        event.listen(self.engine, "before_cursor_execute", self._count)
+        try:
+            self._statements = 0
+            for _ in range(repeat):
+                latencies.append(run())
+            queries = self._statements / repeat
+        finally:
+            event.remove(self.engine, "before_cursor_execute", self._count)
+
+        tracemalloc.start()
+        try:
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.results[name] = {
+            "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+            "p95_ms": round(_percentile(latencies, 0.95) * 1000, 3),
+            "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+            "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+            "queries": round(queries, 2),
+            "peak_kib": round(peak / 1024, 1),
+            "repeat": repeat,
+        }
+
+    def to_json(self, size: str) -> Dict[str, Any]:
+        return {
+            "meta": {"size": size, "repeat": self.repeat,
+                     "python": platform.python_version(),
+                     "date": datetime.now(timezone.utc).isoformat()},
+            "results": self.results,
+        }
+
+
+def save_results(path: Path, data: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n")
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any],
+            threshold: float) -> List[str]:
+    """ Régressions (écart relatif > `threshold`) par route et métrique. """
+    regressions = []
+    for name, new in current["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if old is None:
+            continue
+        for metric, floor in METRIC_FLOORS.items():
+            before, after = old.get(metric), new.get(metric)
+            if before is None or after is None:
+                continue
+            if after > before * (1 + threshold) and after - before > floor:
+                regressions.append(
+                    f"{name} : {metric} {before} -> {after} "
+                    f"(+{(after / before - 1) * 100 if before else 100:.0f} %)")
+    return regressions
@@ -0,0 +1,386 @@
+import argparse
+import http.client
+import itertools
+import json
+import multiprocessing
+import random
+import statistics
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+
+'''
+Générateur de charge HTTP contre une instance en cours d'exécution
+(jeu de données de `flask seed`) :
+    - `--processes` x `--threads` clients, chacun authentifié par
+      /api/auth/login (utilisateurs `--users`, admin optionnel)
+    - mélange pondéré de scénarios (`--mix browse=50,search=20,...`)
+    - boucle fermée (chaque client enchaîne ses requêtes) ou ouverte
+      (`--rate` arrivées/s fixes, latence mesurée depuis l'arrivée prévue)
+    - paliers successifs (`--threads 4 8 16` ou `--rate 100 200 400`) pour
+      situer le point de saturation ; débit, latences et erreurs par route
+
+    python -m benchmarks.load --url http://127.0.0.1:5000 --duration 30 \\
+        --threads 4 8 16 32 [--admin-email admin@test.com --admin-password ...]
+    python -m benchmarks.load --rate 50 100 200 --threads 32
+'''
+DEFAULT_MIX = {"browse": 40, "detail": 20, "search": 20, "order": 15,
+               "admin": 5}
+SEARCH_TERMS = ("Produit", "Description", "Catégorie 1", "produit 12")
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """ "browse=50,order=10" -> {scénario: poids} (scénarios connus). """
+    mix = {}
+    for part in filter(None, (p.strip() for p in value.split(","))):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise ValueError(f"Scénario inconnu : {name}")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Mélange de scénarios vide")
+    return mix
+
+
+def parse_range(value: str) -> Tuple[int, int]:
+    """ "1-100" -> (1, 100) inclus. """
+    first, _, last = value.partition("-")
+    return int(first), int(last or first)
+
+
+@dataclass
+class LoadOptions:
+    url: str = "http://127.0.0.1:5000"
+    mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    duration: float = 10.0
+    rate: Optional[float] = None         # None : boucle fermée
+    think: float = 0.0                   # pause entre requêtes (boucle fermée)
+    users: Tuple[int, int] = (1, 100)
+    products: Tuple[int, int] = (1, 1000)
+    password: str = "password123"
+    admin_email: Optional[str] = None
+    admin_password: Optional[str] = None
+    timeout: float = 30.0
+    seed: int = 42
+
+
+@dataclass
+class EndpointStats:
+    latencies: List[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: int = 0
+
+    def add(self, status: int, seconds: float) -> None:
+        self.latencies.append(seconds)
+        self.statuses[status] += 1
+        if status == 0 or status >= 400:
+            self.errors += 1
+
+    def merge(self, other: "EndpointStats") -> None:
+        self.latencies.extend(other.latencies)
+        self.statuses.update(other.statuses)
+        self.errors += other.errors
+
+    def summary(self, duration: float) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+        pick = lambda q: round(ordered[min(int(q * len(ordered)), len(ordered) - 1)] * 1000, 2)  # noqa: E731
+        count = len(ordered)
+        return {
+            "requests": count,
+            "req_s": round(count / duration, 1) if duration else 0.0,
+            "p50_ms": pick(0.50) if ordered else 0.0,
+            "p95_ms": pick(0.95) if ordered else 0.0,
+            "p99_ms": pick(0.99) if ordered else 0.0,
+            "mean_ms": round(statistics.fmean(ordered) * 1000, 2) if ordered else 0.0,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+        }
+
+
+class Client:
+    """ Un client HTTP (connexion keep-alive) et ses jetons. """
+
+    def __init__(self, options: LoadOptions, index: int,
+                 stats: Dict[str, EndpointStats], lock: threading.Lock) -> None:
+        target = urlsplit(options.url)
+        self.options = options
+        self.conn = http.client.HTTPConnection(
+            target.hostname, target.port or 80, timeout=options.timeout)
+        self.rng = random.Random(options.seed * 1_000_003 + index)
+        self.stats = stats
+        self.lock = lock
+        first, last = options.users
+        self.email = f"user{first + index % (last - first + 1)}@example.com"
+        self.token: Optional[str] = None
+        self.admin_token: Optional[str] = None
+
+    def request(self, name: str, method: str, path: str,
+                body: Optional[dict] = None, token: Optional[str] = None,
+                scheduled: Optional[float] = None) -> Tuple[int, Any]:
+        """
+        Envoie la requête et enregistre sa latence sous `name` (depuis
+        `scheduled` en boucle ouverte) ; statut 0 si erreur réseau.
+        """
+        headers = {"Accept": "application/json"}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+
+        start = time.perf_counter() if scheduled is None else scheduled
+        status, data = 0, b""
+        # Reprise réservée aux méthodes idempotentes : un POST peut avoir
+        # été traité avant la coupure (commande créée, stock réservé)
+        attempts = 2 if method in ("GET", "HEAD") else 1
+        for attempt in range(attempts):
+            try:
+                self.conn.request(method, path, body=payload, headers=headers)
+                resp = self.conn.getresponse()
+                status, data = resp.status, resp.read()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError,
+                    BrokenPipeError):
+                # Connexion keep-alive fermée par le serveur : une reprise
+                # (GET/HEAD), sinon erreur (statut 0)
+                self.conn.close()
+            except (OSError, http.client.HTTPException):
+                self.conn.close()
+                break
+        elapsed = time.perf_counter() - start
+
+        with self.lock:
+            self.stats.setdefault(name, EndpointStats()).add(status, elapsed)
+        return status, data
+
+    def login(self) -> None:
+        status, data = self.request("login", "POST", "/api/auth/login", {
+            "email": self.email, "password": self.options.password})
+        if status == 200:
+            self.token = json.loads(data)["token"]
+        if self.options.admin_email:
+            status, data = self.request("login", "POST", "/api/auth/login", {
+                "email": self.options.admin_email,
+                "password": self.options.admin_password})
+            if status == 200:
+                self.admin_token = json.loads(data)["token"]
+
+    def product_id(self) -> int:
+        return self.rng.randint(*self.options.products)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+# Scénarios : (client, arrivée prévue) -> une requête enregistrée
+def _browse(client: Client, scheduled: Optional[float]) -> None:
+    sort = client.rng.choice(("id", "nom", "prix"))
+    client.request("browse", "GET", f"/api/produits?limit=20&sort={sort}",
+                   scheduled=scheduled)
+
+
+def _detail(client: Client, scheduled: Optional[float]) -> None:
+    client.request("detail", "GET", f"/api/produits/{client.product_id()}",
+                   token=client.token, scheduled=scheduled)
+
+
+def _search(client: Client, scheduled: Optional[float]) -> None:
+    query = urlencode({"q": client.rng.choice(SEARCH_TERMS), "limit": 20})
+    client.request("search", "GET", f"/api/produits/search?{query}",
+                   scheduled=scheduled)
+
+
+def _order(client: Client, scheduled: Optional[float]) -> None:
+    lines = [{"produit_id": client.product_id(),
+              "quantite": client.rng.randint(1, 2)}
+             for _ in range(client.rng.randint(1, 3))]
+    client.request("order", "POST", "/api/commandes",
+                   {"adresse_livraison": "1 rue de la Charge",
+                    "produits": lines},
+                   token=client.token, scheduled=scheduled)
+
+
+def _admin(client: Client, scheduled: Optional[float]) -> None:
+    client.request("admin", "GET", "/api/commandes?limit=50",
+                   token=client.admin_token, scheduled=scheduled)
+
+
+SCENARIOS: Dict[str, Callable[[Client, Optional[float]], None]] = {
+    "browse": _browse, "detail": _detail, "search": _search,
+    "order": _order, "admin": _admin,
+}
+
+
+def _run_threads(options: LoadOptions, threads: int, offset: int,
+                 stride: int) -> Dict[str, Dict[str, Any]]:
+    """
+    `threads` clients d'un processus. En boucle ouverte, le processus
+    prend en charge les arrivées offset, offset + stride, ...
+    """
+    stats: Dict[str, EndpointStats] = {}
+    lock = threading.Lock()
+    names = list(options.mix)
+    weights = list(itertools.accumulate(options.mix.values()))
+    clients = [Client(options, offset + i * stride, stats, lock)
+               for i in range(threads)]
+    for client in clients:
+        client.login()
+
+    arrivals = itertools.count(offset, stride)
+    start = time.perf_counter()
+    deadline = start + options.duration
+
+    def closed_loop(client: Client) -> None:
+        while time.perf_counter() < deadline:
+            name = client.rng.choices(names, cum_weights=weights)[0]
+            SCENARIOS[name](client, None)
+            if options.think:
+                time.sleep(client.rng.expovariate(1 / options.think))
+
+    def open_loop(client: Client) -> None:
+        while True:
+            with lock:
+                scheduled = start + next(arrivals) / options.rate
+            if scheduled >= deadline:
+                return
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            name = client.rng.choices(names, cum_weights=weights)[0]
+            SCENARIOS[name](client, scheduled)
+
+    loop = closed_loop if options.rate is None else open_loop
+    workers = [threading.Thread(target=loop, args=(client,), daemon=True)
+               for client in clients]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    for client in clients:
+        client.close()
+
+    return {name: {"latencies": s.latencies, "statuses": dict(s.statuses),
+                   "errors": s.errors} for name, s in stats.items()}
+
+
+def _process_entry(args: Tuple[LoadOptions, int, int, int]
+                   ) -> Dict[str, Dict[str, Any]]:
+    return _run_threads(*args)
+
+
+def run_load(options: LoadOptions, threads: int,
+             processes: int = 1) -> Dict[str, Any]:
+    """
+    Un palier de charge : `processes` x `threads` clients pendant
+    `options.duration` secondes. Retourne le résumé global et par route
+    (la connexion initiale est comptée sous "login", hors total).
+    """
+    if processes > 1:
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(processes) as pool:
+            parts = pool.map(_process_entry, [
+                (options, threads, k, processes) for k in range(processes)])
+    else:
+        parts = [_run_threads(options, threads, 0, 1)]
+
+    merged: Dict[str, EndpointStats] = {}
+    for part in parts:
+        for name, data in part.items():
+            merged.setdefault(name, EndpointStats()).merge(EndpointStats(
+                data["latencies"], Counter(data["statuses"]), data["errors"]))
+
+    total = EndpointStats()
+    for name, stats in merged.items():
+        if name != "login":
+            total.merge(stats)
+    return {
+        "clients": threads * processes,
+        "rate": options.rate,
+        "duration_s": options.duration,
+        "total": total.summary(options.duration),
+        "endpoints": {name: stats.summary(options.duration)
+                      for name, stats in sorted(merged.items())},
+    }
+
+
+def _print_step(result: Dict[str, Any]) -> None:
+    columns = ("requests", "req_s", "p50_ms", "p95_ms", "p99_ms",
+               "error_rate")
+    label = (f"{result['rate']:g} req/s" if result["rate"]
+             else f"{result['clients']} clients")
+    print(f"\n== {label} ({result['clients']} clients, "
+          f"{result['duration_s']:g} s)")
+    print(f"{'route':<10}" + "".join(f"{c:>12}" for c in columns))
+    for name, row in [*result["endpoints"].items(), ("total", result["total"])]:
+        print(f"{name:<10}" + "".join(f"{row[c]:>12}" for c in columns))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Générateur de charge HTTP de l'API")
+    parser.add_argument("--url", default=LoadOptions.url)
+    parser.add_argument("--threads", type=int, nargs="+", default=[8],
+                        help="clients par processus (un palier par valeur)")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--rate", type=float, nargs="+", default=None,
+                        help="boucle ouverte : arrivées/s (un palier par valeur)")
+    parser.add_argument("--duration", type=float, default=LoadOptions.duration,
+                        help="durée de chaque palier (s)")
+    parser.add_argument("--think", type=float, default=0.0,
+                        help="pause moyenne entre requêtes, boucle fermée (s)")
+    parser.add_argument("--mix", default=",".join(
+        f"{k}={v}" for k, v in DEFAULT_MIX.items()))
+    parser.add_argument("--users", default="1-100",
+                        help="identifiants des utilisateurs user<N>@example.com")
+    parser.add_argument("--products", default="1-1000",
+                        help="identifiants des produits consultés/commandés")
+    parser.add_argument("--password", default=LoadOptions.password)
+    parser.add_argument("--admin-email", default=None)
+    parser.add_argument("--admin-password", default=None)
+    parser.add_argument("--seed", type=int, default=LoadOptions.seed)
+    parser.add_argument("--output", default=None,
+                        help="fichier JSON des résultats de tous les paliers")
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    if not args.admin_email and mix.pop("admin", None) is not None:
+        if not mix or sum(mix.values()) <= 0:
+            parser.error("Mélange de scénarios vide sans le scénario admin "
+                         "(--admin-email absent)")
+        print("Scénario admin ignoré (--admin-email absent)")
+
+    options = LoadOptions(
+        url=args.url, mix=mix, duration=args.duration, think=args.think,
+        users=parse_range(args.users), products=parse_range(args.products),
+        password=args.password, admin_email=args.admin_email,
+        admin_password=args.admin_password, seed=args.seed)
+
+    steps: List[Tuple[Optional[float], int]]
+    if args.rate:
+        steps = [(rate, args.threads[0]) for rate in args.rate]
+    else:
+        steps = [(None, threads) for threads in args.threads]
+
+    results = []
+    for rate, threads in steps:
+        options.rate = rate
+        result = run_load(options, threads, args.processes)
+        _print_step(result)
+        results.append(result)
+
+    if args.output:
+        Path(args.output).write_text(
+            json.dumps(results, indent=2, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
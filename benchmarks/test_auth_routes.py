@@ -0,0 +1,28 @@
+import itertools
+from typing import Dict, Tuple
+from flask.testing import FlaskClient
+from sqlalchemy.orm import Session
+from benchmarks.harness import BenchRecorder
+
+
+class TestAuthRoutes:
+
+    def test_register(self, test_client: Tuple[FlaskClient, Session],
+                      bench: BenchRecorder, bench_dataset: Dict) -> None:
+        client, _ = test_client
+        counter = itertools.count()
+        bench.measure(
+            "POST /api/auth/register",
+            lambda n: client.post("/api/auth/register", json={
+                "email": f"register{n}@bench.com", "nom": "Bench",
+                "password": "password123"}),
+            setup=lambda: next(counter), expect=201)
+
+    def test_login(self, test_client: Tuple[FlaskClient, Session],
+                   bench: BenchRecorder, bench_dataset: Dict) -> None:
+        client, _ = test_client
+        bench.measure(
+            "POST /api/auth/login",
+            lambda _: client.post("/api/auth/login", json={
+                "email": f"user{bench_dataset['first_user']}@example.com",
+                "password": "password123"}))
@@ -0,0 +1,105 @@
+import itertools
+import pytest
+from app.models import Order, Product, User
+from sqlalchemy import update
+from typing import Dict, List, Tuple
+from flask.testing import FlaskClient
+from sqlalchemy.orm import Session
+from benchmarks.harness import BenchRecorder
+
+
+@pytest.fixture
+def client_history(test_client: Tuple[FlaskClient, Session],
+                   auth_headers: Dict, bench_dataset: Dict) -> List[int]:
+    """
+    Historique de commandes du premier utilisateur généré transféré au
+    client authentifié ; produits commandables à stock illimité.
+    """
+    _, session = test_client
+    client = session.query(User).filter_by(email="client@test.com").one()
+    session.execute(update(Order)
+                    .where(Order.utilisateur_id == bench_dataset["first_user"])
+                    .values(utilisateur_id=client.id))
+    first = bench_dataset["first_product"]
+    products = list(range(first, first + 10))
+    session.execute(update(Product).where(Product.id.in_(products))
+                    .values(quantite_stock=10 ** 9))
+    session.commit()
+    return products
+
+
+def order_body(products: List[int], n: int) -> Dict:
+    return {"adresse_livraison": f"{n} rue du benchmark",
+            "produits": [{"produit_id": products[(n + i) % len(products)],
+                          "quantite": 1} for i in range(3)]}
+
+
+class TestOrderRoutes:
+
+    def test_list_orders(self, test_client: Tuple[FlaskClient, Session],
+                         bench: BenchRecorder, auth_headers: Dict,
+                         client_history: List[int]) -> None:
+        client, _ = test_client
+        bench.measure("GET /api/commandes (admin)",
+                      lambda _: client.get("/api/commandes",
+                                           headers=auth_headers["admin"]))
+        bench.measure("GET /api/commandes (client)",
+                      lambda _: client.get("/api/commandes",
+                                           headers=auth_headers["client"]))
+        bench.measure("GET /api/commandes?statut",
+                      lambda _: client.get("/api/commandes?statut=Validée",
+                                           headers=auth_headers["admin"]))
+
+    def test_order_detail(self, test_client: Tuple[FlaskClient, Session],
+                          bench: BenchRecorder, bench_dataset: Dict,
+                          auth_headers: Dict) -> None:
+        client, _ = test_client
+        first = bench_dataset["first_order"]
+        ids = itertools.cycle(range(first, first + 100))
+        bench.measure("GET /api/commandes/{id}",
+                      lambda oid: client.get(f"/api/commandes/{oid}",
+                                             headers=auth_headers["admin"]),
+                      setup=lambda: next(ids))
+        bench.measure("GET /api/commandes/{id}/lignes",
+                      lambda oid: client.get(f"/api/commandes/{oid}/lignes"),
+                      setup=lambda: next(ids))
+        statuses = itertools.cycle(Order.STATUS)
+        bench.measure("PATCH /api/commandes/{id}",
+                      lambda oid: client.patch(
+                          f"/api/commandes/{oid}", headers=auth_headers["admin"],
+                          json={"statut": next(statuses)}),
+                      setup=lambda: next(ids))
+
+    def test_create_orders(self, test_client: Tuple[FlaskClient, Session],
+                           bench: BenchRecorder, auth_headers: Dict,
+                           client_history: List[int]) -> None:
+        client, _ = test_client
+        headers = auth_headers["client"]
+        counter = itertools.count()
+        bench.measure(
+            "POST /api/commandes",
+            lambda n: client.post("/api/commandes", headers=headers,
+                                  json=order_body(client_history, n)),
+            setup=lambda: next(counter), expect=201)
+        bench.measure(
+            "POST /api/commandes/batch (10)",
+            lambda n: client.post("/api/commandes/batch", headers=headers,
+                                  json={"commandes": [
+                                      order_body(client_history, n + i)
+                                      for i in range(10)]}),
+            setup=lambda: next(counter), expect=201)
+
+    def test_exports(self, test_client: Tuple[FlaskClient, Session],
+                     bench: BenchRecorder, bench_dataset: Dict,
+                     auth_headers: Dict) -> None:
+        client, _ = test_client
+        repeat = max(bench.repeat // 10, 3)
+        bench.measure("GET /api/commandes/export",
+                      lambda _: client.get("/api/commandes/export?format=csv",
+                                           headers=auth_headers["admin"]),
+                      repeat=repeat)
+        bench.measure("GET /api/commandes/lignes/export",
+                      lambda _: client.get(
+                          "/api/commandes/lignes/export?format=csv",
+                          headers=auth_headers["admin"]),
+                      repeat=repeat)
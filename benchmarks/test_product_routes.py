@@ -0,0 +1,90 @@
+import itertools
+import json
+from app.services.product_services import add_product
+from typing import Dict, Tuple
+from flask.testing import FlaskClient
+from sqlalchemy.orm import Session
+from benchmarks.harness import BenchRecorder
+
+
+class TestProductRoutes:
+
+    def test_catalog_pages(self, test_client: Tuple[FlaskClient, Session],
+                           bench: BenchRecorder, bench_dataset: Dict) -> None:
+        client, _ = test_client
+        bench.measure("GET /api/produits",
+                      lambda _: client.get("/api/produits"))
+        bench.measure("GET /api/produits?limit=1000",
+                      lambda _: client.get("/api/produits?limit=1000"))
+
+    def test_search(self, test_client: Tuple[FlaskClient, Session],
+                    bench: BenchRecorder, bench_dataset: Dict) -> None:
+        client, _ = test_client
+        bench.measure("GET /api/produits/search?categorie",
+                      lambda _: client.get("/api/produits/search?categorie=Cat 7"))
+        bench.measure("GET /api/produits/search?disponible",
+                      lambda _: client.get("/api/produits/search?disponible=true"))
+        bench.measure("GET /api/produits/search?q",
+                      lambda _: client.get("/api/produits/search?q=Produit 42"))
+
+    def test_get_product(self, test_client: Tuple[FlaskClient, Session],
+                         bench: BenchRecorder, bench_dataset: Dict,
+                         auth_headers: Dict) -> None:
+        client, _ = test_client
+        ids = itertools.cycle(range(bench_dataset["first_product"],
+                                    bench_dataset["first_product"] + 100))
+        bench.measure("GET /api/produits/{id}",
+                      lambda pid: client.get(f"/api/produits/{pid}",
+                                             headers=auth_headers["client"]),
+                      setup=lambda: next(ids))
+
+    def test_write_routes(self, test_client: Tuple[FlaskClient, Session],
+                          bench: BenchRecorder, bench_dataset: Dict,
+                          auth_headers: Dict) -> None:
+        client, session = test_client
+        admin = auth_headers["admin"]
+        counter = itertools.count()
+
+        bench.measure(
+            "POST /api/produits",
+            lambda n: client.post("/api/produits", headers=admin, json={
+                "nom": f"Nouveau {n}", "description": "Bench",
+                "categorie": "Bench", "prix": 10.0, "quantite_stock": 5}),
+            setup=lambda: next(counter), expect=201)
+
+        product_id = bench_dataset["first_product"]
+        bench.measure(
+            "PUT /api/produits/{id}",
+            lambda n: client.put(f"/api/produits/{product_id}", headers=admin,
+                                 json={"prix": 10.0 + n}),
+            setup=lambda: next(counter))
+
+        def new_product() -> int:
+            return add_product(session, nom=f"A supprimer {next(counter)}",
+                               description="Bench", categorie="Bench",
+                               prix=1.0, quantite_stock=1).id
+
+        bench.measure(
+            "DELETE /api/produits/{id}",
+            lambda pid: client.delete(f"/api/produits/{pid}", headers=admin),
+            setup=new_product)
+
+    def test_import_export(self, test_client: Tuple[FlaskClient, Session],
+                           bench: BenchRecorder, bench_dataset: Dict,
+                           auth_headers: Dict) -> None:
+        client, _ = test_client
+        admin = auth_headers["admin"]
+        body = "\n".join(json.dumps({
+            "nom": f"Import {i}", "description": "Bench", "categorie": "Bench",
+            "prix": 5.0, "quantite_stock": i}) for i in range(500))
+
+        bench.measure(
+            "POST /api/produits/import (500 lignes)",
+            lambda _: client.post("/api/produits/import", headers=admin,
+                                  data=body,
+                                  content_type="application/x-ndjson"))
+        bench.measure(
+            "GET /api/produits/export",
+            lambda _: client.get("/api/produits/export?format=ndjson",
+                                 headers=admin),
+            repeat=max(bench.repeat // 10, 3))
@@ -17,12 +17,98 @@ class Config:
         )
     TESTING = False
     DEBUG = False
+    LOG_LEVEL = "INFO"
+
+    # Moteur SQLite : pragmas appliqués à chaque connexion du pool
+    SQLITE_PRAGMAS = {
+        "busy_timeout": 5000,               # ms d'attente d'un verrou
+        "journal_mode": "WAL",              # lectures non bloquées (écriture)
+        "synchronous": "NORMAL",            # sûr en WAL, fsync au checkpoint
+        "cache_size": -16000,               # Ko (négatif) : 16 Mo/connexion
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    }
+    DB_POOL = {"pool_size": 5, "max_overflow": 10, "pool_timeout": 30}
+
+    # Métriques Prometheus (GET /metrics)
+    METRICS_ENABLED = True
+    # Plusieurs workers : répertoire partagé des instantanés par process
+    METRICS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    METRICS_FLUSH_INTERVAL = 5              # secondes
+
+    # Validation spectree des réponses (requêtes toujours validées)
+    RESPONSE_VALIDATION_SAMPLE_RATE = 1.0   # part des réponses validées
+    RESPONSE_VALIDATION_STRICT = True       # non conforme -> 500 (sinon log)
+
+    # Documentation OpenAPI (/apidoc) : rendue une fois, servie pré-encodée
+    # Document généré au build (python -m app.cli.openapi -o ...), sinon
+    # rendu au premier accès
+    OPENAPI_DOCUMENT_PATH = os.getenv("OPENAPI_DOCUMENT_PATH")
+    OPENAPI_CACHE_CONTROL = "public, max-age=300"   # + ETag (revalidation)
+
+    # Instrumentation par requête (en-tête Server-Timing, détection N+1)
+    SQL_INSTRUMENTATION = False
+    SQL_INSTRUMENTATION_LOG = False         # log structuré par requête
+    SQL_N_PLUS_ONE_THRESHOLD = 10           # même requête répétée au-delà
+
+    # Cache catalogue en mémoire (GET /api/produits, /api/produits/search)
+    CATALOG_CACHE_ENABLED = True
+    CATALOG_CACHE_TTL = 30                  # secondes (fraîcheur)
+    CATALOG_CACHE_STALE_TTL = 120           # secondes (stale-while-revalidate)
+    CATALOG_CACHE_MAX_BYTES = 32 * 1024 * 1024
+    CATALOG_CACHE_MAX_ENTRIES = 2048
+    # Écritures des autres workers visibles après ce délai au plus
+    CATALOG_CACHE_VERSION_CHECK = 1         # secondes
+
+    # En-têtes HTTP de cache (clients/CDN) des endpoints catalogue
+    CATALOG_CACHE_CONTROL = "public, max-age=30, stale-while-revalidate=120"
+    PRODUCT_CACHE_CONTROL = "private, no-cache"     # route authentifiée
+    SURROGATE_KEY_HEADER = "Surrogate-Key"          # "Cache-Tag" (Cloudflare)
+    SURROGATE_CONTROL = None                        # ex. "max-age=300"
+
+    # Compression des réponses (Accept-Encoding : gzip, deflate)
+    COMPRESSION_ENABLED = True
+    COMPRESSION_ENCODINGS = ["gzip", "deflate"]     # ordre de préférence
+    COMPRESSION_LEVEL = 6                   # zlib 1 (rapide) à 9
+    COMPRESSION_MIN_SIZE = 1024             # octets, en deçà non compressé
+    COMPRESSION_MIMETYPES = {"application/json", "application/x-ndjson",
+                             "text/csv", "text/plain", "text/html"}
+
+    # Authentification : tokens vérifiés et identités en cache (par process)
+    AUTH_TOKEN_CACHE_SIZE = 10000           # 0 = désactivé
+    AUTH_PRINCIPAL_CACHE_SIZE = 10000
+    AUTH_PRINCIPAL_TTL = 60                 # secondes, 0 = désactivé
+
+    # Mots de passe : hachage dans un pool de processus, coût calibré
+    PASSWORD_HASH_METHOD = "scrypt"         # ou "pbkdf2:sha256"
+    PASSWORD_HASH_CALIBRATE = True          # coût ajusté en tâche de fond
+    PASSWORD_HASH_TARGET_MS = 250           # latence visée par hachage
+    PASSWORD_HASH_MAX_MEMORY_MB = 64        # scrypt : plafond par hachage
+    PASSWORD_HASH_WORKERS = 2               # 0 = dans le thread de requête
+    PASSWORD_HASH_QUEUE = 32                # demandes en attente avant 503
+    PASSWORD_HASH_TIMEOUT = 5               # secondes
+
+    # Serveur ASGI (app/asgi.py) : requêtes traitées simultanément
+    ASGI_THREADS = 8                        # <= pool_size + max_overflow
+
+    # Import catalogue (POST /api/produits/import)
+    PRODUCT_IMPORT_CHUNK_SIZE = 500         # lignes validées/écrites par lot
+    PRODUCT_IMPORT_MAX_ERRORS = 100         # erreurs détaillées (rapport)
 
 
 class TestConfig(Config):
     DATABASE_URL = "sqlite:///:memory:"
+    SQLITE_PRAGMAS = {}
+    DB_POOL = {}
+    SQL_INSTRUMENTATION = True
     DEBUG = True
     TESTING = True
+    # Données modifiées hors services dans les fixtures
+    CATALOG_CACHE_ENABLED = False
+    AUTH_PRINCIPAL_TTL = 0
+    PASSWORD_HASH_METHOD = "pbkdf2:sha256:1000"
+    PASSWORD_HASH_CALIBRATE = False
+    PASSWORD_HASH_WORKERS = 0
 
 
 class DevConfig(Config):
@@ -34,6 +120,7 @@ class DevConfig(Config):
         )
     DEBUG = True
     TESTING = True
+    SQL_INSTRUMENTATION = True
 
 
 class ProdConfig(Config):
@@ -43,6 +130,14 @@ class ProdConfig(Config):
         )
     JWT_KEY = os.getenv("JWT_KEY", "secret")
     DEBUG = False
+    SQLITE_PRAGMAS = {
+        **Config.SQLITE_PRAGMAS,
+        "cache_size": -64000,               # 64 Mo par connexion
+        "mmap_size": 256 * 1024 * 1024,
+    }
+    DB_POOL = {"pool_size": 8, "max_overflow": 8, "pool_timeout": 10}
+    RESPONSE_VALIDATION_SAMPLE_RATE = 0.05
+    RESPONSE_VALIDATION_STRICT = False
 
 
 CONFIG_MAP = {
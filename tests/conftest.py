@@ -1,8 +1,9 @@
 import os
 import pytest
 from flask import g
+from sqlalchemy import event
 from sqlalchemy.orm import Session
-from app.database.base import SessionLocal
+from app.database.base import SessionLocal, engine
 from app.models import User, Product, Order, OrderItem
 from app.core.auth_utils import generate_token
 from werkzeug.security import generate_password_hash
@@ -13,6 +14,8 @@ from flask.testing import FlaskClient
 from typing import Tuple, Generator, List, Dict, Any
 from app import create_app
 from app.database.db_manager import DatabaseManager
+from app.core.cache import catalog_cache, CatalogCache
+from app.core.auth_cache import token_cache, principal_cache, PrincipalCache
 
 
 # Force TestConfig à la creation de app
@@ -177,6 +180,58 @@ def feed_order(test_client, client_token, feed_product) -> Dict[str, Any]:
         }
 
 
+@pytest.fixture(scope="function")
+def query_counter() -> Generator[List[str], None, None]:
+    """
+    Enregistre les requêtes SQL émises par l'engine pendant le test.
+
+    Retourne la liste (mutable) des statements exécutés ; la vider
+    avant l'appel mesuré permet de compter les requêtes d'une route.
+    """
+    statements: List[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture(scope="function")
+def enable_catalog_cache() -> Generator[CatalogCache, None, None]:
+    """
+    Active le cache catalogue (désactivé par TestConfig) le temps du test,
+    puis le vide et restaure son état.
+    """
+    enabled, version_check = catalog_cache.enabled, catalog_cache.version_check
+    catalog_cache.invalidate()
+    catalog_cache.enabled = True
+    catalog_cache.version_check = 0
+    yield catalog_cache
+
+    catalog_cache.enabled = enabled
+    catalog_cache.version_check = version_check
+    catalog_cache.invalidate()
+
+
+@pytest.fixture(scope="function")
+def enable_auth_cache() -> Generator[PrincipalCache, None, None]:
+    """
+    Active le cache des identités (désactivé par TestConfig) le temps
+    du test, puis vide les caches d'authentification.
+    """
+    ttl = principal_cache.ttl
+    token_cache.clear()
+    principal_cache.clear()
+    principal_cache.ttl = 60
+    yield principal_cache
+
+    principal_cache.ttl = ttl
+    token_cache.clear()
+    principal_cache.clear()
+
+
 # @pytest.fixture(scope="function")
 # def visitor_only(test_client):
 #     """
@@ -0,0 +1,108 @@
+import gzip
+import json
+import zlib
+from app.core.compression import compress_stream
+from flask.testing import FlaskClient
+from sqlalchemy.orm import Session
+from typing import Generator, Tuple
+import pytest
+
+
+@pytest.fixture
+def small_min_size(setup_db) -> Generator[None, None, None]:
+    """ Seuil de compression abaissé (jeux de données de test réduits). """
+    app, _ = setup_db
+    min_size = app.config["COMPRESSION_MIN_SIZE"]
+    app.config["COMPRESSION_MIN_SIZE"] = 256
+    yield
+    app.config["COMPRESSION_MIN_SIZE"] = min_size
+
+
+class TestCompression:
+
+    def test_catalog_gzip_negotiated(
+            self, test_client: Tuple[FlaskClient, Session],
+            feed_product: list, small_min_size) -> None:
+        client, _ = test_client
+
+        plain = client.get("/api/produits")
+        assert "Content-Encoding" not in plain.headers
+        assert "Accept-Encoding" in plain.headers["Vary"]
+
+        resp = client.get("/api/produits",
+                          headers={"Accept-Encoding": "br, gzip;q=0.8"})
+        assert resp.status_code == 200
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in resp.headers["Vary"]
+        assert json.loads(gzip.decompress(resp.data)) == plain.get_json()
+
+        # ETag propre à la variante compressée, 304 sur la même variante
+        etag = resp.headers["ETag"]
+        assert etag == plain.headers["ETag"][:-1] + '-gzip"'
+        resp = client.get("/api/produits", headers={
+            "Accept-Encoding": "gzip", "If-None-Match": etag})
+        assert resp.status_code == 304
+
+    def test_deflate_and_small_bodies(
+            self, test_client: Tuple[FlaskClient, Session],
+            feed_product: list, small_min_size) -> None:
+        client, _ = test_client
+
+        resp = client.get("/api/produits", headers={
+            "Accept-Encoding": "gzip;q=0, deflate"})
+        assert resp.headers["Content-Encoding"] == "deflate"
+        assert json.loads(zlib.decompress(resp.data))
+
+        resp = client.get("/api/produits", headers={"Accept-Encoding": "br"})
+        assert "Content-Encoding" not in resp.headers
+
+        # Corps sous le seuil : non compressé
+        resp = client.get("/api/produits?limit=1",
+                          headers={"Accept-Encoding": "gzip"})
+        assert len(resp.data) < 256
+        assert "Content-Encoding" not in resp.headers
+
+    def test_compressed_variant_cached(
+            self, test_client: Tuple[FlaskClient, Session],
+            feed_product: list, small_min_size, enable_catalog_cache) -> None:
+        client, _ = test_client
+        headers = {"Accept-Encoding": "gzip"}
+
+        first = client.get("/api/produits", headers=headers)
+        size = enable_catalog_cache.size
+        second = client.get("/api/produits", headers=headers)
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.data == first.data
+        # Variante compressée conservée (et comptée) avec l'entrée
+        assert size >= len(gzip.decompress(first.data)) + len(first.data)
+        assert enable_catalog_cache.size == size
+
+    def test_export_streamed_compressed(
+            self, test_client: Tuple[FlaskClient, Session], admin_token: str,
+            feed_product: list) -> None:
+        client, _ = test_client
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        url = "/api/produits/export?format=ndjson&batch_size=2"
+
+        plain = client.get(url, headers=headers).data
+        resp = client.get(url, headers={**headers, "Accept-Encoding": "gzip"},
+                          buffered=False)
+        assert resp.is_streamed
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert "Content-Length" not in resp.headers
+
+        # Un morceau compressé (décodable) par lot, sans attendre la fin
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        chunks = [decoder.decompress(chunk) for chunk in resp.response]
+        assert len([c for c in chunks if c]) >= 2
+        assert all(c.endswith(b"\n") for c in chunks if c)
+        assert b"".join(chunks) == plain
+        resp.close()
+
+    def test_compress_stream_flushes_each_chunk(self) -> None:
+        stream = compress_stream(iter(["a" * 100, "b" * 100]), "gzip", 6)
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        assert decoder.decompress(next(stream)) == b"a" * 100
+        assert decoder.decompress(next(stream)) == b"b" * 100
+        decoder.decompress(b"".join(stream))
+        assert decoder.eof
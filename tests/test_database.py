@@ -0,0 +1,313 @@
+from app.database.base import Base, build_engine, engine_settings
+from app.database.db_manager import DatabaseManager, MIGRATIONS
+from app.database.fts import drop_product_fts, has_product_fts
+from app.cli.seed import seed_command
+from app.models import Order, OrderItem, Product, User
+from app.services.seeding import SeedProfile, seed_database
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine, event, func, inspect, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from pathlib import Path
+import json
+import os
+import pytest
+import subprocess
+import sys
+import threading
+from config import Config, ProdConfig
+
+
+HOT_PATH_INDEXES = {
+    "order": {"ix_order_utilisateur_id", "ix_order_date_commande"},
+    "order_item": {"ix_order_item_commande_id", "ix_order_item_produit_id"},
+    "product": {"ix_product_categorie"},
+}
+
+
+@pytest.fixture
+def legacy_engine(tmp_path: Path) -> Engine:
+    """
+    Base existante créée par l'ancien `create_all` (sans index ni version),
+    contenant déjà un produit.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for indexes in HOT_PATH_INDEXES.values():
+            for name in indexes:
+                conn.execute(text(f"DROP INDEX {name}"))
+        conn.execute(text(
+            "INSERT INTO product (nom, description, categorie, prix, quantite_stock) "
+            "VALUES ('Clavier', 'Sans fil', 'Bureau', 20.0, 3)"
+        ))
+    yield engine
+    engine.dispose()
+
+
+class TestMigrations:
+
+    def test_upgrade_legacy_database(self, legacy_engine: Engine) -> None:
+        db_manager = DatabaseManager(engine=legacy_engine)
+        assert db_manager.current_version() == 0
+        assert len(db_manager.pending()) == len(MIGRATIONS)
+
+        assert db_manager.migrate() == [m.version for m in MIGRATIONS]
+        assert db_manager.current_version() == MIGRATIONS[-1].version
+        assert db_manager.pending() == []
+
+        inspector = inspect(legacy_engine)
+        for table, expected in HOT_PATH_INDEXES.items():
+            names = {index["name"] for index in inspector.get_indexes(table)}
+            assert expected <= names
+
+        # Données existantes conservées et indexées (FTS)
+        with legacy_engine.connect() as conn:
+            assert conn.execute(text(
+                "SELECT rowid FROM product_fts WHERE product_fts MATCH 'clavier'"
+            )).all() == [(1,)]
+
+        # Rejouer ne fait rien
+        assert db_manager.migrate() == []
+
+    def test_upgrade_to_target(self, legacy_engine: Engine) -> None:
+        db_manager = DatabaseManager(engine=legacy_engine)
+
+        assert db_manager.migrate(target=1) == [1]
+        assert db_manager.current_version() == 1
+        assert [m.version for m in db_manager.pending()] == [
+            m.version for m in MIGRATIONS[1:]]
+
+        assert db_manager.migrate() == [m.version for m in MIGRATIONS[1:]]
+
+    def test_up_to_date_schema_skips_ddl(self, legacy_engine: Engine) -> None:
+        db_manager = DatabaseManager(engine=legacy_engine)
+        db_manager.migrate()
+
+        statements = []
+        event.listen(legacy_engine, "before_cursor_execute",
+                     lambda conn, cursor, sql, *args: statements.append(sql))
+        assert db_manager.migrate() == []
+        # Démarrage : lecture de la version seule (ni create_all, ni
+        # transaction par migration)
+        assert len(statements) == 2
+        assert not [s for s in statements if "CREATE" in s.upper()]
+
+    def test_concurrent_upgrades(self, tmp_path: Path) -> None:
+        # Plusieurs processus migrant la même base au même moment
+        engines = [create_engine(f"sqlite:///{tmp_path / 'shared.db'}")
+                   for _ in range(4)]
+        barrier = threading.Barrier(len(engines))
+        applied, errors = [], []
+
+        def upgrade(engine: Engine) -> None:
+            barrier.wait()
+            try:
+                applied.extend(DatabaseManager(engine=engine).migrate())
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=upgrade, args=(engine,))
+                   for engine in engines]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            for engine in engines:
+                engine.dispose()
+
+        assert errors == []
+        assert sorted(applied) == [m.version for m in MIGRATIONS]
+
+    def test_fresh_database_matches_models(self, tmp_path: Path,
+                                           legacy_engine: Engine) -> None:
+        # Base neuve (DDL figé des migrations) == base créée par les modèles
+        fresh = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+        DatabaseManager(engine=fresh).migrate()
+        DatabaseManager(engine=legacy_engine).migrate()
+        try:
+            for engine in (fresh, legacy_engine):
+                inspector = inspect(engine)
+                for table in Base.metadata.sorted_tables:
+                    columns = {(c["name"], str(c["type"]), c["nullable"])
+                               for c in inspector.get_columns(table.name)}
+                    assert columns == {(c.name, str(c.type), c.nullable)
+                                       for c in table.columns}
+                    indexes = {(i["name"], bool(i["unique"]))
+                               for i in inspector.get_indexes(table.name)}
+                    assert indexes >= {(i.name, bool(i.unique))
+                                       for i in table.indexes}
+        finally:
+            fresh.dispose()
+
+    def test_missing_fulltext_index_recreated(
+            self, legacy_engine: Engine) -> None:
+        DatabaseManager(engine=legacy_engine).migrate()
+        # Index absent malgré la migration 3 (FTS5 indisponible à l'époque)
+        drop_product_fts(legacy_engine)
+
+        with Session(legacy_engine) as session:
+            assert has_product_fts(session)
+        with legacy_engine.connect() as conn:
+            assert conn.execute(text(
+                "SELECT rowid FROM product_fts WHERE product_fts MATCH 'clavier'"
+            )).all() == [(1,)]
+
+    def test_test_database_up_to_date(self, setup_db) -> None:
+        assert DatabaseManager().pending() == []
+
+
+class TestEngineProfile:
+
+    def test_pragmas_applied_to_pooled_connections(
+            self, tmp_path: Path) -> None:
+        engine = build_engine(f"sqlite:///{tmp_path / 'prod.db'}",
+                              ProdConfig.SQLITE_PRAGMAS, ProdConfig.DB_POOL)
+        settings = engine_settings(engine)
+        assert settings["journal_mode"] == "wal"
+        assert settings["synchronous"] == 1            # NORMAL
+        assert settings["busy_timeout"] == 5000
+        assert settings["cache_size"] == -64000
+        assert settings["temp_store"] == 2             # MEMORY
+        assert settings["pool_size"] == ProdConfig.DB_POOL["pool_size"]
+
+        # Seconde connexion simultanée du pool : même profil
+        with engine.connect() as c1, engine.connect() as c2:
+            for conn in (c1, c2):
+                assert conn.exec_driver_sql(
+                    "PRAGMA busy_timeout").scalar() == 5000
+        engine.dispose()
+
+    def test_writer_not_blocked_by_reader(self, tmp_path: Path) -> None:
+        pragmas = {**Config.SQLITE_PRAGMAS, "busy_timeout": 100}
+        engine = build_engine(f"sqlite:///{tmp_path / 'wal.db'}",
+                              pragmas, Config.DB_POOL)
+        Base.metadata.create_all(bind=engine)
+        insert = ("INSERT INTO product (nom, description, categorie, prix, "
+                  "quantite_stock) VALUES (?, '', 'Bureau', 9.0, 1)")
+        with engine.begin() as conn:
+            conn.exec_driver_sql(insert, [("Souris",), ("Clavier",)])
+
+        with engine.connect() as reader, engine.connect() as writer:
+            # Lecture en cours (verrou partagé) : commit de l'écriture
+            # possible en WAL ("database is locked" en mode rollback)
+            rows = reader.exec_driver_sql("SELECT nom FROM product")
+            rows.fetchone()
+            writer.exec_driver_sql(insert, [("Ecran",)])
+            writer.commit()
+            rows.close()
+            assert reader.exec_driver_sql(
+                "SELECT count(*) FROM product").scalar() == 3
+        engine.dispose()
+
+    def test_invalid_profile(self) -> None:
+        with pytest.raises(ValueError):
+            build_engine("sqlite:///:memory:", {"foreign_keys": "ON"})
+
+        # Base en mémoire : pas de dimensionnement de pool
+        engine = build_engine("sqlite:///:memory:", {"temp_store": "MEMORY"},
+                              Config.DB_POOL)
+        assert engine_settings(engine)["pool"] == "SingletonThreadPool"
+
+
+@pytest.fixture
+def seed_engine(tmp_path: Path) -> Engine:
+    engine = create_engine(f"sqlite:///{tmp_path / 'seed.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+class TestSeeding:
+    PROFILE = dict(users=50, products=500, orders=2000, batch_size=700)
+
+    def _dump(self, engine: Engine) -> list:
+        """ Contenu des tables, dates comprises. """
+        with engine.connect() as conn:
+            return [[tuple(row)
+                     for row in conn.execute(select(model.__table__).order_by(
+                         *model.__table__.primary_key.columns))]
+                    for model in (User, Product, Order, OrderItem)]
+
+    def test_counts_and_determinism(self, tmp_path: Path,
+                                    seed_engine: Engine) -> None:
+        with seed_engine.begin() as conn:
+            report = seed_database(conn, SeedProfile(**self.PROFILE), "hash")
+        assert (report.users, report.products, report.orders) == (50, 500, 2000)
+        assert report.first_user == report.first_product == 1
+
+        with seed_engine.connect() as conn:
+            assert conn.execute(select(func.count()).select_from(
+                OrderItem.__table__)).scalar() == report.order_items
+            assert report.orders <= report.order_items <= report.orders * 5
+
+        # Même graine sur une autre base : données identiques (dates comprises)
+        other = create_engine(f"sqlite:///{tmp_path / 'other.db'}")
+        Base.metadata.create_all(bind=other)
+        with other.begin() as conn:
+            seed_database(conn, SeedProfile(**self.PROFILE), "hash")
+        assert self._dump(seed_engine) == self._dump(other)
+        other.dispose()
+
+    def test_appends_after_existing_ids(self, seed_engine: Engine) -> None:
+        with seed_engine.begin() as conn:
+            seed_database(conn, SeedProfile(**self.PROFILE), "hash")
+        with seed_engine.begin() as conn:
+            report = seed_database(conn, SeedProfile(**self.PROFILE), "hash")
+        assert report.first_user == 51 and report.first_order == 2001
+
+    def test_dates_from_base_date(self, seed_engine: Engine) -> None:
+        base = datetime(2024, 6, 30)
+        profile = SeedProfile(**self.PROFILE, days=30,
+                              base_date=base.replace(tzinfo=timezone.utc))
+        with seed_engine.begin() as conn:
+            seed_database(conn, profile, "hash")
+        with seed_engine.connect() as conn:
+            first, last = conn.execute(select(
+                func.min(Order.__table__.c.date_commande),
+                func.max(Order.__table__.c.date_commande))).one()
+            joined = set(conn.execute(
+                select(User.__table__.c.date_creation)).scalars())
+        assert first == base - timedelta(days=30)
+        assert first < last < base
+        assert joined == {base - timedelta(days=30)}
+
+    def test_status_mix_and_popularity_skew(self,
+                                            seed_engine: Engine) -> None:
+        profile = SeedProfile(**self.PROFILE, popularity_skew=1.2,
+                              status_mix={"Expédiée": 3, "Annulée": 1})
+        with seed_engine.begin() as conn:
+            seed_database(conn, profile, "hash")
+        with seed_engine.connect() as conn:
+            statuses = Counter(conn.execute(
+                select(Order.__table__.c.statut)).scalars())
+            per_product = Counter(conn.execute(
+                select(OrderItem.__table__.c.produit_id)).scalars())
+        assert set(statuses) == {"Expédiée", "Annulée"}
+        assert 2 < statuses["Expédiée"] / statuses["Annulée"] < 4.5
+
+        # Zipf : les 10 produits les plus vendus (2 %) dépassent 20 % des lignes
+        top = sum(count for _, count in per_product.most_common(10))
+        assert top > 0.2 * sum(per_product.values())
+
+    def test_module_entry_point_on_fresh_database(self,
+                                                  tmp_path: Path) -> None:
+        # python -m : tables créées par create_app (base vierge)
+        proc = subprocess.run(
+            [sys.executable, "-m", "app.cli.seed", "--users", "3",
+             "--products", "5", "--orders", "4"],
+            capture_output=True, text=True, env={
+                **os.environ, "FLASK_ENV": "dev",
+                "DATABASE_URL": f"sqlite:///{tmp_path / 'fresh.db'}"})
+        assert proc.returncode == 0, proc.stderr[-2000:]
+        assert json.loads(proc.stdout)["orders"] == 4
+
+    def test_cli_rejects_unknown_status(self, setup_db) -> None:
+        app, _ = setup_db
+        result = app.test_cli_runner().invoke(
+            seed_command, ["--status-mix", "Perdue=1"])
+        assert result.exit_code == 2
+        assert "Statut inconnu" in result.output
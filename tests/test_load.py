@@ -0,0 +1,115 @@
+import http.client
+import threading
+from flask import Flask, request
+from werkzeug.serving import make_server
+from benchmarks.load import (
+    Client, LoadOptions, main, parse_mix, run_load
+)
+from typing import Dict, Generator
+import pytest
+
+
+@pytest.fixture
+def stub_server() -> Generator[Dict, None, None]:
+    """ Serveur HTTP minimal imitant les routes utilisées par la charge. """
+    app = Flask(__name__)
+    seen: Dict = {"tokens": set(), "orders": 0}
+
+    @app.post("/api/auth/login")
+    def login():
+        email = request.json["email"]
+        if request.json["password"] != "password123":
+            return {"error": "Identifiants invalides"}, 401
+        return {"token": f"token-{email}"}
+
+    @app.get("/api/produits")
+    @app.get("/api/produits/search")
+    def products():
+        return [{"id": 1}]
+
+    @app.get("/api/produits/<int:id>")
+    def product(id: int):
+        seen["tokens"].add(request.headers.get("Authorization"))
+        return {"id": id}
+
+    @app.post("/api/commandes")
+    def order():
+        seen["orders"] += 1
+        return {"message": "ok"}, 201 if request.headers.get(
+            "Authorization") else 401
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield {"url": f"http://127.0.0.1:{server.server_port}", "seen": seen}
+    server.shutdown()
+
+
+class TestLoadGenerator:
+
+    def test_parse_mix(self) -> None:
+        assert parse_mix("browse=3, order=1") == {"browse": 3, "order": 1}
+        with pytest.raises(ValueError):
+            parse_mix("checkout=1")
+        with pytest.raises(ValueError):
+            parse_mix("browse=0")
+
+    @pytest.mark.parametrize("mix", ["admin=5", "admin=5,browse=0"])
+    def test_admin_only_mix_rejected(self, mix: str, monkeypatch,
+                                     capsys) -> None:
+        monkeypatch.setattr("sys.argv", ["load.py", "--mix", mix])
+        with pytest.raises(SystemExit) as exc:
+            main()
+        assert exc.value.code == 2
+        assert "--admin-email absent" in capsys.readouterr().err
+
+    def test_retry_only_idempotent_requests(self) -> None:
+        sent = []
+
+        class DroppedConnection:
+            """ Connexion keep-alive coupée après chaque envoi. """
+            def request(self, method, path, **kwargs):
+                sent.append(method)
+
+            def getresponse(self):
+                raise http.client.RemoteDisconnected("fermée")
+
+            def close(self):
+                pass
+
+        stats: Dict = {}
+        client = Client(LoadOptions(), 0, stats, threading.Lock())
+        client.conn = DroppedConnection()
+        assert client.request("order", "POST", "/api/commandes", {})[0] == 0
+        assert sent == ["POST"]
+        assert client.request("browse", "GET", "/api/produits")[0] == 0
+        assert sent == ["POST", "GET", "GET"]
+        assert stats["order"].errors == stats["browse"].errors == 1
+
+    def test_closed_loop_report(self, stub_server: Dict) -> None:
+        options = LoadOptions(url=stub_server["url"], duration=0.5,
+                              mix={"browse": 1, "detail": 1, "order": 1},
+                              users=(1, 3))
+        result = run_load(options, threads=3)
+
+        endpoints = result["endpoints"]
+        assert set(endpoints) == {"login", "browse", "detail", "order"}
+        assert endpoints["login"]["requests"] == 3
+        assert endpoints["order"]["statuses"] == {
+            "201": stub_server["seen"]["orders"]}
+        assert result["total"]["error_rate"] == 0.0
+        assert result["total"]["requests"] == sum(
+            endpoints[n]["requests"] for n in ("browse", "detail", "order"))
+        # Un jeton par client (user1..user3)
+        assert stub_server["seen"]["tokens"] == {
+            f"Bearer token-user{i}@example.com" for i in (1, 2, 3)}
+
+    def test_open_loop_fixed_rate(self, stub_server: Dict) -> None:
+        options = LoadOptions(url=stub_server["url"], duration=1.0, rate=40,
+                              mix={"browse": 1}, password="faux")
+        result = run_load(options, threads=4)
+
+        # Arrivées planifiées indépendamment des réponses : 40/s pendant 1 s
+        assert result["total"]["requests"] == 40
+        assert result["endpoints"]["login"]["error_rate"] == 1.0
+        assert result["total"]["error_rate"] == 0.0
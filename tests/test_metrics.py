@@ -0,0 +1,204 @@
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from flask import Response
+from app.core.metrics import MetricsRegistry
+from app.spec import response_validation
+from typing import Generator, Tuple
+from flask.testing import FlaskClient
+from sqlalchemy.orm import Session
+import pytest
+
+
+def sample(text: str, line_prefix: str) -> float:
+    """ Valeur de la première ligne d'exposition commençant par le préfixe. """
+    for line in text.splitlines():
+        if line.startswith(line_prefix):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_prefix} absent")
+
+
+class TestMetricsEndpoint:
+
+    def test_request_counters_and_histogram(
+            self, test_client: Tuple[FlaskClient, Session],
+            feed_product: list) -> None:
+        client, _ = test_client
+        key = 'method="GET",endpoint="product_bp.get_products",status="200"'
+
+        before = client.get("/metrics").get_data(as_text=True)
+        start = (sample(before, f"http_requests_total{{{key}}}")
+                 if key in before else 0)
+        for _ in range(3):
+            assert client.get("/api/produits").status_code == 200
+
+        resp = client.get("/metrics")
+        assert resp.status_code == 200
+        assert resp.mimetype == "text/plain"
+        text = resp.get_data(as_text=True)
+        assert sample(text, f"http_requests_total{{{key}}}") == start + 3
+        assert sample(text, f'http_request_duration_seconds_bucket{{{key},le="+Inf"}}') \
+            == start + 3
+        assert "# TYPE http_request_duration_seconds histogram" in text
+        assert sample(text, "db_pool_checkouts_total") >= 0
+        assert 'cache_requests_total{cache="catalog",result="miss"}' in text
+
+    def test_auth_failures(
+            self, test_client: Tuple[FlaskClient, Session]) -> None:
+        client, _ = test_client
+        key = 'auth_failures_total{status="401",reason="missing_token"}'
+        text = client.get("/metrics").get_data(as_text=True)
+        start = sample(text, key) if key in text else 0
+
+        assert client.get("/admin-route").status_code == 401
+        text = client.get("/metrics").get_data(as_text=True)
+        assert sample(text, key) == start + 1
+        # Causes en nombre fixe : jamais le message renvoyé au client
+        reasons = {line.split('reason="')[1].split('"')[0]
+                   for line in text.splitlines()
+                   if line.startswith("auth_failures_total{")}
+        assert reasons <= {"missing_token", "invalid_token", "expired",
+                           "invalid_credentials", "forbidden"}
+
+
+@pytest.fixture
+def invalid_catalog(monkeypatch) -> Generator[None, None, None]:
+    """ Page catalogue non conforme à ProductListSchema (prix manquant). """
+    monkeypatch.setattr(
+        "app.routes.product_routes.catalog_page_response",
+        lambda query: Response('[{"id": 1, "nom": "X"}]',
+                               mimetype="application/json"))
+    rate, strict = response_validation.sample_rate, response_validation.strict
+    yield
+    response_validation.sample_rate, response_validation.strict = rate, strict
+
+
+class TestResponseValidation:
+    KEY = 'response_validations_total{endpoint="product_bp.get_products",result="%s"}'
+
+    def _count(self, client: FlaskClient, result: str) -> float:
+        text = client.get("/metrics").get_data(as_text=True)
+        key = self.KEY % result
+        return sample(text, key) if key in text else 0
+
+    def test_strict_by_default(
+            self, test_client: Tuple[FlaskClient, Session],
+            invalid_catalog) -> None:
+        client, _ = test_client
+        start = self._count(client, "invalid")
+
+        assert client.get("/api/produits").status_code == 500
+        assert self._count(client, "invalid") == start + 1
+
+    def test_sampled_failure_logged(
+            self, test_client: Tuple[FlaskClient, Session],
+            invalid_catalog, caplog) -> None:
+        client, _ = test_client
+        response_validation.strict = False
+        start = self._count(client, "invalid")
+
+        with caplog.at_level(logging.WARNING):
+            resp = client.get("/api/produits")
+        assert resp.status_code == 200
+        assert resp.get_json() == [{"id": 1, "nom": "X"}]
+        assert self._count(client, "invalid") == start + 1
+        assert "Réponse non conforme au schéma : GET /api/produits" in caplog.text
+
+    def test_sample_rate(
+            self, test_client: Tuple[FlaskClient, Session],
+            invalid_catalog) -> None:
+        client, _ = test_client
+        response_validation.sample_rate = 0.0
+        start = self._count(client, "skipped")
+
+        # Réponse non validée, requête toujours validée
+        assert client.get("/api/produits").status_code == 200
+        assert client.get("/api/produits?limit=0").status_code == 422
+        assert self._count(client, "skipped") == start + 1
+
+        response_validation.sample_rate = 0.5
+        for _ in range(200):
+            client.get("/api/produits")
+        skipped = self._count(client, "skipped") - start - 1
+        assert 50 < skipped < 150
+
+
+class TestMetricsRegistry:
+
+    def test_finished_threads_are_kept(self) -> None:
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs", ("kind",))
+        threads = [threading.Thread(target=counter.inc, args=("a",))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.inc("a", amount=2)
+
+        assert 'jobs_total{kind="a"} 7' in registry.render()
+        assert 'jobs_total{kind="a"} 7' in registry.render()
+
+    def test_finished_threads_merged_when_recording(self) -> None:
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs")
+        for _ in range(50):
+            thread = threading.Thread(target=counter.inc)
+            thread.start()
+            thread.join()
+
+        # Sans lecture des métriques : au plus le dernier thread conservé
+        assert len(registry._threads) <= 1
+        counter.inc()
+        assert "jobs_total 51" in registry.render()
+
+    def test_multiprocess_aggregation(self, tmp_path: Path) -> None:
+        registry = MetricsRegistry()
+        registry.multiproc_dir = tmp_path
+        latency = registry.histogram("latency_seconds", "Latence",
+                                     buckets=(0.1, 1.0))
+        latency.observe(0.05)
+        latency.observe(0.5)
+
+        # Instantané d'un autre worker (process terminé)
+        other = [["latency_seconds", [], [1, 0, 1, 3.0]]]
+        (tmp_path / "metrics_999999999.json").write_text(json.dumps(other))
+
+        text = registry.render()
+        assert 'latency_seconds_bucket{le="0.1"} 2' in text
+        assert 'latency_seconds_bucket{le="1"} 3' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+        assert "latency_seconds_count 4" in text
+        assert (tmp_path / f"metrics_{os.getpid()}.json").exists()
+
+    def test_dead_processes_folded(self, tmp_path: Path) -> None:
+        registry = MetricsRegistry()
+        registry.multiproc_dir = tmp_path
+        registry.counter("jobs_total", "Jobs")
+        for pid in (999999998, 999999999):
+            (tmp_path / f"metrics_{pid}.json").write_text(
+                json.dumps([["jobs_total", [], 2]]))
+
+        assert "jobs_total 4" in registry.render()
+        assert "jobs_total 4" in registry.render()
+        # Un seul fichier pour les process terminés, plus un par vivant
+        assert sorted(p.name for p in tmp_path.glob("metrics_*.json")) == [
+            f"metrics_{os.getpid()}.json", "metrics_dead.json"]
+
+    def test_reused_pid_keeps_previous_values(self, tmp_path: Path) -> None:
+        # Fichier du même PID laissé par un process terminé
+        (tmp_path / f"metrics_{os.getpid()}.json").write_text(
+            json.dumps([["jobs_total", [], 5]]))
+        registry = MetricsRegistry()
+        registry.counter("jobs_total", "Jobs").inc()
+        registry.configure({"METRICS_MULTIPROC_DIR": str(tmp_path),
+                            "METRICS_FLUSH_INTERVAL": 60})
+        try:
+            assert "jobs_total 6" in registry.render()
+            # Reconfiguration du même process : rien regroupé deux fois
+            registry.configure({"METRICS_MULTIPROC_DIR": str(tmp_path)})
+            assert "jobs_total 6" in registry.render()
+        finally:
+            registry._stop.set()
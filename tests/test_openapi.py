@@ -0,0 +1,119 @@
+import gzip
+import json
+from app.cli.openapi import openapi_command
+from app.core.openapi import app_documents, render_openapi
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy.orm import Session
+from pathlib import Path
+from typing import Generator, Tuple
+import pytest
+
+
+@pytest.fixture
+def fresh_documents(setup_db) -> Generator[None, None, None]:
+    """ Documentation re-rendue pour le test (application partagée). """
+    app, _ = setup_db
+    app.extensions.pop("openapi_documents", None)
+    yield
+    app.extensions.pop("openapi_documents", None)
+
+
+class TestOpenApiDocument:
+
+    def test_rendered_once_with_etag(
+            self, test_client: Tuple[FlaskClient, Session],
+            fresh_documents, monkeypatch) -> None:
+        client, _ = test_client
+        renders = []
+        monkeypatch.setattr("app.core.openapi.render_openapi",
+                            lambda s: renders.append(s) or render_openapi(s))
+
+        first = client.get("/apidoc/openapi.json")
+        second = client.get("/apidoc/openapi.json")
+        assert first.status_code == 200
+        assert second.data == first.data
+        assert len(renders) == 1
+        paths = json.loads(first.data)["paths"]
+        assert paths["/api/produits"]
+        # Exports en flux documentés (paramètres de requête)
+        for path in ("/api/produits/export", "/api/commandes/export",
+                     "/api/commandes/lignes/export"):
+            params = {p["name"] for p in paths[path]["get"]["parameters"]}
+            assert {"format", "batch_size"} <= params
+
+        etag, weak = first.get_etag()
+        assert etag and not weak
+        assert first.headers["Cache-Control"] == "public, max-age=300"
+        resp = client.get("/apidoc/openapi.json",
+                          headers={"If-None-Match": f'"{etag}"'})
+        assert resp.status_code == 304
+
+    def test_compressed_variant(
+            self, test_client: Tuple[FlaskClient, Session],
+            fresh_documents) -> None:
+        client, _ = test_client
+        plain = client.get("/apidoc/openapi.json")
+
+        resp = client.get("/apidoc/openapi.json",
+                          headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(resp.data) == plain.data
+        assert resp.headers["ETag"] == plain.headers["ETag"][:-1] + '-gzip"'
+        # Variante conservée avec le document
+        again = client.get("/apidoc/openapi.json",
+                           headers={"Accept-Encoding": "gzip"})
+        assert again.data == resp.data
+        assert client.get("/apidoc/openapi.json", headers={
+            "Accept-Encoding": "gzip",
+            "If-None-Match": resp.headers["ETag"]}).status_code == 304
+
+    def test_prebuilt_document_served(
+            self, setup_db, test_client: Tuple[FlaskClient, Session],
+            fresh_documents, tmp_path: Path) -> None:
+        app, _ = setup_db
+        client, _ = test_client
+        path = tmp_path / "openapi.json"
+
+        result = app.test_cli_runner().invoke(
+            openapi_command, ["--output", str(path)])
+        assert result.exit_code == 0
+        assert json.loads(path.read_bytes())["openapi"]
+
+        # Fichier servi tel quel (pas de génération au démarrage)
+        path.write_bytes(path.read_bytes().replace(b"My E-commerce API",
+                                                   b"Build API"))
+        app.config["OPENAPI_DOCUMENT_PATH"] = str(path)
+        try:
+            resp = client.get("/apidoc/openapi.json")
+        finally:
+            app.config["OPENAPI_DOCUMENT_PATH"] = None
+        assert resp.data == path.read_bytes()
+        assert resp.get_json()["info"]["title"] == "Build API"
+
+    def test_documents_per_app(
+            self, setup_db, test_client: Tuple[FlaskClient, Session],
+            fresh_documents) -> None:
+        app, _ = setup_db
+        client, _ = test_client
+        resp = client.get("/apidoc/openapi.json")
+
+        store = app.extensions["openapi_documents"]
+        assert store.get("openapi", lambda: b"{}").body == resp.data
+        # Autre application : ses propres documents
+        other = app_documents(Flask(__name__))
+        assert other is not store
+        assert other.get("openapi", lambda: b"{}").body == b"{}"
+
+    def test_doc_pages_cached(
+            self, test_client: Tuple[FlaskClient, Session],
+            fresh_documents) -> None:
+        client, _ = test_client
+
+        for ui in ("swagger", "redoc", "scalar"):
+            resp = client.get(f"/apidoc/{ui}/")
+            assert resp.status_code == 200
+            assert resp.mimetype == "text/html"
+            assert b"/apidoc/openapi.json" in resp.data
+            assert client.get(f"/apidoc/{ui}/", headers={
+                "If-None-Match": resp.headers["ETag"]}).status_code == 304
@@ -1,9 +1,13 @@
-from app.models import Product, Order
+from app.models import Product, Order, OrderItem
 from typing import Tuple
 from flask.testing import FlaskClient
 from sqlalchemy.orm import Session
+import csv
+import io
+import json
 import pytest
 from app.core.auth_utils import decode_token
+from app.schemas.order_schemas import OrderRespSchema
 
 
 class TestOrderCreation:
@@ -49,6 +53,69 @@ class TestOrderCreation:
         assert db_order.utilisateur_id == user_id
 
 
+class TestOrderBatch:
+
+    def _batch(self, client: FlaskClient, token: str, commandes: list):
+        return client.post("/api/commandes/batch", json={"commandes": commandes},
+                           headers={"Authorization": f"Bearer {token}"})
+
+    def test_batch_all_created(self, test_client: Tuple[FlaskClient, Session],
+                               client_token: str, feed_product: list) -> None:
+        client, session = test_client
+        commandes = [
+            {"adresse_livraison": f"{i} rue des tests",
+             "produits": [{"produit_id": p.id, "quantite": 1} for p in feed_product]}
+            for i in range(3)
+        ]
+
+        resp = self._batch(client, client_token, commandes)
+        data = resp.get_json()
+        assert resp.status_code == 201
+        assert (data["creees"], data["refusees"]) == (3, 0)
+        assert [r["index"] for r in data["resultats"]] == [0, 1, 2]
+        assert all(len(r["commande"]["lignes"]) == 4 for r in data["resultats"])
+
+        session.expire_all()
+        assert session.get(Product, feed_product[0].id).quantite_stock == 5 - 3
+
+    def test_batch_partial_failure(self, test_client: Tuple[FlaskClient, Session],
+                                   client_token: str, feed_product: list) -> None:
+        """Une commande refusée n'annule ni ne réserve rien pour les autres."""
+        client, session = test_client
+        product = feed_product[0]   # stock 5
+        commandes = [
+            {"adresse_livraison": "a", "produits": [{"produit_id": product.id, "quantite": 3}]},
+            {"adresse_livraison": "b", "produits": [
+                {"produit_id": feed_product[1].id, "quantite": 1},
+                {"produit_id": product.id, "quantite": 3}]},
+            {"adresse_livraison": "c", "produits": [{"produit_id": 99999, "quantite": 1}]},
+            {"adresse_livraison": "d", "produits": [{"produit_id": product.id, "quantite": 2}]},
+        ]
+
+        resp = self._batch(client, client_token, commandes)
+        data = resp.get_json()
+        assert resp.status_code == 207
+        assert (data["creees"], data["refusees"]) == (2, 2)
+        assert [r.get("code") for r in data["resultats"]] == [None, 400, 404, None]
+        assert "Stock insuffisant" in data["resultats"][1]["erreur"]
+
+        session.expire_all()
+        assert session.get(Product, product.id).quantite_stock == 0
+        assert session.get(Product, feed_product[1].id).quantite_stock == 10
+        assert session.query(Order).filter(
+            Order.adresse_livraison.in_(["a", "b", "c", "d"])).count() == 2
+
+    @pytest.mark.parametrize("size", [0, 101])
+    def test_batch_size_limits(self, test_client: Tuple[FlaskClient, Session],
+                               client_token: str, feed_product: list, size: int) -> None:
+        client, _ = test_client
+        commandes = [{"adresse_livraison": "x",
+                      "produits": [{"produit_id": feed_product[0].id, "quantite": 0}]}
+                     ] * size
+        resp = self._batch(client, client_token, commandes)
+        assert resp.status_code == 422
+
+
 class TestOrderSearch:
 
     def test_client_own_orders(self, test_client: Tuple[FlaskClient, Session],
@@ -75,6 +142,136 @@ class TestOrderSearch:
         for c in commandes:
             assert c["id"] in all_ids
 
+    def test_orders_batch_serialization(
+            self, test_client: Tuple[FlaskClient, Session], admin_token: str,
+            feed_order: dict) -> None:
+        """Liste sérialisée en un passage : même JSON que ligne à ligne + jsonify."""
+        client, session = test_client
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        resp = client.get("/api/commandes", headers=headers)
+        assert resp.status_code == 200
+
+        orders = session.query(Order).order_by(Order.id).all()
+        expected = json.loads(client.application.json.dumps(
+            [OrderRespSchema.model_validate(o).model_dump() for o in orders]))
+        assert sorted(resp.get_json(), key=lambda c: c["id"]) == expected
+        # Dates au format HTTP de jsonify
+        assert resp.get_json()[0]["date_commande"].endswith(" GMT")
+
+    def test_admin_orders_paginated(self, test_client: Tuple[FlaskClient, Session],
+                                    admin_token: str, feed_order: dict) -> None:
+        client, _ = test_client
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        user_id = feed_order["utilisateur_id"]
+
+        resp = client.get(f"/api/commandes?limit=1&utilisateur_id={user_id}",
+                          headers=headers)
+        page1 = resp.get_json()
+        assert resp.status_code == 200
+        assert len(page1) == 1
+        assert len(page1[0]["lignes"]) == 2
+
+        cursor = resp.headers["X-Next-Cursor"]
+        resp = client.get(f"/api/commandes?limit=1&utilisateur_id={user_id}&after={cursor}",
+                          headers=headers)
+        page2 = resp.get_json()
+        assert len(page2) == 1
+        assert page2[0]["id"] > page1[0]["id"]
+        assert "X-Next-Cursor" not in resp.headers
+
+    @pytest.mark.parametrize("params, expected", [
+        ("statut=En attente", 2),
+        ("statut=Validée", 0),
+        ("date_from=2000-01-01", 2),
+        ("date_to=2000-01-01", 0),
+    ])
+    def test_admin_orders_filters(self, test_client: Tuple[FlaskClient, Session],
+                                  admin_token: str, feed_order: dict,
+                                  params: str, expected: int) -> None:
+        client, _ = test_client
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        user_id = feed_order["utilisateur_id"]
+
+        resp = client.get(f"/api/commandes?utilisateur_id={user_id}&{params}",
+                          headers=headers)
+        assert resp.status_code == 200
+        assert len(resp.get_json()) == expected
+
+    @pytest.mark.parametrize("params", [
+        "statut=inconnu", "date_from=2025-02-01&date_to=2025-01-01", "limit=-1"
+    ])
+    def test_orders_wrong_filters(self, test_client: Tuple[FlaskClient, Session],
+                                  admin_token: str, params: str) -> None:
+        client, _ = test_client
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        resp = client.get(f"/api/commandes?{params}", headers=headers)
+        assert resp.status_code == 422
+
+    def test_client_filter_other_user(self, test_client: Tuple[FlaskClient, Session],
+                                      client_token: str, feed_order: dict) -> None:
+        """Le filtre utilisateur_id est réservé à l'admin."""
+        client, _ = test_client
+        headers = {"Authorization": f"Bearer {client_token}"}
+        other_id = feed_order["utilisateur_id"] + 1000
+        resp = client.get(f"/api/commandes?utilisateur_id={other_id}", headers=headers)
+        assert resp.status_code == 403
+
+
+class TestOrderExport:
+
+    def test_export_orders_ndjson(self, test_client: Tuple[FlaskClient, Session],
+                                  admin_token: str, feed_order: dict) -> None:
+        client, _ = test_client
+        headers = {"Authorization": f"Bearer {admin_token}"}
+
+        resp = client.get("/api/commandes/export?statut=En attente", headers=headers)
+        assert resp.status_code == 200
+        assert resp.mimetype == "application/x-ndjson"
+        rows = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+        assert [r["id"] for r in rows] == [o["commande"].id for o in feed_order["commandes"]]
+        # Commande 1 : 1 x 20.0 + 2 x 15.0
+        assert (rows[0]["nb_lignes"], rows[0]["montant_total"]) == (2, 50.0)
+
+        resp = client.get("/api/commandes/export?statut=Validée", headers=headers)
+        assert resp.get_data() == b""
+
+    def test_export_orderitems_csv(self, test_client: Tuple[FlaskClient, Session],
+                                   admin_token: str, feed_order: dict) -> None:
+        client, _ = test_client
+        headers = {"Authorization": f"Bearer {admin_token}"}
+
+        resp = client.get("/api/commandes/lignes/export?format=csv&date_from=2000-01-01",
+                          headers=headers)
+        assert resp.status_code == 200
+        rows = list(csv.DictReader(io.StringIO(resp.get_data(as_text=True))))
+        assert len(rows) == 4
+        assert rows[0]["produit_nom"] == "Produit A"
+        assert rows[0]["statut"] == "En attente"
+
+        # Export vide : en-tête seul
+        resp = client.get("/api/commandes/lignes/export?format=csv&date_to=2000-01-01",
+                          headers=headers)
+        assert resp.get_data(as_text=True).startswith("id,commande_id,")
+        assert len(resp.get_data(as_text=True).splitlines()) == 1
+
+    @pytest.mark.parametrize("params", ["format=xml", "batch_size=0",
+                                        "date_from=2025-02-01&date_to=2025-01-01"])
+    def test_export_wrong_params(self, test_client: Tuple[FlaskClient, Session],
+                                 admin_token: str, params: str) -> None:
+        client, _ = test_client
+        resp = client.get(f"/api/commandes/export?{params}",
+                          headers={"Authorization": f"Bearer {admin_token}"})
+        assert resp.status_code == 422
+        # Corps spectree, comme pour les autres routes
+        assert resp.get_json()[0]["msg"]
+
+    def test_export_by_client(self, test_client: Tuple[FlaskClient, Session],
+                              client_token: str) -> None:
+        client, _ = test_client
+        resp = client.get("/api/commandes/lignes/export",
+                          headers={"Authorization": f"Bearer {client_token}"})
+        assert resp.status_code == 403
+
 
 class TestOrderItems:
 
@@ -169,3 +366,138 @@ class TestOrderUpdate:
 
         assert resp.status_code == 400
         assert "stock insuffisant" in data["error"].lower()
+
+
+class TestOrderStock:
+
+    def _order(self, client: FlaskClient, token: str, produits: list):
+        return client.post("/api/commandes",
+                           json={"adresse_livraison": "1 rue des tests",
+                                 "produits": produits},
+                           headers={"Authorization": f"Bearer {token}"})
+
+    def test_duplicate_lines_aggregated(self, test_client: Tuple[FlaskClient, Session],
+                                        client_token: str, feed_product: list) -> None:
+        """Les lignes d'un même produit sont cumulées pour le contrôle du stock."""
+        client, session = test_client
+        product = feed_product[0]   # stock 5
+
+        resp = self._order(client, client_token, [
+            {"produit_id": product.id, "quantite": 3},
+            {"produit_id": product.id, "quantite": 3},
+        ])
+        assert resp.status_code == 400
+        assert product.nom in resp.get_json()["error"]
+
+        resp = self._order(client, client_token, [
+            {"produit_id": product.id, "quantite": 3},
+            {"produit_id": product.id, "quantite": 2},
+        ])
+        assert resp.status_code == 201
+        assert len(resp.get_json()["commande"]["lignes"]) == 2
+        assert session.get(Product, product.id).quantite_stock == 0
+
+    def test_reservation_all_or_nothing(self, test_client: Tuple[FlaskClient, Session],
+                                        client_token: str, feed_product: list) -> None:
+        """Un produit en rupture annule la réservation des autres lignes."""
+        client, session = test_client
+        stocks = {p.id: p.quantite_stock for p in feed_product}
+
+        resp = self._order(client, client_token, [
+            {"produit_id": feed_product[0].id, "quantite": 1},
+            {"produit_id": feed_product[1].id, "quantite": 1},
+            {"produit_id": feed_product[2].id, "quantite": 99},
+        ])
+        assert resp.status_code == 400
+        assert feed_product[2].nom in resp.get_json()["error"]
+
+        session.expire_all()
+        assert {p.id: session.get(Product, p.id).quantite_stock
+                for p in feed_product} == stocks
+
+    def test_unknown_product(self, test_client: Tuple[FlaskClient, Session],
+                             client_token: str, feed_product: list) -> None:
+        client, session = test_client
+        resp = self._order(client, client_token, [
+            {"produit_id": feed_product[0].id, "quantite": 1},
+            {"produit_id": 99999, "quantite": 1},
+        ])
+        assert resp.status_code == 404
+        session.expire_all()
+        assert session.get(Product, feed_product[0].id).quantite_stock == 5
+
+
+class TestOrderQueries:
+    """Nombre de requêtes SQL fixe quelle que soit la taille des commandes."""
+
+    @staticmethod
+    def _count(client: FlaskClient, session: Session, statements: list,
+               url: str, headers: dict) -> int:
+        session.expire_all()
+        statements.clear()
+        resp = client.get(url, headers=headers)
+        assert resp.status_code == 200
+        return len(statements)
+
+    def test_list_orders_fixed_queries(self, test_client: Tuple[FlaskClient, Session],
+                                       admin_token: str, feed_order: dict,
+                                       query_counter: list) -> None:
+        client, session = test_client
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        url = f"/api/commandes?utilisateur_id={feed_order['utilisateur_id']}"
+
+        before = self._count(client, session, query_counter, url, headers)
+
+        user_id = feed_order["utilisateur_id"]
+        product_ids = [p.id for p in session.query(Product).all()]
+        for _ in range(5):
+            order = Order(utilisateur_id=user_id, adresse_livraison="x")
+            session.add(order)
+            session.flush()
+            for pid in product_ids:
+                session.add(OrderItem(commande_id=order.id, produit_id=pid,
+                                      quantite=1, prix_unitaire=1.0))
+        session.commit()
+
+        after = self._count(client, session, query_counter, url, headers)
+        assert after == before
+
+    def test_order_detail_and_lines_fixed_queries(
+            self, test_client: Tuple[FlaskClient, Session], client_token: str,
+            feed_order: dict, query_counter: list) -> None:
+        client, session = test_client
+        headers = {"Authorization": f"Bearer {client_token}"}
+        order_id = feed_order["commandes"][0]["commande"].id
+
+        # auth + commande + lignes (selectin)
+        assert self._count(client, session, query_counter,
+                           f"/api/commandes/{order_id}", headers) == 3
+        # commande + lignes jointes au produit
+        assert self._count(client, session, query_counter,
+                           f"/api/commandes/{order_id}/lignes", {}) == 2
+
+    def test_create_order_serialization_no_lazy_load(
+            self, test_client: Tuple[FlaskClient, Session], client_token: str,
+            feed_product: list, query_counter: list) -> None:
+        client, session = test_client
+        headers = {"Authorization": f"Bearer {client_token}"}
+        payload = {
+            "adresse_livraison": "1 rue des tests",
+            "produits": [{"produit_id": p.id, "quantite": 1} for p in feed_product]
+        }
+
+        session.expire_all()
+        query_counter.clear()
+        resp = client.post("/api/commandes", json=payload, headers=headers)
+        assert resp.status_code == 201
+        lines = resp.get_json()["commande"]["lignes"]
+        assert len(lines) == len(feed_product)
+
+        selects = [s for s in query_counter
+                   if s.lstrip().upper().startswith("SELECT")]
+        updates = [s for s in query_counter
+                   if s.lstrip().upper().startswith("UPDATE PRODUCT")]
+        # auth + lecture groupée des produits (aucun lazy load à la sérialisation)
+        assert len(selects) == 2
+        # décrément du stock en un seul UPDATE (exécuté par lot)
+        assert len(updates) == 1
@@ -1,8 +1,20 @@
 from app.models import Product
+from app.core.cache import CatalogCache, CachedBody
+from app.core.instrumentation import statement_shape
+from app.core.pagination import encode_cursor
+from app.database.catalog_version import bump_catalog_version
+from app.database.fts import _fts_ready
+from app.schemas.pagination_schemas import PAGE_SIZE_DEFAULT
+from app.schemas.product_schemas import ProductRespSchema
 from typing import Tuple, Dict
 from flask.testing import FlaskClient
 from sqlalchemy.orm import Session
+import csv
+import io
+import json
+import logging
 import pytest
+from pathlib import Path
 
 
 class TestProductList:
@@ -17,6 +29,19 @@ class TestProductList:
         assert len(data) >= 4
         assert any(p["nom"] == feed_product[0].nom for p in data)
 
+    def test_list_batch_serialization(
+            self, test_client: Tuple[FlaskClient, Session], feed_product: list) -> None:
+        """Liste sérialisée en un passage : même JSON que ligne à ligne + jsonify."""
+        client, session = test_client
+
+        resp = client.get("/api/produits?limit=1000")
+        assert resp.status_code == 200
+        products = session.query(Product).order_by(Product.id).all()
+        expected = json.loads(client.application.json.dumps(
+            [ProductRespSchema.model_validate(p).model_dump() for p in products]))
+        assert resp.get_json() == expected
+        assert resp.mimetype == "application/json"
+
     def test_search_products(
             self, test_client: Tuple[FlaskClient, Session], feed_product:list) -> None:
         client, _ = test_client
@@ -37,6 +62,91 @@ class TestProductList:
         assert all(p["quantite_stock"] > 0 for p in data)
         assert len(data) >= 4
 
+    @pytest.mark.parametrize("sort", ["id", "nom", "prix"])
+    def test_list_products_paginated(
+            self, test_client: Tuple[FlaskClient, Session], feed_product: list,
+            sort: str) -> None:
+        client, _ = test_client
+
+        resp = client.get(f"/api/produits?limit=3&sort={sort}")
+        page1 = resp.get_json()
+        assert resp.status_code == 200
+        assert len(page1) == 3
+        cursor = resp.headers.get("X-Next-Cursor")
+        assert cursor
+        assert 'rel="next"' in resp.headers["Link"]
+
+        resp = client.get(f"/api/produits?limit=3&sort={sort}&after={cursor}")
+        page2 = resp.get_json()
+        assert resp.status_code == 200
+        assert len(page2) == 1
+        assert "X-Next-Cursor" not in resp.headers
+
+        keys = [p[sort] for p in page1 + page2]
+        assert keys == sorted(keys)
+        assert {p["id"] for p in page1}.isdisjoint({p["id"] for p in page2})
+
+    def test_list_products_unpaginated_by_default(
+            self, test_client: Tuple[FlaskClient, Session],
+            feed_product: list) -> None:
+        client, session = test_client
+        session.add_all(Product(nom=f"Lot {i}", description="Lot",
+                                categorie="Lot", prix=1.0, quantite_stock=1)
+                        for i in range(PAGE_SIZE_DEFAULT))
+        session.commit()
+
+        # Clients existants (ni limit ni after) : catalogue complet
+        resp = client.get("/api/produits")
+        assert len(resp.get_json()) == PAGE_SIZE_DEFAULT + 4
+        assert "X-Next-Cursor" not in resp.headers
+
+        # Curseur sans limit : pages de taille par défaut
+        cursor = encode_cursor("id", feed_product[0].id, feed_product[0].id)
+        resp = client.get(f"/api/produits?after={cursor}")
+        assert len(resp.get_json()) == PAGE_SIZE_DEFAULT
+        assert resp.headers["X-Next-Cursor"]
+
+    @pytest.mark.parametrize("params", [
+        "limit=0", "limit=abc", "sort=stock", "after=!!invalide!!",
+    ])
+    def test_list_products_wrong_pagination(
+            self, test_client: Tuple[FlaskClient, Session], feed_product: list,
+            params: str) -> None:
+        client, _ = test_client
+
+        resp = client.get(f"/api/produits?{params}")
+        assert resp.status_code in (400, 422)
+
+    @pytest.mark.parametrize("key", [["Produit"], {"nom": "Produit"}, None, True])
+    def test_list_products_crafted_cursor(
+            self, test_client: Tuple[FlaskClient, Session], feed_product: list,
+            key) -> None:
+        client, _ = test_client
+        cursor = encode_cursor("nom", key, 1)
+
+        resp = client.get(f"/api/produits?sort=nom&after={cursor}")
+        assert resp.status_code == 400
+        assert resp.get_json()["error"] == "Curseur invalide"
+
+    def test_search_products_paginated(
+            self, test_client: Tuple[FlaskClient, Session], feed_product: list) -> None:
+        client, _ = test_client
+
+        resp = client.get("/api/produits/search?nom=Produit&limit=2")
+        page1 = resp.get_json()
+        assert resp.status_code == 200
+        assert len(page1) == 2
+
+        cursor = resp.headers["X-Next-Cursor"]
+        resp = client.get(f"/api/produits/search?nom=Produit&limit=2&after={cursor}")
+        page2 = resp.get_json()
+        assert len(page2) == 2
+        assert [p["id"] for p in page1 + page2] == sorted(p.id for p in feed_product)
+
+        # Curseur d'un autre tri refusé
+        resp = client.get(f"/api/produits/search?sort=prix&after={cursor}")
+        assert resp.status_code == 400
+
     def test_get_product_by_id(self, test_client: Tuple[FlaskClient, Session], client_token: str, feed_product:list) -> None:
         """
         Vérifie que la récupération d'un produit par son ID fonctionne.
@@ -53,6 +163,113 @@ class TestProductList:
         assert data["nom"] == product.nom
 
 
+class TestProductFullText:
+
+    @pytest.fixture
+    def feed_catalog(self, test_client: Tuple[FlaskClient, Session],
+                     feed_product: list) -> list:
+        """Ajoute des produits dont 'clavier' apparaît dans des champs différents."""
+        _, session = test_client
+        products = [
+            Product(nom="Support écran", description="Compatible clavier sans fil",
+                    categorie="Bureau", prix=25.0, quantite_stock=3),
+            Product(nom="Clavier mécanique", description="Switchs rouges",
+                    categorie="Informatique", prix=89.0, quantite_stock=0),
+            Product(nom="Tapis", description="Tapis de souris",
+                    categorie="Claviers et souris", prix=9.0, quantite_stock=12),
+        ]
+        session.add_all(products)
+        session.commit()
+        return products
+
+    def test_fulltext_ranked_by_relevance(
+            self, test_client: Tuple[FlaskClient, Session], feed_catalog: list) -> None:
+        client, _ = test_client
+
+        resp = client.get("/api/produits/search?q=clavi")
+        data = resp.get_json()
+        assert resp.status_code == 200
+        # nom > catégorie > description, recherche en préfixe et sans accents
+        assert [p["nom"] for p in data] == ["Clavier mécanique", "Tapis", "Support écran"]
+        assert data[0]["pertinence"] >= data[1]["pertinence"] >= data[2]["pertinence"]
+        assert all("<mark>" in p["extrait"] for p in data)
+
+        resp = client.get("/api/produits/search?q=ECRAN support")
+        assert [p["nom"] for p in resp.get_json()] == ["Support écran"]
+
+        resp = client.get("/api/produits/search?q=clavier&disponible=true")
+        assert "Clavier mécanique" not in [p["nom"] for p in resp.get_json()]
+
+    def test_fulltext_paginated(
+            self, test_client: Tuple[FlaskClient, Session], feed_catalog: list) -> None:
+        client, _ = test_client
+
+        resp = client.get("/api/produits/search?q=clavier&limit=2")
+        page1 = resp.get_json()
+        assert len(page1) == 2
+        cursor = resp.headers["X-Next-Cursor"]
+
+        resp = client.get(f"/api/produits/search?q=clavier&limit=2&after={cursor}")
+        page2 = resp.get_json()
+        assert [p["nom"] for p in page1 + page2] == [
+            "Clavier mécanique", "Tapis", "Support écran"]
+        assert "X-Next-Cursor" not in resp.headers
+
+    def test_fulltext_index_follows_writes(
+            self, test_client: Tuple[FlaskClient, Session], admin_token: str,
+            feed_catalog: list) -> None:
+        client, _ = test_client
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        product = feed_catalog[1]
+
+        resp = client.put(f"/api/produits/{product.id}", headers=headers,
+                          json={"nom": "Pavé numérique"})
+        assert resp.status_code == 200
+        resp = client.get("/api/produits/search?q=pave")
+        assert [p["id"] for p in resp.get_json()] == [product.id]
+
+        client.delete(f"/api/produits/{product.id}", headers=headers)
+        resp = client.get("/api/produits/search?q=pave")
+        assert resp.get_json() == []
+
+    def test_fulltext_snippet_escaped(
+            self, test_client: Tuple[FlaskClient, Session],
+            feed_product: list) -> None:
+        client, session = test_client
+        session.add(Product(nom="Clavier <script>alert(1)</script>",
+                            description="", categorie="", prix=10.0,
+                            quantite_stock=1))
+        session.commit()
+
+        resp = client.get("/api/produits/search?q=alert")
+        extrait = resp.get_json()[0]["extrait"]
+        assert "<script>" not in extrait
+        assert "&lt;script&gt;<mark>alert</mark>(1)&lt;/script&gt;" in extrait
+
+    def test_fulltext_fallback_without_fts(
+            self, test_client: Tuple[FlaskClient, Session], feed_catalog: list,
+            monkeypatch) -> None:
+        client, session = test_client
+        # Index FTS5 indisponible : filtre ILIKE par mot, tri par id
+        monkeypatch.setitem(_fts_ready, session.get_bind().url, False)
+
+        resp = client.get("/api/produits/search?q=clavier")
+        assert resp.status_code == 200
+        data = resp.get_json()
+        assert [p["nom"] for p in data] == [
+            "Support écran", "Clavier mécanique", "Tapis"]
+        assert all(p["pertinence"] is None and p["extrait"] is None
+                   for p in data)
+
+    @pytest.mark.parametrize("q, status", [("", 422), ("%22*", 400)])
+    def test_fulltext_empty_query(
+            self, test_client: Tuple[FlaskClient, Session], feed_product: list,
+            q: str, status: int) -> None:
+        client, _ = test_client
+        resp = client.get(f"/api/produits/search?q={q}")
+        assert resp.status_code == status
+
+
 class TestProductCreate:
 
     @pytest.mark.parametrize("payload", [
@@ -128,6 +345,134 @@ class TestProductCreate:
         assert "missing" in data[0]["type"]
         assert any(field in data[0]["loc"] for field in ["prix", "nom"])
 
+class TestProductImport:
+
+    def _import(self, client: FlaskClient, token: str, body: str,
+                content_type: str = "application/x-ndjson", query: str = ""):
+        return client.post(f"/api/produits/import{query}", data=body.encode(),
+                           content_type=content_type,
+                           headers={"Authorization": f"Bearer {token}"})
+
+    def test_import_ndjson_upsert(
+            self, test_client: Tuple[FlaskClient, Session], admin_token: str,
+            feed_product: list, monkeypatch: pytest.MonkeyPatch) -> None:
+        client, session = test_client
+        # Lots de 2 lignes : upsert réparti sur plusieurs lots
+        monkeypatch.setitem(client.application.config, "PRODUCT_IMPORT_CHUNK_SIZE", 2)
+        body = "\n".join([
+            '{"nom": "Produit A", "prix": 21.0, "quantite_stock": 50}',
+            '{"nom": "Import 1", "categorie": "Imp", "prix": 3.5, "quantite_stock": 1}',
+            '{"nom": "Import 2", "prix": -1, "quantite_stock": 1}',
+            '',
+            'pas du json',
+            '{"nom": "Import 1", "categorie": "Imp", "prix": 4.0, "quantite_stock": 2}',
+        ])
+
+        resp = self._import(client, admin_token, body)
+        data = resp.get_json()
+        assert resp.status_code == 200
+        assert (data["lignes"], data["crees"], data["mis_a_jour"], data["rejetees"]) == (5, 1, 2, 2)
+        assert [e["ligne"] for e in data["erreurs"]] == [3, 5]
+        assert data["erreurs"][0]["erreurs"][0]["loc"] == ["prix"]
+
+        session.expire_all()
+        updated = session.get(Product, feed_product[0].id)
+        assert (updated.prix, updated.quantite_stock) == (21.0, 50)
+        imported = session.query(Product).filter_by(nom="Import 1").all()
+        assert [(p.prix, p.quantite_stock) for p in imported] == [(4.0, 2)]
+
+        # Index plein texte alimenté par les écritures en masse
+        resp = client.get("/api/produits/search?q=import")
+        assert [p["nom"] for p in resp.get_json()] == ["Import 1"]
+
+    def test_import_csv(self, test_client: Tuple[FlaskClient, Session],
+                        admin_token: str, feed_product: list) -> None:
+        client, session = test_client
+        body = ("nom,description,categorie,prix,quantite_stock,inconnue\n"
+                "CSV 1,Desc,Cat,9.90,3,x\n"
+                "CSV 2,,,abc,3,x\n")
+
+        resp = self._import(client, admin_token, body, "text/csv; charset=utf-8")
+        data = resp.get_json()
+        assert resp.status_code == 200
+        assert (data["crees"], data["rejetees"]) == (1, 1)
+        assert data["erreurs"][0]["ligne"] == 3
+        assert session.query(Product).filter_by(nom="CSV 1").one().prix == 9.9
+
+    @pytest.mark.parametrize("content_type, query, status", [
+        ("application/octet-stream", "", 400),
+        ("application/octet-stream", "?format=xml", 422),
+    ])
+    def test_import_wrong_format(
+            self, test_client: Tuple[FlaskClient, Session], admin_token: str,
+            content_type: str, query: str, status: int) -> None:
+        client, _ = test_client
+        resp = self._import(client, admin_token, "{}", content_type, query)
+        assert resp.status_code == status
+
+    def test_import_by_client(self, test_client: Tuple[FlaskClient, Session],
+                              client_token: str) -> None:
+        client, _ = test_client
+        resp = self._import(client, client_token, '{"nom": "X"}')
+        assert resp.status_code == 403
+
+    def test_import_command(self, setup_db, test_client: Tuple[FlaskClient, Session],
+                            feed_product: list, tmp_path: Path) -> None:
+        app, _ = setup_db
+        _, session = test_client
+        path = tmp_path / "catalogue.csv"
+        path.write_text("nom,prix,quantite_stock\nCLI 1,2.5,4\nCLI 2,abc,1\n")
+
+        runner = app.test_cli_runner()
+        result = runner.invoke(args=["import-products", str(path)])
+        assert result.exit_code == 1            # ligne rejetée
+        assert json.loads(result.output)["crees"] == 1
+        assert session.query(Product).filter_by(nom="CLI 1").one().prix == 2.5
+
+        result = runner.invoke(args=["import-products", "-"], input="{}")
+        assert result.exit_code == 2
+        assert "--format" in result.output
+
+
+class TestProductExport:
+
+    def test_export_csv_streamed_by_batch(
+            self, test_client: Tuple[FlaskClient, Session], admin_token: str,
+            feed_product: list) -> None:
+        client, _ = test_client
+        headers = {"Authorization": f"Bearer {admin_token}"}
+
+        resp = client.get("/api/produits/export?format=csv&batch_size=3",
+                          headers=headers, buffered=False)
+        assert resp.status_code == 200
+        assert resp.is_streamed
+        assert resp.mimetype == "text/csv"
+        assert 'filename="produits.csv"' in resp.headers["Content-Disposition"]
+
+        # Un morceau par lot de 3 lignes (en-tête dans le premier)
+        chunks = [chunk.decode() for chunk in resp.response]
+        assert len(chunks) == 2
+        rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+        assert [int(r["id"]) for r in rows] == [p.id for p in feed_product]
+        assert rows[0]["nom"] == feed_product[0].nom
+
+    def test_export_ndjson(self, test_client: Tuple[FlaskClient, Session],
+                           admin_token: str, feed_product: list) -> None:
+        client, _ = test_client
+        resp = client.get("/api/produits/export",
+                          headers={"Authorization": f"Bearer {admin_token}"})
+        assert resp.mimetype == "application/x-ndjson"
+        rows = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+        assert [r["prix"] for r in rows] == [p.prix for p in feed_product]
+
+    def test_export_by_client(self, test_client: Tuple[FlaskClient, Session],
+                              client_token: str) -> None:
+        client, _ = test_client
+        resp = client.get("/api/produits/export",
+                          headers={"Authorization": f"Bearer {client_token}"})
+        assert resp.status_code == 403
+
+
 class TestProductUpdate:
 
     @pytest.mark.parametrize("payload, new_price", [
@@ -237,3 +582,192 @@ class TestProductDelete:
         data = resp.get_json()
         assert data["error"] == "Produit introuvable"
         
+
+
+class TestProductCache:
+
+    def test_catalog_cached_and_invalidated(
+        self, test_client: Tuple[FlaskClient, Session], admin_token: str,
+        feed_product: list, enable_catalog_cache) -> None:
+        client, _ = test_client
+
+        resp = client.get("/api/produits?limit=2")
+        assert resp.headers["X-Cache"] == "MISS"
+        first = resp.get_json()
+
+        # Paramètres normalisés : même entrée pour la recherche équivalente
+        resp = client.get("/api/produits/search?limit=2&sort=id")
+        assert resp.headers["X-Cache"] == "HIT"
+        assert resp.get_json() == first
+        assert resp.headers["X-Next-Cursor"]
+
+        payload = {"nom": "Nouveau", "categorie": "Cat", "prix": 1.0, "quantite_stock": 1}
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        assert client.post("/api/produits", json=payload, headers=headers).status_code == 201
+
+        resp = client.get("/api/produits?limit=2")
+        assert resp.headers["X-Cache"] == "MISS"
+
+    def test_catalog_invalidated_by_other_process(
+        self, test_client: Tuple[FlaskClient, Session],
+        feed_product: list, enable_catalog_cache) -> None:
+        client, session = test_client
+        session.commit()
+
+        assert client.get("/api/produits").headers["X-Cache"] == "MISS"
+        assert client.get("/api/produits").headers["X-Cache"] == "HIT"
+
+        # Écriture d'un autre worker : seule la version partagée change ici
+        bump_catalog_version(session)
+        session.commit()
+        assert client.get("/api/produits").headers["X-Cache"] == "MISS"
+
+    def test_catalog_invalidated_by_order(
+        self, test_client: Tuple[FlaskClient, Session], client_token: str,
+        feed_product: list, enable_catalog_cache) -> None:
+        client, _ = test_client
+        product = feed_product[0]
+
+        stock = lambda: next(p["quantite_stock"] for p in
+                             client.get("/api/produits").get_json()
+                             if p["id"] == product.id)
+        before = stock()
+
+        payload = {"adresse_livraison": "x",
+                   "produits": [{"produit_id": product.id, "quantite": 1}]}
+        headers = {"Authorization": f"Bearer {client_token}"}
+        assert client.post("/api/commandes", json=payload, headers=headers).status_code == 201
+        assert stock() == before - 1
+
+    def test_lru_eviction_and_memory_cap(self) -> None:
+        cache = CatalogCache(max_bytes=25, max_entries=10)
+        for key in "abc":
+            cache.get_or_load(key, lambda: CachedBody.build(b"x" * 10))
+
+        # 30 octets > 25 : "a" (le plus ancien) évincé
+        assert len(cache) == 2 and cache.size == 20
+        _, status = cache.get_or_load("a", lambda: CachedBody.build(b"y"))
+        assert status == "MISS"
+
+        # Valeur plus grande que le plafond : jamais stockée
+        cache.get_or_load("big", lambda: CachedBody.build(b"z" * 100))
+        assert cache.get_or_load("big", lambda: CachedBody.build(b""))[1] == "MISS"
+
+    def test_stale_while_revalidate(self) -> None:
+        cache = CatalogCache(ttl=0, stale_ttl=60)
+        cache.get_or_load("k", lambda: CachedBody.build(b"v1"))
+
+        statuses = []
+
+        def refresh() -> CachedBody:
+            # Pendant le rafraîchissement, les autres appelants lisent l'ancienne valeur
+            value, status = cache.get_or_load("k", lambda: CachedBody.build(b"other"))
+            statuses.append((value.body, status))
+            return CachedBody.build(b"v2")
+
+        value, status = cache.get_or_load("k", refresh)
+        assert (value.body, status) == (b"v2", "MISS")
+        assert statuses == [(b"v1", "STALE")]
+
+    def test_invalidation_during_load(self) -> None:
+        cache = CatalogCache()
+
+        def load() -> CachedBody:
+            cache.invalidate()
+            return CachedBody.build(b"old")
+
+        cache.get_or_load("k", load)
+        # Valeur chargée avant invalidation : non conservée
+        assert len(cache) == 0
+
+
+class TestProductConditional:
+
+    def test_catalog_etag_not_modified(
+        self, test_client: Tuple[FlaskClient, Session], admin_token: str,
+        feed_product: list) -> None:
+        client, _ = test_client
+
+        resp = client.get("/api/produits")
+        etag = resp.headers["ETag"]
+        assert resp.status_code == 200
+        assert resp.headers["Cache-Control"].startswith("public")
+        assert resp.headers["Surrogate-Key"] == "products"
+
+        resp = client.get("/api/produits", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.data == b""
+        assert resp.headers["ETag"] == etag
+
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        client.put(f"/api/produits/{feed_product[0].id}", json={"prix": 99.0}, headers=headers)
+
+        resp = client.get("/api/produits", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.headers["ETag"] != etag
+
+    def test_product_etag_not_modified(
+        self, test_client: Tuple[FlaskClient, Session], client_token: str,
+        feed_product: list, enable_catalog_cache, query_counter: list) -> None:
+        client, _ = test_client
+        product_id = feed_product[0].id
+        headers = {"Authorization": f"Bearer {client_token}"}
+
+        resp = client.get(f"/api/produits/{product_id}", headers=headers)
+        assert resp.status_code == 200
+        assert resp.headers["Surrogate-Key"] == f"products product-{product_id}"
+
+        # Sondage inchangé : 304 sans requête produit (seule l'auth interroge la base)
+        query_counter.clear()
+        headers["If-None-Match"] = resp.headers["ETag"]
+        resp = client.get(f"/api/produits/{product_id}", headers=headers)
+        assert resp.status_code == 304
+        assert not any("FROM product" in s for s in query_counter)
+
+
+class TestRequestInstrumentation:
+
+    @staticmethod
+    def _timings(header: str) -> Dict[str, str]:
+        return {entry.split(";")[0].strip(): entry for entry in header.split(",")}
+
+    def test_server_timing_header(
+        self, test_client: Tuple[FlaskClient, Session], admin_token: str,
+        query_counter: list) -> None:
+        client, _ = test_client
+        headers = {"Authorization": f"Bearer {admin_token}"}
+
+        query_counter.clear()
+        resp = client.post("/api/produits", headers=headers, json={
+            "nom": "Lampe", "description": "LED", "categorie": "Maison",
+            "prix": 15.0, "quantite_stock": 3})
+        assert resp.status_code == 201
+
+        timings = self._timings(resp.headers["Server-Timing"])
+        assert set(timings) == {"db", "ser", "val", "app"}
+        assert f'desc="{len(query_counter)} SQL queries"' in timings["db"]
+        assert resp.headers["Server-Timing"].isascii()
+
+    def test_repeated_statement_warning(
+        self, test_client: Tuple[FlaskClient, Session], feed_product: list,
+        monkeypatch, caplog) -> None:
+        client, _ = test_client
+        config = client.application.config
+        monkeypatch.setitem(config, "SQL_N_PLUS_ONE_THRESHOLD", 0)
+        monkeypatch.setitem(config, "SQL_INSTRUMENTATION_LOG", True)
+
+        with caplog.at_level(logging.INFO, logger=client.application.logger.name):
+            resp = client.get("/api/produits")
+        assert resp.status_code == 200
+
+        messages = [r.getMessage() for r in caplog.records]
+        assert any(m.startswith("N+1 probable sur GET /api/produits")
+                   for m in messages)
+        record = next(json.loads(m.split(" ", 1)[1]) for m in messages
+                      if m.startswith("request_metrics"))
+        assert record["path"] == "/api/produits"
+        assert record["statements"] >= 1 and record["repeated"]
+
+    def test_statement_shape(self) -> None:
+        assert statement_shape("SELECT *\n FROM product WHERE id IN (?, ?,?)") \
+            == statement_shape("SELECT * FROM product WHERE id IN (?)")
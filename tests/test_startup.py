@@ -0,0 +1,110 @@
+import subprocess
+import sys
+from pydantic import BaseModel
+from app.cli.startup_profile import package_of, parse_importtime, run_profile
+from app.schemas.errors.errors_schemas import ErrorClassFactory
+from app.schemas.product_schemas import PRODUCT_EXAMPLE
+from app.spec import LazySpecTree
+from flask import Flask
+from flask.testing import FlaskClient
+from sqlalchemy.orm import Session
+from typing import Tuple
+
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2000 |       2500 |     app.schemas
+import time:      1500 |       9000 |   app.routes.product_routes
+import time:       300 |      12000 | app
+Unrelated line
+"""
+
+
+class TestLazySchemas:
+
+    def test_spec_models_built_on_first_access(self) -> None:
+        class ItemSchema(BaseModel):
+            nom: str
+
+        spec = LazySpecTree("flask", title="Test")
+        app = Flask(__name__)
+
+        @app.post("/items")
+        @spec.validate(json=ItemSchema)
+        def create_item():
+            return {}
+
+        spec.register(app)
+        assert spec.models == {}
+
+        with app.app_context():
+            schemas = spec.spec["components"]["schemas"]
+        assert [key for key in schemas if key.startswith("ItemSchema.")]
+        assert list(spec.models) == [k for k in schemas if k in spec.models]
+        assert not spec._pending_models
+
+    def test_error_classes_created_on_demand(self) -> None:
+        factory = ErrorClassFactory()
+        assert factory._classes == {}
+
+        error = factory("orderitem", 404)
+        assert error.__name__ == "OrderitemError404"
+        assert factory("orderitem", 404) is error
+        assert factory("IntegrityError", 409).__name__ == "IntegrityError"
+        assert factory("orderitem", 418) is None
+        # Validateur construit au premier usage (defer_build)
+        assert not error.__pydantic_complete__
+        assert error(error="Introuvable").error == "Introuvable"
+
+    def test_openapi_document_complete(
+            self, test_client: Tuple[FlaskClient, Session]) -> None:
+        client, _ = test_client
+
+        resp = client.get("/apidoc/openapi.json")
+        assert resp.status_code == 200
+        schemas = resp.get_json()["components"]["schemas"]
+        # Modèles de premier niveau (`<Modèle>.<hash>`)
+        examples = {key.split(".")[0]: schema.get("example")
+                    for key, schema in schemas.items() if key.count(".") == 1}
+        assert examples["ProductRespSchema"] == PRODUCT_EXAMPLE
+        assert examples["OrderError404"] == {"error": "Commande introuvable"}
+        assert examples["OrderCreateRespSchema"]["commande"]["id"] == 1
+
+
+class TestStartupProfile:
+
+    def test_parse_importtime(self) -> None:
+        modules = parse_importtime(IMPORTTIME_OUTPUT)
+        assert [m["module"] for m in modules] == [
+            "_io", "app.schemas", "app.routes.product_routes", "app"]
+        assert modules[1] == {"module": "app.schemas", "self_ms": 2.0,
+                              "cumulative_ms": 2.5, "depth": 2}
+        assert package_of("app.routes.product_routes") == "app.routes"
+        assert package_of("sqlalchemy.orm.attributes") == "sqlalchemy"
+
+    def test_run_profile(self) -> None:
+        profile = run_profile("testing")
+
+        assert profile["import_app_ms"] > 0
+        assert profile["create_app_ms"] > 0
+        assert "app.routes" in profile["packages"]
+        assert not [m for m in profile["modules"]
+                    if m["module"].startswith("app.cli.startup_profile")]
+        calls = {c["call"] for c in profile["init"]}
+        assert "app.core.password_hashing:configure" in calls
+
+    def test_command_registered(self, setup_db) -> None:
+        app, _ = setup_db
+        result = app.test_cli_runner().invoke(args=["startup-profile",
+                                                    "--help"])
+        assert result.exit_code == 0
+        assert "--top" in result.output
+
+    def test_submodules_import_without_routes(self) -> None:
+        code = ("import sys, app.models, app.database.db_manager; "
+                "print(sorted(m for m in ('spectree', 'app.routes', 'app.spec')"
+                " if m in sys.modules))")
+        proc = subprocess.run([sys.executable, "-c", code],
+                              capture_output=True, text=True)
+        assert proc.stdout.strip() == "[]", proc.stderr[-2000:]
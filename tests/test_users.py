@@ -1,6 +1,8 @@
 import pytest
+import threading
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
-from werkzeug.security import check_password_hash
+from werkzeug.security import check_password_hash, generate_password_hash
 from app.models import User
 from app.core.auth_utils import get_user_by_email
 
@@ -9,6 +11,13 @@ from flask.testing import FlaskClient
 from sqlalchemy.orm import Session
 
 from app.core.auth_utils import decode_token
+from app.core import auth_decorators
+from app.core.auth_cache import TokenCache
+from app.core.password_hashing import (
+    PasswordHasher, calibrate, canonical_method, password_hasher,
+    PBKDF2_MIN_ITERATIONS
+)
+from app.core import password_hashing
 
 class TestUserRegister:
 
@@ -206,3 +215,215 @@ class TestUserAccess:
             "Authorization": f"Bearer {client_token}"
         })
         assert resp.status_code == 403
+
+
+class TestAuthCache:
+
+    def _admin_route(self, client: FlaskClient, token: str):
+        return client.get("/admin-route", headers={"Authorization": f"Bearer {token}"})
+
+    def test_authenticated_without_query(
+            self, test_client: Tuple[FlaskClient, Session], admin_token: str,
+            enable_auth_cache, query_counter: list,
+            monkeypatch: pytest.MonkeyPatch) -> None:
+        """Token vérifié une fois, identité lue une fois en base."""
+        client, _ = test_client
+        decoded = []
+        monkeypatch.setattr(auth_decorators, "decode_token",
+                            lambda token: decoded.append(token) or decode_token(token))
+
+        assert self._admin_route(client, admin_token).status_code == 200
+        assert len(query_counter) == 1
+
+        query_counter.clear()
+        for _ in range(3):
+            assert self._admin_route(client, admin_token).status_code == 200
+        assert query_counter == []
+        assert decoded == [admin_token]
+
+    def test_role_change_invalidates(
+            self, test_client: Tuple[FlaskClient, Session], admin_token: str,
+            enable_auth_cache) -> None:
+        client, session = test_client
+        assert self._admin_route(client, admin_token).status_code == 200
+
+        user = session.query(User).filter_by(email="admin@test.com").one()
+        user.role = "client"
+        session.commit()
+        assert self._admin_route(client, admin_token).status_code == 403
+
+    def test_bulk_delete_invalidates(
+            self, test_client: Tuple[FlaskClient, Session], admin_token: str,
+            enable_auth_cache) -> None:
+        client, session = test_client
+        assert self._admin_route(client, admin_token).status_code == 200
+
+        session.query(User).filter_by(email="admin@test.com").delete()
+        session.commit()
+        resp = self._admin_route(client, admin_token)
+        assert resp.status_code == 401
+        assert resp.get_json()["error"] == "Payload Token invalide"
+
+    def test_token_cache_expiry_and_bound(self) -> None:
+        cache = TokenCache(max_entries=2)
+        cache.put_claims("expired", {"id": 1, "exp": 1})
+        assert cache.get_claims("expired") is None
+
+        future = datetime.now().timestamp() + 60
+        for token in ("a", "b", "c"):
+            cache.put_claims(token, {"id": 1, "exp": future})
+        assert len(cache) == 2
+        assert cache.get_claims("a") is None
+        assert cache.get_claims("c") == {"id": 1, "exp": future}
+
+
+class TestPasswordHashing:
+
+    def test_login_rehashes_legacy_hash(
+            self, test_client: Tuple[FlaskClient, Session]) -> None:
+        client, session = test_client
+        session.add(User(nom="Legacy", email="legacy@email.com", role="client",
+                         password_hash=generate_password_hash("legacy_pwd",
+                                                              "scrypt")))
+        session.commit()
+
+        resp = client.post("/api/auth/login", json={
+            "email": "legacy@email.com", "password": "legacy_pwd"})
+        assert resp.status_code == 200
+
+        user = get_user_by_email(session, "legacy@email.com")
+        assert user.password_hash.startswith(password_hasher.method + "$")
+        assert check_password_hash(user.password_hash, "legacy_pwd")
+        assert not password_hasher.needs_rehash(user.password_hash)
+
+    def test_saturated_pool_returns_503(
+            self, test_client: Tuple[FlaskClient, Session], admin_token: str,
+            monkeypatch) -> None:
+        client, _ = test_client
+        monkeypatch.setattr(password_hasher, "workers", 1)
+        monkeypatch.setattr(password_hasher, "_slots",
+                            threading.BoundedSemaphore(1))
+        password_hasher._slots.acquire()
+
+        for url, payload in (
+                ("/api/auth/register", {"email": "busy@email.com",
+                                        "nom": "Busy", "password": "busy_pwd"}),
+                ("/api/auth/login", {"email": "admin@test.com",
+                                     "password": "password123"})):
+            resp = client.post(url, json=payload)
+            assert resp.status_code == 503
+            assert resp.headers["Retry-After"] == "1"
+
+    def test_process_pool_round_trip(self) -> None:
+        hasher = PasswordHasher(method="pbkdf2:sha256:1000", workers=1)
+        try:
+            pwhash = hasher.hash("secret")
+            assert hasher.verify(pwhash, "secret")
+            assert not hasher.verify(pwhash, "other")
+        finally:
+            hasher.shutdown()
+
+    def test_broken_pool_falls_back_inline(self, monkeypatch) -> None:
+        hasher = PasswordHasher(method="pbkdf2:sha256:1000", workers=1)
+
+        def broken():
+            raise BrokenProcessPool("processus du pool arrêté")
+
+        monkeypatch.setattr(hasher, "_get_executor", broken)
+        assert hasher.verify(hasher.hash("secret"), "secret")
+        assert hasher.workers == 0
+
+    def test_forked_child_drops_inherited_pool(self) -> None:
+        hasher = PasswordHasher(method="pbkdf2:sha256:1000", workers=1)
+        try:
+            hasher.hash("secret")
+            inherited = hasher._executor
+            hasher._after_fork()
+            assert hasher._executor is None
+        finally:
+            inherited.shutdown()
+            hasher.shutdown()
+
+    def test_calibration_keeps_minimum_cost(self) -> None:
+        assert calibrate("pbkdf2:sha256", 1) == \
+            f"pbkdf2:sha256:{PBKDF2_MIN_ITERATIONS}"
+        assert calibrate("scrypt", 1) == "scrypt:32768:8:1"
+        with pytest.raises(ValueError):
+            calibrate("argon2", 1)
+
+    def test_scrypt_calibration_capped_by_memory(self, monkeypatch) -> None:
+        # Machine très rapide : seule la mémoire (128·n·r) borne n
+        monkeypatch.setattr(password_hashing, "_duration_ms", lambda m: 1.0)
+        assert calibrate("scrypt", 1000) == "scrypt:65536:8:1"
+        assert calibrate("scrypt", 1000, max_memory_mb=256) == \
+            "scrypt:262144:8:1"
+        assert calibrate("scrypt", 1000, max_memory_mb=1) == "scrypt:32768:8:1"
+
+    @pytest.mark.parametrize("family, target_ms, timings", [
+        # pbkdf2 : 700000 / 736842 itérations
+        ("pbkdf2:sha256", 70, (10.0, 9.5)),
+        # scrypt : N = 2**15 / 2**16 (frontière de doublement bruitée)
+        ("scrypt", 100, (120.0, 90.0)),
+    ])
+    def test_no_rehash_between_calibrated_workers(
+            self, monkeypatch, family: str, target_ms: float,
+            timings: tuple) -> None:
+        hashers = []
+        for elapsed in timings:
+            # Durée mesurée propre à chaque worker (scrypt : ∝ N)
+            def duration_ms(method: str, elapsed: float = elapsed) -> float:
+                if method.startswith("scrypt"):
+                    return elapsed * int(method.split(":")[1]) / 2 ** 15
+                return elapsed
+            monkeypatch.setattr(password_hashing, "_duration_ms", duration_ms)
+            hashers.append(PasswordHasher(method=calibrate(family, target_ms)))
+        first, second = hashers
+        assert first.method != second.method
+
+        # Ni l'un ni l'autre ne ré-hache le hachage de l'autre
+        assert not first.needs_rehash(f"{second.method}$salt$hash")
+        assert not second.needs_rehash(f"{first.method}$salt$hash")
+        # Coût nettement inférieur, autre algorithme ou méthode invalide
+        assert first.needs_rehash(f"{family}:1000$salt$hash"
+                                  if family != "scrypt"
+                                  else "scrypt:1024:8:1$salt$hash")
+        assert first.needs_rehash("pbkdf2:sha512:900000$salt$hash")
+        assert first.needs_rehash("inconnu$salt$hash")
+
+    def test_canonical_method_without_hashing(self) -> None:
+        for method in ("scrypt", "pbkdf2", "pbkdf2:sha512",
+                       "pbkdf2:sha256:1000", "scrypt:16384:8:1"):
+            assert canonical_method(method) == \
+                generate_password_hash("", method).split("$", 1)[0]
+        with pytest.raises(ValueError):
+            canonical_method("argon2")
+
+    def test_calibration_in_background(self, monkeypatch) -> None:
+        calls, release = [], threading.Event()
+
+        def slow_calibrate(method, target, max_memory_mb):
+            calls.append(target)
+            release.wait(5)
+            return "pbkdf2:sha256:1000"
+
+        monkeypatch.setattr("app.core.password_hashing.calibrate",
+                            slow_calibrate)
+        hasher = PasswordHasher()
+        hasher.configure({"PASSWORD_HASH_METHOD": "pbkdf2:sha256",
+                          "PASSWORD_HASH_CALIBRATE": True,
+                          "PASSWORD_HASH_TARGET_MS": 50})
+        # Méthode configurée servie sans attendre la calibration
+        assert hasher.method == canonical_method("pbkdf2:sha256")
+        assert not hasher.wait_calibration(0.01)
+
+        # Enfant forké : relance au 1er usage de `method` (pas dans le pool)
+        hasher._after_fork()
+        assert hasher._calibration_thread is None
+        hasher.method
+        assert hasher._calibration_thread is not None
+
+        release.set()
+        assert hasher.wait_calibration(5)
+        assert calls == [50, 50]
+        assert hasher.hash("secret").startswith("pbkdf2:sha256:1000$")
+        assert not hasher.needs_rehash(hasher.hash("secret"))